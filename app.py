@@ -16,6 +16,12 @@ load_dotenv()
 
 # Import our existing modules
 from transcribe_audio import transcribe_audio
+from transcript_cache import get_transcript_cache
+from llm_cache import cached_chat_completion, get_llm_cache
+from prompt_templates import get_prompt
+from segment_store import as_segment_store, save_transcript
+from media_probe import artifact_path
+from timestamp_grounding import timestamp_url
 from generate_mom import generate_mom
 from email_service import send_mom_email
 
@@ -108,7 +114,7 @@ def save_uploaded_file(uploaded_file):
         f.write(uploaded_file.getbuffer())
     return file_path
 
-def process_audio_file(file_path, meeting_title):
+def process_audio_file(file_path, meeting_title, force=False):
     """Process audio file through complete pipeline"""
     
     results = {
@@ -141,10 +147,9 @@ def process_audio_file(file_path, meeting_title):
         status_text.text("✅ Transcription complete!")
         
         # Save transcript
-        transcript_file = file_path.replace('uploads/', 'transcripts/').replace('.mp3', '_transcript.json').replace('.webm', '_transcript.json').replace('.wav', '_transcript.json').replace('.m4a', '_transcript.json')
+        transcript_file = artifact_path(file_path, 'transcript', 'transcripts')
         
-        with open(transcript_file, "w") as f:
-            json.dump(transcript_result, f, indent=2)
+        save_transcript(transcript_result, transcript_file)
         
         results['transcript'] = transcript_result
         results['transcript_file'] = transcript_file
@@ -153,7 +158,7 @@ def process_audio_file(file_path, meeting_title):
         st.info("🤖 Step 2/3: Generating Minutes of Meeting...")
         status_text.text("Analyzing transcript with GPT-4...")
         
-        mom_data = generate_mom(transcript_file)
+        mom_data = generate_mom(transcript_file, force=force, on_section=mom_stream_renderer())
         
         if not mom_data:
             results['error'] = "MOM generation failed"
@@ -163,7 +168,7 @@ def process_audio_file(file_path, meeting_title):
         status_text.text("✅ MOM generated successfully!")
         
         # Save MOM
-        mom_file = transcript_file.replace('transcripts/', 'moms/').replace('_transcript.json', '_mom.json')
+        mom_file = artifact_path(transcript_file, 'mom', 'moms')
         with open(mom_file, 'w') as f:
             json.dump(mom_data, f, indent=2)
         
@@ -185,14 +190,14 @@ def process_audio_file(file_path, meeting_title):
         })
         
         st.session_state.current_mom = mom_data
-        st.session_state.current_transcript = transcript_result
+        st.session_state.current_transcript = as_segment_store(transcript_result)
         
     except Exception as e:
         results['error'] = str(e)
     
     return results
 
-def process_youtube_captions(youtube_url, meeting_title, clean_captions=True):
+def process_youtube_captions(youtube_url, meeting_title, clean_captions=True, force=False):
     """Process YouTube video via caption API (legal method)"""
     
     results = {
@@ -229,21 +234,14 @@ def process_youtube_captions(youtube_url, meeting_title, clean_captions=True):
             
             # Clean captions using GPT-4
             try:
-                response = openai_client.chat.completions.create(
+                transcript_text = cached_chat_completion(
+                    openai_client,
                     model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a transcript editor. Fix transcription errors, add proper punctuation, and break into paragraphs. Preserve all original meaning and content."
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Fix this auto-generated transcript:\n\n{transcript_text[:8000]}"
-                        }
-                    ],
-                    temperature=0.3
+                    messages=get_prompt('caption_cleanup', 1).messages(transcript=transcript_text[:8000]),
+                    temperature=0.3,
+                    bypass=force,
+                    label="Caption cleanup"
                 )
-                transcript_text = response.choices[0].message.content
                 print("✅ Caption cleaning complete")
             except Exception as e:
                 print(f"⚠️ Caption cleaning failed: {e}")
@@ -261,15 +259,15 @@ def process_youtube_captions(youtube_url, meeting_title, clean_captions=True):
             'duration': caption_result.get('duration', 0),
             'segments': caption_result.get('segments', []),
             'language': caption_result.get('language', 'en'),
-            'source': 'youtube_captions'
+            'source': 'youtube_captions',
+            'media_url': youtube_url
         }
         
         # Save transcript
         video_id = caption_result.get('video_id', 'unknown')
         transcript_file = f"transcripts/youtube_{video_id}_transcript.json"
         
-        with open(transcript_file, "w") as f:
-            json.dump(transcript_result, f, indent=2)
+        save_transcript(transcript_result, transcript_file)
         
         results['transcript'] = transcript_result
         results['transcript_file'] = transcript_file
@@ -278,7 +276,7 @@ def process_youtube_captions(youtube_url, meeting_title, clean_captions=True):
         st.info("🤖 Step 3/4: Generating Minutes of Meeting...")
         status_text.text("Analyzing transcript with GPT-4...")
         
-        mom_data = generate_mom(transcript_file)
+        mom_data = generate_mom(transcript_file, force=force, on_section=mom_stream_renderer(youtube_url))
         
         if not mom_data:
             results['error'] = "MOM generation failed"
@@ -288,7 +286,7 @@ def process_youtube_captions(youtube_url, meeting_title, clean_captions=True):
         status_text.text("✅ MOM generated successfully!")
         
         # Save MOM
-        mom_file = transcript_file.replace('_transcript.json', '_mom.json')
+        mom_file = artifact_path(transcript_file, 'mom')
         with open(mom_file, 'w') as f:
             json.dump(mom_data, f, indent=2)
         
@@ -310,44 +308,52 @@ def process_youtube_captions(youtube_url, meeting_title, clean_captions=True):
         })
         
         st.session_state.current_mom = mom_data
-        st.session_state.current_transcript = transcript_result
+        st.session_state.current_transcript = as_segment_store(transcript_result)
         
     except Exception as e:
         results['error'] = str(e)
     
     return results
 
-def display_mom(mom_data):
-    """Display MOM in a formatted way"""
+# Order sections are shown in when rendering a finished MOM
+MOM_SECTIONS = ['summary', 'key_points', 'decisions', 'action_items', 'questions', 'next_steps', 'attendees']
+
+def time_label(item, media_url=None):
+    """Item time as text, linked to that moment of the recording when possible"""
+    url = timestamp_url(media_url, item.get('start'))
+    return f"[{item['timestamp']}]({url})" if url else item['timestamp']
+
+def render_mom_section(key, value, media_url=None):
+    """Render one MOM section (called per section while a MOM streams in)"""
     
-    st.markdown("---")
-    st.markdown("## 📋 Minutes of Meeting")
+    if not value:
+        return
     
     # Summary
-    if mom_data.get('summary'):
+    if key == 'summary':
         st.markdown("### 📝 Summary")
-        st.info(mom_data['summary'])
+        st.info(value)
     
     # Key Points
-    if mom_data.get('key_points'):
+    elif key == 'key_points':
         st.markdown("### 🔑 Key Discussion Points")
-        for i, point in enumerate(mom_data['key_points'], 1):
+        for i, point in enumerate(value, 1):
             st.markdown(f"{i}. {point}")
     
     # Decisions
-    if mom_data.get('decisions'):
+    elif key == 'decisions':
         st.markdown("### ✅ Decisions Made")
-        for i, decision in enumerate(mom_data['decisions'], 1):
+        for i, decision in enumerate(value, 1):
             with st.expander(f"Decision {i}: {decision.get('decision', 'N/A')[:50]}..."):
                 st.write(f"**Decision:** {decision.get('decision', 'N/A')}")
                 st.write(f"**Decided by:** {decision.get('made_by', 'Team')}")
                 if decision.get('timestamp'):
-                    st.write(f"**Time:** {decision.get('timestamp')}")
+                    st.markdown(f"**Time:** {time_label(decision, media_url)}")
     
     # Action Items
-    if mom_data.get('action_items'):
+    elif key == 'action_items':
         st.markdown("### 📌 Action Items")
-        for i, item in enumerate(mom_data['action_items'], 1):
+        for i, item in enumerate(value, 1):
             priority = item.get('priority', 'medium')
             priority_color = {
                 'high': '🔴',
@@ -360,25 +366,72 @@ def display_mom(mom_data):
                 st.write(f"**Owner:** {item.get('owner', 'Unassigned')}")
                 st.write(f"**Deadline:** {item.get('deadline', 'Not specified')}")
                 st.write(f"**Priority:** {priority.upper()}")
+                if item.get('timestamp'):
+                    st.markdown(f"**Time:** {time_label(item, media_url)}")
     
     # Questions
-    if mom_data.get('questions'):
+    elif key == 'questions':
         st.markdown("### ❓ Open Questions")
-        for i, question in enumerate(mom_data['questions'], 1):
+        for i, question in enumerate(value, 1):
             st.markdown(f"{i}. {question}")
     
     # Next Steps
-    if mom_data.get('next_steps'):
+    elif key == 'next_steps':
         st.markdown("### 🚀 Next Steps")
-        st.info(mom_data['next_steps'])
+        if isinstance(value, list):  # Older MOMs store a single string
+            st.info("\n".join(f"- {step}" for step in value))
+        else:
+            st.info(value)
     
     # Attendees
-    if mom_data.get('attendees'):
+    elif key == 'attendees':
         st.markdown("### 👥 Attendees")
-        cols = st.columns(len(mom_data['attendees']) if len(mom_data['attendees']) < 5 else 5)
-        for i, attendee in enumerate(mom_data['attendees']):
+        cols = st.columns(len(value) if len(value) < 5 else 5)
+        for i, attendee in enumerate(value):
             cols[i % 5].markdown(f"👤 {attendee}")
 
+def display_mom(mom_data):
+    """Display MOM in a formatted way"""
+    
+    st.markdown("---")
+    st.markdown("## 📋 Minutes of Meeting")
+    
+    metadata = mom_data.get('metadata', {})
+    extractive = metadata.get('extractive')
+    if extractive:
+        st.warning(f"✂️ Only {extractive['units_kept']} of {extractive['units_before']} transcript segments "
+                   f"({extractive['tokens_after']:,} of {extractive['tokens_before']:,} tokens) were analysed; "
+                   f"the least salient parts of the meeting were skipped (MOM_EXTRACTIVE=0 turns this off).")
+    
+    media_url = metadata.get('media_url')
+    for key in MOM_SECTIONS:
+        render_mom_section(key, mom_data.get(key), media_url)
+
+def mom_stream_renderer(media_url=None):
+    """
+    Create a callback that renders MOM sections as they stream in
+    
+    Args:
+        media_url: Recording URL used to link timestamps (YouTube)
+    
+    Returns:
+        function: on_section(key, value) callback for generate_mom
+    """
+    area = st.container()
+    with area:
+        st.markdown("## 📋 Minutes of Meeting (live)")
+    slots = {}
+    
+    def on_section(key, value):
+        # A section sent again (after a retry) replaces the one shown before
+        if key not in slots:
+            with area:
+                slots[key] = st.empty()
+        with slots[key].container():
+            render_mom_section(key, value, media_url)
+    
+    return on_section
+
 def main():
     """Main application"""
     
@@ -396,7 +449,7 @@ def main():
         4. **Email** to participants
 
         ### 📊 Supported Sources
-        - **Upload**: MP3, WAV, M4A, WebM, MP4, AVI, MOV
+        - **Upload**: MP3, WAV, M4A, WebM, OGG, FLAC, MP4, AVI, MOV, MKV
         - **YouTube**: Videos with captions (legal!)
         - **Max duration**: 2 hours
         
@@ -408,6 +461,37 @@ def main():
         
         st.markdown("---")
         
+        # Transcript cache savings
+        cache_stats = get_transcript_cache().stats()
+        if cache_stats['hits'] or cache_stats['misses']:
+            st.markdown("### ⚡ Transcript Cache")
+            st.caption(
+                f"Hits: {cache_stats['hits']} • Misses: {cache_stats['misses']} • "
+                f"Hit rate: {cache_stats['hit_rate']:.0%}"
+            )
+            st.caption(f"⏱️ {cache_stats['saved_audio_seconds']/60:.1f} min of audio not re-transcribed")
+            st.markdown("---")
+        
+        # GPT response cache
+        llm_stats = get_llm_cache().stats()
+        if llm_stats['hits'] or llm_stats['misses']:
+            st.markdown("### 🧠 GPT Response Cache")
+            st.caption(
+                f"Hits: {llm_stats['hits']} • Misses: {llm_stats['misses']} • "
+                f"Hit rate: {llm_stats['hit_rate']:.0%} • {llm_stats['size_mb']:.1f}MB"
+            )
+            if llm_stats['prompt_tokens']:
+                st.caption(
+                    f"Prompt tokens: {llm_stats['prompt_tokens']:,} • "
+                    f"Provider-cached: {llm_stats['prompt_cache_rate']:.0%}"
+                )
+        force_regenerate = st.checkbox(
+            "🔄 Force regeneration",
+            value=False,
+            help="Ignore cached GPT responses and summarize again"
+        )
+        st.markdown("---")
+        
         # Meeting History
         if st.session_state.processed_meetings:
             st.markdown("### 📚 Recent Meetings")
@@ -434,8 +518,8 @@ def main():
         with col1:
             uploaded_file = st.file_uploader(
                 "Choose audio or video file",
-                type=['mp3', 'wav', 'm4a', 'webm', 'mp4', 'avi', 'mov'],
-                help="Upload your meeting recording (MP3, MP4, WAV, M4A, WebM, AVI, MOV)"
+                type=['mp3', 'wav', 'm4a', 'webm', 'ogg', 'flac', 'mp4', 'avi', 'mov', 'mkv'],
+                help="Upload your meeting recording (MP3, MP4, WAV, M4A, WebM, OGG, FLAC, AVI, MOV, MKV)"
             )
         
         with col2:
@@ -455,7 +539,7 @@ def main():
                     file_path = save_uploaded_file(uploaded_file)
                     
                     # Process
-                    results = process_audio_file(file_path, meeting_title)
+                    results = process_audio_file(file_path, meeting_title, force_regenerate)
                     
                     if results['success']:
                         st.balloons()
@@ -515,7 +599,7 @@ def main():
                 # Process button
                 if youtube_title:
                     if st.button("🚀 Fetch Captions & Generate MOM", type="primary", use_container_width=True, key="process_youtube"):
-                        results = process_youtube_captions(youtube_url, youtube_title, clean_captions)
+                        results = process_youtube_captions(youtube_url, youtube_title, clean_captions, force_regenerate)
                         
                         if results['success']:
                             st.balloons()
@@ -542,7 +626,7 @@ def main():
             with col1:
                 st.metric("Duration", format_duration(transcript_data.get('duration', 0)))
             with col2:
-                st.metric("Words", f"{len(transcript_data.get('text', '').split()):,}")
+                st.metric("Words", f"{transcript_data.word_count:,}")
             with col3:
                 st.metric("Decisions", len(mom_data.get('decisions', [])))
             with col4:
@@ -563,7 +647,7 @@ def main():
                     mime="application/json"
                 )
             with col2:
-                transcript_text = transcript_data.get('text', '')
+                transcript_text = transcript_data.text
                 st.download_button(
                     label="📥 Download Transcript (TXT)",
                     data=transcript_text,
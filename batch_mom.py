@@ -0,0 +1,480 @@
+"""
+Offline bulk MOM generation through the OpenAI Batch API
+Writes every pending MOM/chunk/merge request as JSONL batches per round (split to fit the Batch API limits),
+polls until they finish and maps results back to transcripts
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+from openai import OpenAI
+from dotenv import load_dotenv
+
+from media_probe import artifact_path
+from segment_store import load_transcript, as_segment_store
+from llm_cache import get_llm_cache, LLM_CACHE_ENABLED
+from transcript_compress import compress_transcript, print_compression_report
+from token_budget import MOM_MODEL
+from mom_schema import SINGLE_CALL_SECTIONS, FINAL_SECTIONS
+from timestamp_grounding import ground_mom
+from dedupe_items import dedupe_partials, dedupe_mom_lists
+from process_long_meeting import (fits_single_call, extractive_pass, prepare_chunks, call_json,
+                                  generate_validated_mom, combine_partials, group_partials, partial_tokens,
+                                  mom_prompt, chunk_prompt, merge_prompt, final_prompt,
+                                  MOM_SYSTEM_PROMPT, CHUNK_SYSTEM_PROMPT, MERGE_SYSTEM_PROMPT, FINAL_SYSTEM_PROMPT,
+                                  REDUCE_TOKEN_BUDGET, REDUCE_MAX_LEVELS)
+
+load_dotenv()
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_SECONDS = float(os.getenv("MOM_BATCH_POLL_SECONDS", "60"))
+BATCH_TERMINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+BATCH_FAILED_STATUSES = {'failed', 'expired', 'cancelled'}
+# Batch API limits per input file
+BATCH_MAX_REQUESTS = 50000
+BATCH_MAX_BYTES = 200 * 1024 * 1024
+TEMPERATURE = 0.3
+RESPONSE_FORMAT = {"type": "json_object"}
+
+def get_batch_client(base_url=None):
+    """
+    OpenAI client for batch jobs
+
+    Args:
+        base_url: API base URL, e.g. a local stand-in server (defaults to OPENAI_BATCH_BASE_URL,
+                  then the regular OpenAI endpoint)
+    """
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"),
+                  base_url=base_url or os.getenv("OPENAI_BATCH_BASE_URL") or None)
+
+def _messages(system_prompt, prompt):
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt}
+    ]
+
+def batch_line(custom_id, messages):
+    """One chat completion request as a line of Batch API JSONL"""
+    return json.dumps({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": MOM_MODEL,
+            "messages": messages,
+            "temperature": TEMPERATURE,
+            "response_format": RESPONSE_FORMAT
+        }
+    }, ensure_ascii=False) + "\n"
+
+def split_batches(requests, max_requests=BATCH_MAX_REQUESTS, max_bytes=BATCH_MAX_BYTES):
+    """
+    Split requests into batch input files that each stay within the Batch API limits
+
+    Args:
+        requests: Dict of custom_id -> messages list
+        max_requests: Maximum requests per batch
+        max_bytes: Maximum input file size
+
+    Returns:
+        list: One list of JSONL lines per batch
+    """
+    parts = []
+    lines, size = [], 0
+    for custom_id, messages in requests.items():
+        line = batch_line(custom_id, messages)
+        length = len(line.encode('utf-8'))
+        if lines and (len(lines) >= max_requests or size + length > max_bytes):
+            parts.append(lines)
+            lines, size = [], 0
+        lines.append(line)
+        size += length
+    if lines:
+        parts.append(lines)
+    return parts
+
+def write_batch_file(lines, path):
+    """
+    Write a batch input file
+
+    Args:
+        lines: JSONL lines from batch_line()
+        path: Output .jsonl path
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+
+def wait_for_batch(client, batch_id, poll_seconds=BATCH_POLL_SECONDS):
+    """
+    Poll a batch until it reaches a terminal status
+
+    Returns:
+        Batch: Final batch object
+    """
+    last_status = None
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        if batch.status != last_status:
+            progress = f" ({counts.completed}/{counts.total} done, {counts.failed} failed)" if counts else ""
+            print(f"   ⏳ Batch {batch_id}: {batch.status}{progress}")
+            last_status = batch.status
+        if batch.status in BATCH_TERMINAL_STATUSES:
+            return batch
+        time.sleep(poll_seconds)
+
+def report_failed_batch(batch):
+    """Print why a batch ended without answering every request"""
+    counts = batch.request_counts
+    answered = f"{counts.completed}/{counts.total} requests answered" if counts else "no requests answered"
+    print(f"   ❌ Batch {batch.id} {batch.status}: {answered}")
+    errors = getattr(batch, 'errors', None)
+    for error in (getattr(errors, 'data', None) or [])[:5]:
+        print(f"      {getattr(error, 'code', '')}: {getattr(error, 'message', error)}")
+
+def read_batch_results(client, batch):
+    """
+    Download the output of a finished batch
+
+    Returns:
+        dict: custom_id -> response content for every successful request
+    """
+    results = {}
+    if not batch.output_file_id:
+        return results
+
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get('response') or {}
+        if record.get('error') or response.get('status_code') != 200:
+            continue
+        choices = (response.get('body') or {}).get('choices') or []
+        if choices:
+            results[record['custom_id']] = choices[0]['message']['content']
+    return results
+
+def run_requests(client, requests, work_dir, label, force=False, poll_seconds=BATCH_POLL_SECONDS):
+    """
+    Answer chat requests from the LLM cache where possible and send the rest as batches
+
+    Requests are split into as many batches as the request-count and file-size
+    limits need; all of them are submitted before waiting on the first. A batch
+    that fails or expires is reported, and whatever it did answer is kept.
+    Batch responses are stored in the LLM cache, so interactive reruns of the
+    same transcripts are free.
+
+    Args:
+        client: OpenAI client
+        requests: Dict of custom_id -> messages list
+        work_dir: Directory for the batch input files
+        label: Name used for the files and logs
+        force: Skip the cache lookup
+        poll_seconds: Seconds between status checks
+
+    Returns:
+        tuple: (dict of custom_id -> parsed JSON response (None when it failed), list of batch ids)
+    """
+    cache = get_llm_cache() if LLM_CACHE_ENABLED else None
+    keys = {custom_id: cache.make_key(MOM_MODEL, messages, TEMPERATURE, RESPONSE_FORMAT)
+            for custom_id, messages in requests.items()} if cache else {}
+
+    contents = {}
+    if cache and not force:
+        for custom_id in requests:
+            content = cache.get(keys[custom_id])
+            if content is not None:
+                contents[custom_id] = content
+
+    pending = {custom_id: messages for custom_id, messages in requests.items() if custom_id not in contents}
+    print(f"📦 {label}: {len(requests)} requests, {len(requests) - len(pending)} from cache, {len(pending)} to batch")
+
+    batch_ids = []
+    if pending:
+        os.makedirs(work_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        parts = split_batches(pending, BATCH_MAX_REQUESTS, BATCH_MAX_BYTES)
+        for n, lines in enumerate(parts, 1):
+            name = f"{label}_part{n}" if len(parts) > 1 else label
+            input_path = os.path.join(work_dir, f"{name}_{stamp}.jsonl")
+            write_batch_file(lines, input_path)
+
+            with open(input_path, 'rb') as f:
+                input_file = client.files.create(file=f, purpose="batch")
+            batch = client.batches.create(
+                input_file_id=input_file.id,
+                endpoint=BATCH_ENDPOINT,
+                completion_window=BATCH_COMPLETION_WINDOW,
+                metadata={"description": f"MOM {name}"}
+            )
+            batch_ids.append(batch.id)
+            print(f"   🚀 Submitted batch {batch.id} ({len(lines)} requests, {input_path})")
+
+        for batch_id in batch_ids:
+            batch = wait_for_batch(client, batch_id, poll_seconds)
+            if batch.status in BATCH_FAILED_STATUSES:
+                report_failed_batch(batch)
+            fresh = read_batch_results(client, batch)  # Expired batches still return what they finished
+            for custom_id, content in fresh.items():
+                if cache and content:
+                    cache.put(keys[custom_id], MOM_MODEL, content)
+            contents.update(fresh)
+
+    parsed = {}
+    for custom_id in requests:
+        try:
+            parsed[custom_id] = json.loads(contents[custom_id])
+        except (KeyError, TypeError, ValueError):
+            parsed[custom_id] = None
+    failed = sum(value is None for value in parsed.values())
+    if failed:
+        print(f"   ⚠️  {label}: {failed}/{len(requests)} request(s) got no usable answer from the batch")
+    return parsed, batch_ids
+
+def _retry_sync(result, system_prompt, prompt, label, force, retry_failed):
+    """Send a request the batch couldn't answer as a regular, full-price call (only with retry_failed)"""
+    if result is not None or not retry_failed:
+        return result
+    print(f"   🔁 {label}: retrying outside the batch at the regular price")
+    return call_json(system_prompt, prompt, label, bypass=force)
+
+def reduce_jobs_batch(client, jobs, work_dir, force=False, poll_seconds=BATCH_POLL_SECONDS):
+    """
+    Merge the chunk notes of every job level by level, batching each level
+
+    Batch counterpart of process_long_meeting.reduce_partials(): jobs whose
+    notes exceed REDUCE_TOKEN_BUDGET get their groups merged in the same batch,
+    so hierarchical reduces are never sent as interactive calls. A merge the
+    batch couldn't answer keeps its notes unmerged, like merge_partials().
+
+    Args:
+        client: OpenAI client
+        jobs: Job dicts with 'id' and 'partials'; 'reduce_levels' is set on each
+        work_dir: Directory for batch input files
+        force: Skip the cache lookup
+        poll_seconds: Seconds between status checks
+
+    Returns:
+        list: Batch ids used
+    """
+    batch_ids = []
+    for job in jobs:
+        job['notes_tokens'] = sum(partial_tokens(p) for p in job['partials'])
+        job['reduce_levels'] = 0
+
+    reducing = [job for job in jobs if job['notes_tokens'] > REDUCE_TOKEN_BUDGET]
+    level = 0
+    while reducing and level < REDUCE_MAX_LEVELS:
+        level += 1
+        requests = {}
+        for job in reducing:
+            job['groups'] = group_partials(job['partials'], REDUCE_TOKEN_BUDGET)
+            for g, group in enumerate(job['groups'], 1):
+                requests[f"{job['id']}-merge{level}-{g}"] = _messages(MERGE_SYSTEM_PROMPT, merge_prompt(group))
+        results, level_batches = run_requests(client, requests, work_dir, f"reduce{level}", force, poll_seconds)
+        batch_ids.extend(level_batches)
+
+        still_reducing = []
+        for job in reducing:
+            merged = [results[f"{job['id']}-merge{level}-{g}"] or combine_partials(group)
+                      for g, group in enumerate(job.pop('groups'), 1)]
+            merged_tokens = sum(partial_tokens(p) for p in merged)
+            job['reduce_levels'] = level
+            if merged_tokens >= job['notes_tokens']:
+                print(f"   ⚠️  {job['file']}: merging no longer shrinks the notes, stopping reduce")
+            elif merged_tokens > REDUCE_TOKEN_BUDGET:
+                still_reducing.append(job)
+            job['partials'], job['notes_tokens'] = merged, merged_tokens
+        reducing = still_reducing
+
+    return batch_ids
+
+def generate_moms_batch(transcript_files, work_dir="batches", force=False, base_url=None,
+                        poll_seconds=BATCH_POLL_SECONDS, retry_failed=False):
+    """
+    Generate MOMs for many transcripts through the Batch API
+
+    Round 1 batches single-call MOM requests and chunk extraction requests for
+    long transcripts; reduce rounds batch the merges of notes that don't fit one
+    final call (one batch per level); the last round batches the final calls of
+    the long ones. Repairs of invalid MOM sections go through interactive calls.
+    Requests a failed or expired batch didn't answer are reported; they are
+    re-sent as regular, full-price calls only with retry_failed (otherwise a
+    missing chunk is left out and a missing MOM or final call fails that transcript).
+
+    Args:
+        transcript_files: Transcript JSON paths
+        work_dir: Directory for batch input files
+        force: Ignore cached GPT responses
+        base_url: Alternative API base URL (e.g. a local stand-in server)
+        poll_seconds: Seconds between status checks
+        retry_failed: Re-send unanswered requests as interactive calls
+
+    Returns:
+        dict: transcript path -> MOM (None if it failed); MOMs are also saved next to each transcript
+    """
+    client = get_batch_client(base_url)
+    jobs = []
+
+    for n, transcript_file in enumerate(transcript_files):
+        print(f"📄 Reading transcript: {transcript_file}")
+        store = load_transcript(transcript_file)
+        if not store.text:
+            print("   ❌ Transcript is empty, skipping")
+            continue
+
+        compressed, compression = compress_transcript(store)
+        print_compression_report(compression)
+        compressed, tokens, extractive = extractive_pass(as_segment_store(compressed), compression['tokens_after'])
+        job = {
+            'id': f"t{n}",
+            'file': transcript_file,
+            'store': store,
+            'compression': compression,
+            'extractive': extractive,
+            'single': fits_single_call(tokens),
+            'text': compressed.text,
+        }
+        if not job['single']:
+            job['chunks'] = prepare_chunks(compressed)
+        jobs.append(job)
+
+    # Round 1: whole-transcript MOMs and chunk extraction
+    requests = {}
+    for job in jobs:
+        if job['single']:
+            requests[f"{job['id']}-mom"] = _messages(MOM_SYSTEM_PROMPT, mom_prompt(job['text']))
+        else:
+            for i, chunk in enumerate(job['chunks'], 1):
+                requests[f"{job['id']}-chunk{i}"] = _messages(CHUNK_SYSTEM_PROMPT, chunk_prompt(chunk))
+    results, batch_ids = run_requests(client, requests, work_dir, "round1", force, poll_seconds)
+
+    # Chunk notes of the long transcripts, deduplicated locally
+    chunked = []
+    for job in jobs:
+        if job['single']:
+            continue
+        chunk_results = [
+            _retry_sync(results[f"{job['id']}-chunk{i}"], CHUNK_SYSTEM_PROMPT, chunk_prompt(chunk),
+                        f"{job['file']} chunk {i}", force, retry_failed)
+            for i, chunk in enumerate(job['chunks'], 1)
+        ]
+        job['chunks_failed'] = [i for i, result in enumerate(chunk_results, 1) if result is None]
+        if len(job['chunks_failed']) == len(chunk_results):
+            job['failed'] = True
+            continue
+        job['partials'], job['duplicates_removed'] = dedupe_partials([r for r in chunk_results if r])
+        chunked.append(job)
+
+    # Reduce rounds: hierarchical merges, batched level by level
+    batch_ids.extend(reduce_jobs_batch(client, chunked, work_dir, force, poll_seconds))
+
+    # Final round: final calls for chunked transcripts
+    requests = {}
+    for job in chunked:
+        job['combined'], removed = dedupe_mom_lists(combine_partials(job.pop('partials')))
+        job['duplicates_removed'] += removed
+        requests[f"{job['id']}-final"] = _messages(FINAL_SYSTEM_PROMPT, final_prompt(job['combined']))
+    final_results, final_batches = run_requests(client, requests, work_dir, "final", force, poll_seconds) \
+        if requests else ({}, [])
+    batch_ids.extend(final_batches)
+
+    moms = {}
+    for job in jobs:
+        if job.get('failed'):
+            print(f"❌ {job['file']}: every chunk failed")
+            moms[job['file']] = None
+            continue
+
+        metadata = {
+            'generated_at': datetime.now().isoformat(),
+            'transcript_file': job['file'],
+            'duration': job['store'].duration,
+            'word_count': job['store'].word_count,
+            'compression': job['compression'],
+            'extractive': job['extractive'],
+            'batch_ids': batch_ids,
+        }
+        answer = results[f"{job['id']}-mom"] if job['single'] else final_results[f"{job['id']}-final"]
+        if answer is None and not retry_failed:
+            # Validation would regenerate it with a regular call; only do that when asked to
+            print(f"❌ {job['file']}: the batch didn't answer the {'MOM' if job['single'] else 'final'} request "
+                  f"(rerun, or pass --retry-sync to send it as a regular call)")
+            moms[job['file']] = None
+            continue
+
+        # Batch answers are validated like live ones; only broken sections are regenerated
+        if job['single']:
+            mom, cascade = generate_validated_mom(MOM_SYSTEM_PROMPT, mom_prompt(job['text']), job['file'],
+                                                  SINGLE_CALL_SECTIONS, force, mom=answer)
+            metadata['processing_method'] = 'single'
+        else:
+            mom, cascade = generate_validated_mom(FINAL_SYSTEM_PROMPT, final_prompt(job['combined']),
+                                                  f"{job['file']} final", FINAL_SECTIONS, force, mom=answer)
+            metadata.update({
+                'chunks_processed': len(job['chunks']) - len(job['chunks_failed']),
+                'chunks_failed': job['chunks_failed'],
+                'reduce_levels': job['reduce_levels'],
+                'duplicates_removed': job['duplicates_removed'],
+                'processing_method': 'hierarchical' if job['reduce_levels'] else 'map_reduce',
+            })
+
+        if mom is None:
+            print(f"❌ {job['file']}: MOM generation failed")
+            moms[job['file']] = None
+            continue
+
+        mom['metadata'] = dict(cascade, **metadata)
+        ground_mom(mom, job['store'])
+        output_file = artifact_path(job['file'], 'mom')
+        with open(output_file, 'w') as f:
+            json.dump(mom, f, indent=2)
+        print(f"💾 Saved MOM to: {output_file}")
+        moms[job['file']] = mom
+
+    return moms
+
+def find_pending(inputs, force=False):
+    """
+    Collect transcript files that don't have a MOM yet
+
+    Args:
+        inputs: Transcript files or directories (searched for *_transcript.json)
+        force: Include transcripts that already have a MOM
+
+    Returns:
+        list: Transcript paths
+    """
+    files = []
+    for item in inputs:
+        path = Path(item)
+        files.extend(sorted(str(p) for p in path.glob("*_transcript.json")) if path.is_dir() else [str(path)])
+    return [f for f in files if force or not os.path.exists(artifact_path(f, 'mom'))]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate MOMs in bulk through the OpenAI Batch API")
+    parser.add_argument("inputs", nargs="+", help="Transcript JSON files or directories")
+    parser.add_argument("--work-dir", default="batches", help="Where batch input files are written")
+    parser.add_argument("--base-url", default=None, help="API base URL (e.g. a local stand-in server)")
+    parser.add_argument("--poll", type=float, default=BATCH_POLL_SECONDS, help="Seconds between status checks")
+    parser.add_argument("--force", action="store_true", help="Regenerate existing MOMs and ignore cached GPT responses")
+    parser.add_argument("--retry-sync", action="store_true",
+                        help="Send requests a failed or expired batch didn't answer as regular (full-price) calls")
+    args = parser.parse_args()
+
+    pending = find_pending(args.inputs, args.force)
+    if not pending:
+        print("✅ Nothing to do, every transcript has a MOM")
+        sys.exit(0)
+
+    print(f"🗂️  {len(pending)} transcript(s) pending")
+    moms = generate_moms_batch(pending, args.work_dir, args.force, args.base_url, args.poll, args.retry_sync)
+    failed = [f for f, mom in moms.items() if mom is None]
+    print(f"\n✅ {len(moms) - len(failed)} MOM(s) generated, {len(failed)} failed")
+    sys.exit(1 if failed else 0)
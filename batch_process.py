@@ -0,0 +1,238 @@
+"""
+Headless batch processor: Audio → Transcript → MOM for whole directories
+Records per-file stage status in a manifest so an interrupted run resumes where it stopped
+"""
+
+import os
+import sys
+import json
+import argparse
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from transcribe_audio import transcribe_audio
+from process_long_meeting import generate_mom_for_long_meeting
+from whisper_client import MAX_IN_FLIGHT
+from segment_store import save_transcript
+
+MEDIA_EXTENSIONS = ['.mp3', '.wav', '.m4a', '.webm', '.ogg', '.oga', '.flac',
+                    '.mp4', '.mov', '.avi', '.mkv', '.flv', '.wmv']
+STAGES = ['transcribe', 'mom']
+DEFAULT_MANIFEST = "batch_manifest.json"
+
+class Manifest:
+    """Thread-safe JSON manifest of per-file stage status"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {"created_at": datetime.now().isoformat(), "files": {}}
+
+    def entry(self, media_path):
+        """Get (or create) the manifest entry for a media file"""
+        key = str(Path(media_path).resolve())
+        with self._lock:
+            return self.data["files"].setdefault(key, {"path": media_path, "stages": {}})
+
+    def stage_done(self, entry, stage):
+        """True if a stage finished and its output is still on disk"""
+        info = entry["stages"].get(stage, {})
+        return info.get("status") == "done" and os.path.exists(info.get("output", ""))
+
+    def update(self, entry, stage, status, output=None, error=None):
+        """Record a stage result and save the manifest atomically"""
+        with self._lock:
+            entry["stages"][stage] = {
+                "status": status,
+                "output": output,
+                "error": error,
+                "updated_at": datetime.now().isoformat()
+            }
+            self.data["updated_at"] = datetime.now().isoformat()
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+def collect_inputs(inputs):
+    """
+    Expand directories, files and @list files into media file paths
+
+    Args:
+        inputs: Paths from the command line (a directory is searched recursively,
+                @file.txt reads one path per line)
+
+    Returns:
+        list: Unique media file paths in a stable order
+    """
+    paths = []
+    for item in inputs:
+        if item.startswith('@'):
+            with open(item[1:], 'r') as f:
+                paths.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+        elif os.path.isdir(item):
+            paths.extend(
+                str(p) for p in sorted(Path(item).rglob('*'))
+                if p.is_file() and p.suffix.lower() in MEDIA_EXTENSIONS
+            )
+        else:
+            paths.append(item)
+
+    seen = set()
+    unique = []
+    for path in paths:
+        key = str(Path(path).resolve())
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+    return unique
+
+def output_stem(media_path, all_paths):
+    """File stem for outputs, disambiguated when two inputs share a name"""
+    stem = Path(media_path).stem
+    duplicates = [p for p in all_paths if Path(p).stem == stem]
+    if len(duplicates) > 1:
+        stem += "_" + hashlib.sha1(str(Path(media_path).resolve()).encode()).hexdigest()[:8]
+    return stem
+
+def process_file(media_path, stem, manifest, transcript_dir, mom_dir, stages, force=False):
+    """
+    Run the pipeline stages for one file, skipping stages that already finished
+    (force=True skips cached GPT responses for the MOM stage)
+
+    Returns:
+        bool: True if every requested stage is done
+    """
+    entry = manifest.entry(media_path)
+    transcript_file = os.path.join(transcript_dir, f"{stem}_transcript.json")
+    mom_file = os.path.join(mom_dir, f"{stem}_mom.json")
+
+    if 'transcribe' in stages and not manifest.stage_done(entry, 'transcribe'):
+        manifest.update(entry, 'transcribe', 'running')
+        try:
+            transcript = transcribe_audio(media_path)
+        except Exception as e:
+            transcript = None
+            error = str(e)
+        else:
+            error = None if transcript else "transcription failed"
+
+        if not transcript:
+            manifest.update(entry, 'transcribe', 'failed', error=error)
+            return False
+
+        save_transcript(transcript, transcript_file)
+        manifest.update(entry, 'transcribe', 'done', output=transcript_file)
+
+    if 'mom' in stages and not manifest.stage_done(entry, 'mom'):
+        if not os.path.exists(transcript_file):
+            manifest.update(entry, 'mom', 'failed', error="transcript missing")
+            return False
+
+        manifest.update(entry, 'mom', 'running')
+        try:
+            mom = generate_mom_for_long_meeting(transcript_file, force=force)
+        except Exception as e:
+            mom = None
+            error = str(e)
+        else:
+            error = None if mom else "MOM generation failed"
+
+        if not mom:
+            manifest.update(entry, 'mom', 'failed', error=error)
+            return False
+
+        mom.setdefault('metadata', {})['source_file'] = media_path
+        with open(mom_file, 'w') as f:
+            json.dump(mom, f, indent=2)
+        manifest.update(entry, 'mom', 'done', output=mom_file)
+
+    return True
+
+def run_batch(inputs, manifest_path=DEFAULT_MANIFEST, transcript_dir="transcripts", mom_dir="moms",
+              workers=None, stages=STAGES, force=False):
+    """
+    Process many recordings without prompts
+
+    Args:
+        inputs: Directories, media files or @list files
+        manifest_path: Manifest JSON path (reused to resume)
+        transcript_dir: Output directory for transcripts
+        mom_dir: Output directory for MOMs
+        workers: Concurrent files (defaults to min(CPU cores, Whisper in-flight limit))
+        stages: Stages to run ('transcribe', 'mom')
+        force: Ignore cached GPT responses when generating MOMs
+
+    Returns:
+        dict: Counts of done, failed and skipped files
+    """
+    Path(transcript_dir).mkdir(parents=True, exist_ok=True)
+    Path(mom_dir).mkdir(parents=True, exist_ok=True)
+
+    media_files = collect_inputs(inputs)
+    manifest = Manifest(manifest_path)
+    workers = workers or max(1, min(os.cpu_count() or 1, MAX_IN_FLIGHT))
+
+    pending = [
+        path for path in media_files
+        if not all(manifest.stage_done(manifest.entry(path), stage) for stage in stages)
+    ]
+    skipped = len(media_files) - len(pending)
+
+    print("="*60)
+    print("📦 BATCH PROCESSING")
+    print("="*60)
+    print(f"   Files found: {len(media_files)}")
+    print(f"   Already done: {skipped}")
+    print(f"   To process: {len(pending)} with {workers} workers")
+    print(f"   Manifest: {manifest_path}")
+
+    summary = {"done": 0, "failed": 0, "skipped": skipped}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(process_file, path, output_stem(path, media_files), manifest,
+                            transcript_dir, mom_dir, stages, force): path
+            for path in pending
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                ok = future.result()
+            except Exception as e:
+                print(f"❌ {path}: {e}")
+                ok = False
+            summary["done" if ok else "failed"] += 1
+            print(f"{'✅' if ok else '❌'} [{summary['done'] + summary['failed']}/{len(pending)}] {path}")
+
+    print("\n" + "="*60)
+    print(f"✅ Done: {summary['done']}  ❌ Failed: {summary['failed']}  ⏭️ Skipped: {summary['skipped']}")
+    print("="*60)
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transcribe recordings and generate MOMs in bulk")
+    parser.add_argument("inputs", nargs="+", help="Directories, media files, or @list.txt files")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="Manifest file used to resume runs")
+    parser.add_argument("--transcript-dir", default="transcripts")
+    parser.add_argument("--mom-dir", default="moms")
+    parser.add_argument("--workers", type=int, default=None, help="Files processed concurrently")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated: transcribe,mom")
+    parser.add_argument("--force", action="store_true", help="Ignore cached GPT responses")
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        print(f"❌ Error: Unknown stage(s): {', '.join(unknown)}")
+        sys.exit(2)
+
+    result = run_batch(args.inputs, args.manifest, args.transcript_dir, args.mom_dir, args.workers, stages, args.force)
+    sys.exit(1 if result["failed"] else 0)
@@ -0,0 +1,31 @@
+"""Fixtures shared by the test files"""
+
+import pytest
+
+def build_transcript(texts, seconds=10.0, **fields):
+    """
+    Build a transcript dict shaped like transcribe_audio() output
+
+    Args:
+        texts: Segment texts (back to back, seconds each) or (start, end, text) tuples
+        seconds: Length of each segment when plain texts are given
+        **fields: Extra top-level keys such as source or media_url (None values are left out)
+
+    Returns:
+        dict: Transcript with text, language, duration and segments
+    """
+    spans = [item if isinstance(item, tuple) else (i * seconds, (i + 1) * seconds, item)
+             for i, item in enumerate(texts)]
+    transcript = {
+        "text": " ".join(text for _, _, text in spans),
+        "language": "en",
+        "duration": spans[-1][1] if spans else 0,
+        "segments": [{"start": start, "end": end, "text": " " + text} for start, end, text in spans],
+    }
+    transcript.update({key: value for key, value in fields.items() if value is not None})
+    return transcript
+
+@pytest.fixture
+def make_transcript():
+    """Factory fixture for transcript dicts, see build_transcript()"""
+    return build_transcript
@@ -0,0 +1,303 @@
+"""
+Local near-duplicate merging for MOM items (decisions, action items, questions, key points)
+Clusters items with MinHash over character shingles plus word/owner/deadline checks, keeps one per cluster
+"""
+
+import os
+import re
+import zlib
+import random
+import numpy as np
+
+from extractive_summary import STOPWORDS
+
+DEDUPE_SIMILARITY = float(os.getenv("MOM_DEDUPE_SIMILARITY", "0.8"))  # Estimated Jaccard to call two items the same
+SHINGLE_CHARS = 4
+NUM_HASHES = 64
+BANDS = 16  # LSH bands of NUM_HASHES // BANDS rows; pairs sharing a band are compared
+HASH_PRIME = (1 << 31) - 1  # Small enough that a * x + b stays inside uint64
+EXACT_COMPARE_MAX = 500  # Up to this many items every pair is compared; LSH above that
+
+# MOM list -> dict field holding the item text
+ITEM_FIELDS = {
+    'decisions': 'decision',
+    'action_items': 'task',
+    'questions': 'question',
+    'key_points': 'point',
+}
+
+# Values that mean "not given" for owner/deadline style fields
+UNSET_VALUES = {'', 'unassigned', 'team', 'not specified', 'none', 'n/a', 'tbd', 'unknown'}
+PRIORITY_ORDER = {'low': 0, 'medium': 1, 'high': 2}
+
+# Words that flip an item's meaning when only one of two similar items has them
+NEGATIONS = {'not', 'no', 'never', 'without', 'cannot', 'nobody', 'nothing', 'none', 'neither', 'nor'}
+
+# Opposite actions/directions; two items on either side of a pair are different items
+ANTONYM_PAIRS = [
+    ('approve', 'reject'), ('approve', 'deny'), ('accept', 'reject'), ('accept', 'decline'),
+    ('allow', 'block'), ('allow', 'deny'), ('enable', 'disable'), ('include', 'exclude'),
+    ('add', 'remove'), ('add', 'drop'), ('keep', 'drop'), ('keep', 'remove'), ('hire', 'fire'),
+    ('buy', 'sell'), ('start', 'stop'), ('begin', 'end'), ('continue', 'stop'), ('continue', 'pause'),
+    ('open', 'close'), ('increase', 'decrease'), ('increase', 'reduce'), ('raise', 'lower'),
+    ('raise', 'cut'), ('expand', 'reduce'), ('extend', 'shorten'), ('upgrade', 'downgrade'),
+    ('more', 'less'), ('higher', 'lower'), ('up', 'down'), ('before', 'after'),
+    ('win', 'lose'), ('pass', 'fail'), ('public', 'private'), ('internal', 'external'),
+]
+
+_rng = random.Random(1729)  # Fixed seed: same items always cluster the same way
+_HASH_A = np.array([_rng.randrange(1, HASH_PRIME) for _ in range(NUM_HASHES)], dtype=np.uint64)
+_HASH_B = np.array([_rng.randrange(0, HASH_PRIME) for _ in range(NUM_HASHES)], dtype=np.uint64)
+
+def item_text(item, field):
+    """Text of an item (dicts use field, falling back to their first string value)"""
+    if isinstance(item, dict):
+        text = item.get(field)
+        if not isinstance(text, str):
+            text = next((v for v in item.values() if isinstance(v, str)), '')
+        return text
+    return str(item)
+
+def normalize(text):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return ' '.join(re.sub(r'[^a-z0-9 ]', ' ', text.lower()).split())
+
+def _stem(word):
+    """Crude stem so inflections ("approves", "approved", "approving") compare equal"""
+    if len(word) > 4 and word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+    for suffix in ('ing', 'ed'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    if len(word) > 3 and word.endswith('e'):
+        word = word[:-1]
+    return word
+
+def canonical(text):
+    """Stemmed content words, so wording-only differences ("approved the" / "approve") don't lower similarity"""
+    words = [_stem(word) for word in normalize(text).split() if word not in STOPWORDS]
+    return ' '.join(words) or normalize(text)
+
+def shingles(text):
+    """Set of hashed character shingles of the canonical text"""
+    text = canonical(text)
+    if len(text) <= SHINGLE_CHARS:
+        return {zlib.crc32(text.encode())} if text else set()
+    return {zlib.crc32(text[i:i + SHINGLE_CHARS].encode()) for i in range(len(text) - SHINGLE_CHARS + 1)}
+
+def minhash(shingle_set):
+    """
+    MinHash signature of a shingle set
+
+    Returns:
+        numpy.ndarray: NUM_HASHES minimum hash values
+    """
+    if not shingle_set:
+        return np.full(NUM_HASHES, HASH_PRIME, dtype=np.uint64)
+    values = np.array(sorted(shingle_set), dtype=np.uint64) % HASH_PRIME
+    hashed = (np.outer(_HASH_A, values) + _HASH_B[:, None]) % HASH_PRIME
+    return hashed.min(axis=1)
+
+ANTONYMS = {}
+for _a, _b in ANTONYM_PAIRS:
+    ANTONYMS.setdefault(_stem(_a), set()).add(_stem(_b))
+    ANTONYMS.setdefault(_stem(_b), set()).add(_stem(_a))
+
+def _words(text):
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+def _negated(words):
+    return any(word in NEGATIONS or word.endswith("n't") for word in words)
+
+def words_compatible(text_a, text_b):
+    """
+    Check that the words two similar items don't share leave their meaning the same
+
+    Rejects a negation on one side only ("approve" / "do not approve"), an
+    antonym pair ("approve" / "reject") and different content words on both
+    sides ("send to finance" / "send to legal", "migrate to Postgres" /
+    "migrate to MySQL"). Extra words on one side only are fine: the longer
+    item just adds detail.
+    """
+    words_a, words_b = _words(text_a), _words(text_b)
+    if _negated(words_a) != _negated(words_b):
+        return False
+
+    content_a = {_stem(w) for w in words_a if w not in STOPWORDS}
+    content_b = {_stem(w) for w in words_b if w not in STOPWORDS}
+    only_a, only_b = content_a - content_b, content_b - content_a
+    if any(ANTONYMS.get(word, set()) & only_b for word in content_a) or \
+            any(ANTONYMS.get(word, set()) & only_a for word in content_b):
+        return False
+    return not (only_a and only_b)
+
+def _unset(value):
+    return not isinstance(value, str) or value.strip().lower() in UNSET_VALUES
+
+def _numbers(text):
+    return set(re.findall(r'\d+', text))
+
+def fields_compatible(a, b, field):
+    """
+    Numbers in the text must match, the differing words must not change the
+    meaning, and owner/deadline must agree when both items state them
+    """
+    text_a, text_b = item_text(a, field), item_text(b, field)
+    if _numbers(text_a) != _numbers(text_b):
+        return False  # "raise budget 10%" and "raise budget 20%" are different decisions
+    if not words_compatible(text_a, text_b):
+        return False
+    if not isinstance(a, dict) or not isinstance(b, dict):
+        return True
+    for key in ('owner', 'made_by', 'deadline'):
+        va, vb = a.get(key), b.get(key)
+        if not _unset(va) and not _unset(vb) and normalize(va) != normalize(vb):
+            return False
+    return True
+
+def _representative(cluster, field):
+    """Most informative item of a cluster, with missing fields filled from the others"""
+    def score(item):
+        if not isinstance(item, dict):
+            return (0, len(item_text(item, field)))
+        filled = sum(not _unset(item.get(k)) for k in ('owner', 'made_by', 'deadline', 'timestamp'))
+        return (filled, len(item_text(item, field)))
+
+    best = max(cluster, key=score)
+    if not isinstance(best, dict):
+        return best
+
+    merged = dict(best)
+    for item in cluster:
+        if not isinstance(item, dict):
+            continue
+        for key, value in item.items():
+            if _unset(merged.get(key)) and not _unset(value):
+                merged[key] = value
+
+    priorities = [item.get('priority', '').lower() for item in cluster if isinstance(item, dict)]
+    priorities = [p for p in priorities if p in PRIORITY_ORDER]
+    if priorities:
+        merged['priority'] = max(priorities, key=PRIORITY_ORDER.get)
+    return merged
+
+def cluster_items(items, field, threshold=DEDUPE_SIMILARITY):
+    """
+    Group near-duplicate items
+
+    Args:
+        items: List of item dicts or strings
+        field: Dict field holding the item text
+        threshold: Minimum estimated Jaccard similarity of canonical-text character shingles
+
+    Returns:
+        list: Clusters as lists of item indexes, ordered by first occurrence
+    """
+    n = len(items)
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    if n > 1:
+        signatures = np.vstack([minhash(shingles(item_text(item, field))) for item in items])
+        rows = NUM_HASHES // BANDS
+
+        # LSH: only items that share a whole band are compared (small lists compare every pair)
+        candidates = set()
+        if n <= EXACT_COMPARE_MAX:
+            candidates = {(i, j) for i in range(n) for j in range(i + 1, n)}
+        for band in range(BANDS if n > EXACT_COMPARE_MAX else 0):
+            buckets = {}
+            for i, key in enumerate(map(bytes, signatures[:, band * rows:(band + 1) * rows])):
+                buckets.setdefault(key, []).append(i)
+            for members in buckets.values():
+                for x in range(len(members)):
+                    for y in range(x + 1, len(members)):
+                        candidates.add((members[x], members[y]))
+
+        if candidates:
+            pairs = np.array(sorted(candidates))
+            similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+            for i, j in pairs[similarity >= threshold].tolist():
+                if fields_compatible(items[i], items[j], field):
+                    root_i, root_j = find(i), find(j)
+                    if root_i != root_j:
+                        parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    clusters = {}
+    for i in range(n):
+        clusters.setdefault(find(i), []).append(i)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+def dedupe_items(items, field, threshold=DEDUPE_SIMILARITY):
+    """
+    Merge near-duplicate items, keeping one representative per cluster
+
+    Args:
+        items: List of item dicts or strings
+        field: Dict field holding the item text ('decision', 'task', ...)
+        threshold: Minimum estimated similarity
+
+    Returns:
+        list: Deduplicated items in order of first occurrence
+    """
+    items = [item for item in items or [] if normalize(item_text(item, field))]
+    return [
+        _representative([items[i] for i in members], field)
+        for members in cluster_items(items, field, threshold)
+    ]
+
+def _as_list(value):
+    if not value:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def dedupe_partials(partials, keys=('decisions', 'action_items', 'questions', 'key_points')):
+    """
+    Remove items repeated across chunk results, keeping each where it first appears
+
+    Args:
+        partials: Chunk results in meeting order (dicts of lists)
+        keys: MOM lists to deduplicate
+
+    Returns:
+        tuple: (new partials, number of items removed)
+    """
+    deduped = [dict(partial) for partial in partials]
+    removed = 0
+
+    for key in keys:
+        field = ITEM_FIELDS.get(key, 'text')
+        located = [
+            (p, item)
+            for p, partial in enumerate(partials)
+            for item in _as_list(partial.get(key))
+            if normalize(item_text(item, field))
+        ]
+        if not located:
+            continue
+
+        for partial in deduped:
+            partial[key] = []
+        clusters = cluster_items([item for _, item in located], field)
+        for members in clusters:
+            home = located[members[0]][0]
+            deduped[home][key].append(_representative([located[i][1] for i in members], field))
+        removed += len(located) - len(clusters)
+
+    return deduped, removed
+
+def dedupe_mom_lists(notes, keys=('decisions', 'action_items', 'questions', 'key_points')):
+    """
+    Deduplicate the item lists of one set of notes (or a MOM)
+
+    Returns:
+        tuple: (new notes dict, number of items removed)
+    """
+    deduped, removed = dedupe_partials([notes], keys)
+    return deduped[0], removed
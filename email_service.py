@@ -8,6 +8,7 @@ from sendgrid.helpers.mail import Mail, Email, To, Content
 from dotenv import load_dotenv
 import json
 from datetime import datetime
+from timestamp_grounding import timestamp_url
 
 load_dotenv()
 
@@ -15,6 +16,11 @@ SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY")
 SENDGRID_FROM_EMAIL = os.getenv("SENDGRID_FROM_EMAIL")
 SENDGRID_FROM_NAME = os.getenv("SENDGRID_FROM_NAME", "MOM Bot")
 
+def time_html(item, media_url=None):
+    """Item time, as a link to that moment of the recording when possible"""
+    url = timestamp_url(media_url, item.get('start'))
+    return f'<a href="{url}">{item["timestamp"]}</a>' if url else item['timestamp']
+
 def create_mom_html(mom_data):
     """
     Create beautiful HTML email from MOM data
@@ -35,6 +41,7 @@ def create_mom_html(mom_data):
     next_steps = mom_data.get('next_steps', 'No next steps specified')
     attendees = mom_data.get('attendees', [])
     metadata = mom_data.get('metadata', {})
+    media_url = metadata.get('media_url')
     
     # Get meeting date
     generated_at = metadata.get('generated_at', datetime.now().isoformat())
@@ -203,7 +210,7 @@ def create_mom_html(mom_data):
                 <div class="item-detail">👤 Decided by: {made_by}</div>
             """
             if timestamp:
-                html += f'<div class="item-detail">🕐 Time: {timestamp}</div>'
+                html += f'<div class="item-detail">🕐 Time: {time_html(decision, media_url)}</div>'
             html += "</div>"
     
     # Action Items
@@ -223,8 +230,10 @@ def create_mom_html(mom_data):
                 <div class="item-detail">👤 Owner: {owner}</div>
                 <div class="item-detail">📅 Deadline: {deadline}</div>
                 <div class="item-detail">⚡ Priority: <span class="{priority_class}">{priority.upper()}</span></div>
-            </div>
             """
+            if item.get('timestamp'):
+                html += f'<div class="item-detail">🕐 Time: {time_html(item, media_url)}</div>'
+            html += "</div>"
     
     # Questions
     if questions:
@@ -238,8 +247,16 @@ def create_mom_html(mom_data):
             </div>
             """
     
-    # Next Steps
-    if next_steps and next_steps != "No next steps specified":
+    # Next Steps (a list, or a single string in older MOMs)
+    if isinstance(next_steps, list) and next_steps:
+        html += """
+            <h2>🚀 Next Steps</h2>
+            <ul>
+        """
+        for step in next_steps:
+            html += f"<li>{step}</li>"
+        html += "</ul>"
+    elif isinstance(next_steps, str) and next_steps and next_steps != "No next steps specified":
         html += f"""
             <h2>🚀 Next Steps</h2>
             <div class="summary">
@@ -0,0 +1,172 @@
+"""
+Local extractive pre-summarization for long transcripts
+Scores segments with TextRank over sparse TF-IDF vectors (NumPy) and keeps the salient ones plus every decision/commitment cue
+"""
+
+import os
+import re
+import numpy as np
+
+from segment_store import as_segment_store
+from token_budget import MOM_MODEL, count_tokens, transcript_units
+
+# Off by default: segments it drops are never seen by the model
+EXTRACTIVE_ENABLED = os.getenv("MOM_EXTRACTIVE", "0") == "1"
+EXTRACTIVE_KEEP_RATIO = float(os.getenv("MOM_EXTRACTIVE_RATIO", "0.5"))  # Share of transcript tokens kept
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 50
+
+# Segments that record a decision, assignment, deadline or follow-up are always kept
+# (explicit wording only; "we should", "I'll" or "let's" are everywhere in ordinary talk)
+CUE_PATTERN = re.compile(
+    r"\b(?:decided|decision (?:is|was|to)|agreed (?:to|on|that)|approved|action items?|next steps?|deadlines?|"
+    r"follow[- ]ups?|assigned to|responsible for|by (?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"tomorrow|next week|(?:the )?end of (?:the )?(?:day|week|month|quarter)))\b",
+    re.IGNORECASE
+)
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have i in is it its of on or so that the this to was we were will
+with you yeah yes okay ok like just um uh oh right so well really do does did not no it's that's i'm you're
+they them their there then than what which who how when where can could would should about all also any
+""".split())
+
+WORD = re.compile(r"[a-z0-9']+")
+
+def tfidf_matrix(texts):
+    """
+    L2-normalized TF-IDF vectors for a list of texts, stored sparsely
+
+    Only the nonzero weights are kept, so memory grows with the number of
+    words in the meeting rather than texts x vocabulary.
+
+    Args:
+        texts: List of strings
+
+    Returns:
+        tuple: (rows, cols, weights) arrays of the nonzero entries; texts without content words have none
+    """
+    vocabulary = {}
+    rows, cols = [], []
+    for i, text in enumerate(texts):
+        for word in WORD.findall(text.lower()):
+            if word not in STOPWORDS and len(word) > 1:
+                rows.append(i)
+                cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    if not rows:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0)
+
+    # One entry per (text, word) with its count
+    size = len(vocabulary)
+    pairs, counts = np.unique(np.array(rows) * size + np.array(cols), return_counts=True)
+    rows, cols = pairs // size, pairs % size
+
+    lengths = np.bincount(rows, weights=counts, minlength=len(texts))
+    df = np.bincount(cols, minlength=size)
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1.0
+
+    weights = counts / lengths[rows] * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=len(texts)))
+    return rows, cols, weights / norms[rows]
+
+def textrank_scores(vectors, n, damping=TEXTRANK_DAMPING, iterations=TEXTRANK_ITERATIONS):
+    """
+    TextRank centrality of each text over cosine similarity of its TF-IDF vector
+
+    The n x n similarity matrix is never built: each power iteration multiplies
+    by the sparse vectors twice (S @ x = M @ (M.T @ x) minus the self-similarity),
+    so time and memory grow with the number of words, not with n squared.
+
+    Args:
+        vectors: Output of tfidf_matrix()
+        n: Number of texts
+        damping: PageRank damping factor
+        iterations: Power iterations
+
+    Returns:
+        numpy.ndarray: One score per text (higher = more central to the meeting)
+    """
+    rows, cols, weights = vectors
+    self_similarity = np.bincount(rows, weights=weights ** 2, minlength=n)
+
+    def similarity_times(x):
+        per_word = np.bincount(cols, weights=weights * x[rows])
+        return np.bincount(rows, weights=weights * per_word[cols], minlength=n) - self_similarity * x
+
+    out_weight = similarity_times(np.ones(n))
+    linked = out_weight > 1e-9  # Texts sharing no words with others spread their score evenly
+    share = np.divide(1.0, out_weight, out=np.zeros(n), where=linked)
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        spread = similarity_times(scores * share) + scores[~linked].sum() / n
+        updated = (1 - damping) / n + damping * spread
+        if np.abs(updated - scores).sum() < 1e-6:
+            return updated
+        scores = updated
+    return scores
+
+def extract_salient(transcript, max_tokens=None, keep_ratio=EXTRACTIVE_KEEP_RATIO, model=MOM_MODEL):
+    """
+    Keep the most salient segments of a transcript within a token budget
+
+    Segments with decision/commitment cues are kept first, then the highest
+    TextRank segments until the budget is used. Kept segments stay in meeting
+    order with their original timestamps.
+
+    Args:
+        transcript: Transcript dict or SegmentStore
+        max_tokens: Token budget (defaults to keep_ratio of the transcript)
+        keep_ratio: Share of the transcript's tokens kept when max_tokens is None
+        model: Model used for token counts
+
+    Returns:
+        tuple: (reduced transcript dict, report dict with units_before, units_kept,
+                cue_units, tokens_before and tokens_after)
+    """
+    store = as_segment_store(transcript)
+    units = transcript_units(store)
+    tokens = np.array([count_tokens(unit['text'], model) for unit in units], dtype=int)
+    tokens_before = int(tokens.sum())
+    budget = max_tokens if max_tokens is not None else int(tokens_before * keep_ratio)
+
+    report = {
+        'units_before': len(units),
+        'units_kept': len(units),
+        'cue_units': 0,
+        'tokens_before': tokens_before,
+        'tokens_after': tokens_before,
+    }
+    if not units or tokens_before <= budget:
+        return store.to_transcript(), report
+
+    cues = np.array([bool(CUE_PATTERN.search(unit['text'])) for unit in units])
+    scores = textrank_scores(tfidf_matrix([unit['text'] for unit in units]), len(units))
+
+    # Cues first, then by salience; greedily take whatever still fits
+    order = np.lexsort((-scores, ~cues))
+    keep = np.zeros(len(units), dtype=bool)
+    used = 0
+    for i in order:
+        if used + tokens[i] <= budget:
+            keep[i] = True
+            used += tokens[i]
+
+    kept = [unit for unit, k in zip(units, keep) if k]
+    reduced = store.to_transcript()
+    reduced['text'] = ' '.join(unit['text'] for unit in kept)
+    if kept and kept[0]['start'] is not None:
+        reduced['segments'] = [
+            {'start': unit['start'], 'end': unit['end'], 'text': ' ' + unit['text']}
+            for unit in kept
+        ]
+    else:
+        reduced['segments'] = []  # Sentence units carry no timestamps
+
+    report.update({
+        'units_kept': len(kept),
+        'cue_units': int((cues & keep).sum()),
+        'tokens_after': int(used),
+    })
+    return reduced, report
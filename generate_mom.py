@@ -1,23 +1,29 @@
 """
 Generate Minutes of Meeting (MOM) from transcript using GPT-4
+Single entry point for the app, the CLI tools and scripts: the processing strategy is picked from the transcript size
 """
 
 import os
 import json
-from openai import OpenAI
 from dotenv import load_dotenv
-from datetime import datetime
+from media_probe import artifact_path
+from segment_store import load_transcript
+from process_long_meeting import generate_mom_from_transcript
 
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-def generate_mom(transcript_file):
+def generate_mom(transcript_file, force=False, on_section=None):
     """
     Generate structured MOM from transcript
     
+    Short transcripts take one call; longer ones are split into chunks analysed
+    concurrently and merged (in several levels when the notes are too big for one call).
+    
     Args:
         transcript_file: Path to transcript JSON file
+        force: Regenerate even if this exact request is in the LLM response cache
+        on_section: Optional callback(key, value) receiving each top-level section
+                    (summary, key_points, ...) as soon as it is complete
     
     Returns:
         dict: Structured MOM with summary, decisions, action items, etc.
@@ -26,74 +32,27 @@ def generate_mom(transcript_file):
     print(f"📄 Reading transcript: {transcript_file}")
     
     # Load transcript
-    with open(transcript_file, 'r') as f:
-        transcript_data = json.load(f)
+    transcript_data = load_transcript(transcript_file)
     
-    transcript_text = transcript_data.get('text', '')
+    transcript_text = transcript_data.text
     
     if not transcript_text:
         print("❌ Error: Transcript is empty!")
         return None
     
-    print(f"📝 Transcript length: {len(transcript_text)} characters")
-    print("🤖 Generating MOM with GPT-4...")
-    print("⏳ This may take 10-30 seconds...")
-    
-    # Create prompt for GPT-4
-    prompt = f"""You are an expert meeting assistant. Analyze the following meeting transcript and generate a structured Minutes of Meeting (MOM).
-
-TRANSCRIPT:
-{transcript_text}
-
-Please extract and format the following information in JSON format:
-
-1. **summary**: A brief 2-3 sentence overview of what was discussed
-2. **key_points**: Array of main discussion points (3-5 bullet points)
-3. **decisions**: Array of decisions made, each with:
-   - decision: The decision text
-   - made_by: Who made the decision (if mentioned, otherwise "Team")
-   - timestamp: Approximate time in transcript (if possible)
-4. **action_items**: Array of tasks, each with:
-   - task: What needs to be done
-   - owner: Who is responsible (if mentioned, otherwise "Unassigned")
-   - deadline: Deadline if mentioned (otherwise "Not specified")
-   - priority: high/medium/low based on context
-5. **questions**: Array of unresolved questions or concerns raised
-6. **next_steps**: What should happen after this meeting
-7. **attendees**: List of people mentioned in the meeting (if identifiable from transcript)
-
-Return ONLY valid JSON, no additional text.
-"""
-
     try:
-        # Call GPT-4
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Using cheaper model for POC (gpt-4o-mini)
-            messages=[
-                {"role": "system", "content": "You are a professional meeting assistant that creates clear, structured minutes of meetings. Always respond with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,  # Lower temperature for more consistent output
-            response_format={"type": "json_object"}  # Force JSON output
-        )
-        
-        # Parse response
-        mom_json = response.choices[0].message.content
-        mom = json.loads(mom_json)
-        
-        print("✅ MOM generated successfully!")
+        mom = generate_mom_from_transcript(transcript_data, force, on_section)
+        if not mom:
+            return None
         
         # Add metadata
-        mom['metadata'] = {
-            'generated_at': datetime.now().isoformat(),
+        mom['metadata'].update({
             'transcript_file': transcript_file,
-            'model_used': 'gpt-4o-mini',
-            'transcript_length': len(transcript_text),
-            'duration': transcript_data.get('duration', 'Unknown')
-        }
+            'transcript_length': len(transcript_text)
+        })
         
         # Save to file
-        output_file = transcript_file.replace('_transcript.json', '_mom.json')
+        output_file = artifact_path(transcript_file, 'mom')
         with open(output_file, 'w') as f:
             json.dump(mom, f, indent=2)
         
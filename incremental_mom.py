@@ -0,0 +1,190 @@
+"""
+Incremental MOM updates for growing transcripts (live meetings, recordings uploaded in parts)
+Only the part of the transcript not yet analyzed is sent to the model; results are merged into the existing MOM
+"""
+
+import os
+import sys
+import json
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from segment_store import as_segment_store, load_transcript
+from dedupe_items import dedupe_items, ITEM_FIELDS
+from transcript_compress import normalize_text, COMPRESS_LEVEL
+from timestamp_grounding import ground_mom
+from prompt_templates import get_prompt
+from media_probe import artifact_path
+from token_budget import MOM_MODEL, count_tokens, transcript_units, chunk_units, format_time_range
+from process_long_meeting import (generate_mom_from_transcript, extract_chunk, combine_partials, call_json,
+                                  MAX_PARALLEL_CHUNKS)
+
+# Don't call the model until at least this much new transcript has arrived
+MOM_INCREMENT_MIN_TOKENS = int(os.getenv("MOM_INCREMENT_MIN_TOKENS", "1500"))
+MAX_KEY_POINTS = 12
+
+# MOM lists merged item by item (the rest of the overview is rewritten each update)
+MERGED_LISTS = ['decisions', 'action_items', 'questions']
+
+def merge_items(existing, new, field):
+    """
+    Merge new items into a MOM list, folding near-duplicates into one
+
+    Args:
+        existing: Current MOM list
+        new: Newly extracted items
+        field: Dict field holding the item text
+
+    Returns:
+        list: Existing items (possibly enriched by their duplicates) followed by genuinely new ones
+    """
+    return dedupe_items(list(existing or []) + list(new or []), field)
+
+def _unit_kind(store):
+    return 'segments' if store.segment_count > 1 else 'sentences'
+
+def _incremental_state(store, units):
+    last_end = units[-1]['end'] if units else None
+    return {
+        'unit_kind': _unit_kind(store),
+        'units_analyzed': len(units),
+        'analyzed_until': last_end,
+    }
+
+def _update_overview(mom, notes, time_range, force=False):
+    """
+    Refresh summary, key points, next steps and topics from the new notes only
+
+    The prompt holds the current overview plus the new notes, so its size
+    doesn't grow with the length of the meeting.
+    """
+    current = {
+        'summary': mom.get('summary', ''),
+        'key_points': mom.get('key_points', []),
+        'next_steps': mom.get('next_steps', []),
+        'topics_discussed': mom.get('topics_discussed', []),
+    }
+
+    template = get_prompt('overview_update')
+    prompt = template.render(max_key_points=MAX_KEY_POINTS, current=json.dumps(current), notes=json.dumps(notes),
+                             time_range=f" ({time_range})" if time_range else "")
+
+    return call_json(template.system, prompt, "Overview update", bypass=force)
+
+def update_mom(transcript_data, mom=None, force=False, min_new_tokens=MOM_INCREMENT_MIN_TOKENS):
+    """
+    Bring a MOM up to date with a transcript that has grown since it was generated
+
+    Args:
+        transcript_data: Transcript dict or SegmentStore (the full, grown transcript)
+        mom: MOM from an earlier call (None, or a MOM without incremental state,
+             triggers a full generation)
+        force: Skip the LLM response cache
+        min_new_tokens: Leave the MOM unchanged until this much new text has arrived
+                        (pass 0 for a final refresh)
+
+    Returns:
+        dict: Updated MOM (the input MOM if nothing was done), or None if a full generation failed
+    """
+    store = as_segment_store(transcript_data)
+    units = transcript_units(store)
+    state = (mom or {}).get('metadata', {}).get('incremental')
+
+    if (not mom or not state or state.get('unit_kind') != _unit_kind(store)
+            or state.get('units_analyzed', 0) > len(units)):
+        print("🆕 No incremental state for this transcript, generating full MOM")
+        mom = generate_mom_from_transcript(store, force)
+        if mom:
+            mom['metadata']['incremental'] = dict(_incremental_state(store, units), updates=0)
+        return mom
+
+    new_units = units[state['units_analyzed']:]
+    if COMPRESS_LEVEL != 'off':
+        new_units = [dict(unit, text=normalize_text(unit['text'])) for unit in new_units]
+        new_units = [unit for unit in new_units if unit['text']]
+    new_tokens = sum(count_tokens(unit['text'], MOM_MODEL) for unit in new_units)
+    if not new_units or new_tokens < min_new_tokens:
+        print(f"⏭️  {new_tokens:,} new tokens (< {min_new_tokens:,}), MOM left as is")
+        return mom
+
+    chunks = chunk_units(new_units, overlap_tokens=0)
+    time_range = format_time_range(chunks[0]['start'], chunks[-1]['end'])
+    print(f"➕ Analyzing {len(new_units)} new units ({new_tokens:,} tokens) in {len(chunks)} chunk(s)")
+
+    workers = max(1, min(MAX_PARALLEL_CHUNKS, len(chunks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda args: extract_chunk(*args, total=len(chunks), bypass=force),
+            enumerate(chunks, 1)
+        ))
+
+    if any(result is None for result in results):
+        # Keep the old state so the whole tail is retried next time (finished chunks come from the cache)
+        print("⚠️  Some new chunks failed, MOM left as is")
+        return mom
+
+    notes = combine_partials(results)
+    updated = dict(mom)
+    for key in MERGED_LISTS:
+        updated[key] = merge_items(mom.get(key), notes.get(key), ITEM_FIELDS[key])
+
+    overview = _update_overview(mom, notes, time_range, force)
+    if overview:
+        updated.update({k: v for k, v in overview.items()
+                        if k in ('summary', 'key_points', 'next_steps', 'topics_discussed')})
+    else:
+        # Keep going without a fresh summary; new key points are still recorded
+        updated['key_points'] = merge_items(mom.get('key_points'), notes.get('key_points'), ITEM_FIELDS['key_points'])
+
+    metadata = dict(mom.get('metadata', {}))
+    metadata.update({
+        'updated_at': datetime.now().isoformat(),
+        'duration': store.duration,
+        'word_count': store.word_count,
+        'incremental': dict(_incremental_state(store, units), updates=state.get('updates', 0) + 1),
+    })
+    updated['metadata'] = metadata
+    ground_mom(updated, store)
+
+    print(f"✅ MOM updated: {len(updated.get('decisions', []))} decisions, "
+          f"{len(updated.get('action_items', []))} action items")
+    return updated
+
+def update_mom_file(transcript_file, mom_file=None, force=False, min_new_tokens=MOM_INCREMENT_MIN_TOKENS):
+    """
+    Update (or create) the MOM file for a transcript file
+
+    Args:
+        transcript_file: Path to the grown transcript JSON file
+        mom_file: MOM JSON path (defaults to the transcript's _mom.json)
+        force: Skip the LLM response cache
+        min_new_tokens: Minimum new text before the model is called
+
+    Returns:
+        dict: Current MOM, or None if it couldn't be generated
+    """
+    mom_file = mom_file or artifact_path(transcript_file, 'mom')
+
+    mom = None
+    if os.path.exists(mom_file):
+        with open(mom_file, 'r') as f:
+            mom = json.load(f)
+
+    updated = update_mom(load_transcript(transcript_file), mom, force, min_new_tokens)
+    if updated is not None and updated is not mom:
+        tmp_file = f"{mom_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(updated, f, indent=2)
+        os.replace(tmp_file, mom_file)
+        print(f"💾 Saved MOM to: {mom_file}")
+    return updated
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python incremental_mom.py <transcript.json> [mom.json] [--force]")
+        sys.exit(1)
+
+    args = [a for a in sys.argv[1:] if a != '--force']
+    mom = update_mom_file(args[0], args[1] if len(args) > 1 else None,
+                          force='--force' in sys.argv, min_new_tokens=0)
+    sys.exit(0 if mom else 1)
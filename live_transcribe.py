@@ -0,0 +1,308 @@
+"""
+Live/incremental transcription for in-progress recordings
+Tails a growing audio file (or stdin) and transcribes rolling windows as audio arrives
+"""
+
+import os
+import sys
+import time
+import wave
+import tempfile
+import threading
+import subprocess
+import numpy as np
+
+from transcribe_audio import select_backend
+from whisper_client import backoff_seconds
+from silence_stripper import frame_energy_db, detect_speech_regions
+from media_probe import artifact_path
+from segment_store import save_transcript
+from incremental_mom import update_mom_file
+
+SAMPLE_RATE = 16000
+BYTES_PER_SECOND = SAMPLE_RATE * 2  # 16-bit mono PCM
+
+LIVE_WINDOW_SECONDS = float(os.getenv("LIVE_WINDOW_SECONDS", "30"))
+LIVE_OVERLAP_SECONDS = float(os.getenv("LIVE_OVERLAP_SECONDS", "5"))
+LIVE_IDLE_SECONDS = float(os.getenv("LIVE_IDLE_SECONDS", "20"))  # Recording is over once the file stops growing
+LIVE_MAX_WINDOW_FACTOR = 3  # Force-commit if nothing finalizes for this many windows
+LIVE_MAX_FINAL_FAILURES = 5  # Attempts at the audio left after the recording ends before giving up
+
+class PcmTail:
+    """
+    Decode a growing file or stdin pipe to 16kHz mono PCM in a background thread
+
+    Only containers that can be read while being written work here
+    (WebM/MKV, Ogg, MP3, WAV, MPEG-TS); MP4/MOV write their index last.
+    """
+
+    def __init__(self, source, idle_seconds=LIVE_IDLE_SECONDS):
+        if source == '-':
+            input_args = ['-i', 'pipe:0']
+            stdin = sys.stdin.buffer
+        else:
+            # follow=1 keeps reading as the file grows; rw_timeout ends the stream once it stops
+            input_args = ['-follow', '1', '-rw_timeout', str(int(idle_seconds * 1_000_000)),
+                          '-i', f'file:{source}']
+            stdin = subprocess.DEVNULL
+
+        self.process = subprocess.Popen(
+            ['ffmpeg', '-v', 'error'] + input_args +
+            ['-vn', '-ac', '1', '-ar', str(SAMPLE_RATE), '-f', 's16le', '-'],
+            stdin=stdin, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+
+        self._buffer = bytearray()
+        self._buffer_start = 0  # Absolute byte offset of _buffer[0]
+        self._lock = threading.Lock()
+        self.finished = False
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    def _read(self):
+        for block in iter(lambda: self.process.stdout.read(BYTES_PER_SECOND), b''):
+            with self._lock:
+                self._buffer.extend(block)
+        self.process.wait()
+        self.finished = True
+
+    def available_seconds(self):
+        """Absolute time (seconds) of the newest decoded audio"""
+        with self._lock:
+            return (self._buffer_start + len(self._buffer)) / BYTES_PER_SECOND
+
+    def read_range(self, start, end):
+        """Get PCM bytes between two absolute times"""
+        with self._lock:
+            first = max(0, _align(start * BYTES_PER_SECOND) - self._buffer_start)
+            last = max(0, _align(end * BYTES_PER_SECOND) - self._buffer_start)
+            return bytes(self._buffer[first:last])
+
+    def discard_before(self, t):
+        """Drop audio before an absolute time so memory stays bounded"""
+        with self._lock:
+            cut = _align(t * BYTES_PER_SECOND) - self._buffer_start
+            if cut > 0:
+                del self._buffer[:cut]
+                self._buffer_start += cut
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+
+def _align(byte_offset):
+    """Round down to a whole 16-bit sample"""
+    return int(byte_offset) // 2 * 2
+
+def _write_wav(pcm, path):
+    with wave.open(path, 'wb') as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        out.writeframes(pcm)
+
+def is_silent(pcm):
+    """True if a PCM window has no speech regions (an empty transcript is then expected)"""
+    samples = np.frombuffer(pcm[:len(pcm) // 2 * 2], dtype=np.int16)
+    return not detect_speech_regions(frame_energy_db(samples))
+
+def select_final_segments(segments, committed_until, final_cutoff):
+    """
+    Pick the segments of a window that are new and will not change
+
+    Args:
+        segments: Window segments with absolute start/end times, in order
+        committed_until: End time of the last emitted segment
+        final_cutoff: Segments ending after this may still change (inf at end of stream)
+
+    Returns:
+        list: Segments to emit
+    """
+    final = []
+    for segment in segments:
+        if (segment['start'] + segment['end']) / 2 < committed_until:
+            continue  # Already emitted from the previous window's overlap
+        if segment['end'] > final_cutoff:
+            break  # Tail of the window - re-transcribe with more context next time
+        final.append(segment)
+    return final
+
+class MomRefresher:
+    """
+    Keep a transcript's MOM file up to date from a background thread
+
+    The capture loop only signals that new segments were saved, so it never
+    waits on the model. One update runs at a time; requests that arrive while
+    it runs collapse into a single follow-up run, which reads the newest
+    transcript, so stale requests are dropped.
+    """
+
+    def __init__(self, transcript_file):
+        self.transcript_file = transcript_file
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def request(self, segments=None):
+        """Ask for an update (usable directly as the on_segments callback)"""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopping:
+                return
+            try:
+                update_mom_file(self.transcript_file)
+            except Exception as e:
+                print(f"⚠️  MOM update failed: {e}")
+
+    def close(self):
+        """Stop the worker (a running update finishes first) and bring the MOM fully up to date"""
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        return update_mom_file(self.transcript_file, min_new_tokens=0)  # Pick up the last few segments
+
+def live_transcribe(source, output_file, window_seconds=LIVE_WINDOW_SECONDS,
+                    overlap_seconds=LIVE_OVERLAP_SECONDS, language=None, backend=None,
+                    on_segments=None):
+    """
+    Transcribe a recording while it is still being written
+
+    Args:
+        source: Path to a growing audio file, or '-' for stdin
+        output_file: Transcript JSON path, rewritten as segments become final
+        window_seconds: New audio needed before each transcription call
+        overlap_seconds: Audio re-sent from before the last committed point
+        language: Optional ISO-639-1 language hint
+        backend: "openai", "local" or "auto" (see transcribe_audio.select_backend)
+        on_segments: Optional callback receiving each batch of final segments
+                     (after output_file has been updated)
+
+    Returns:
+        dict: Final transcript with text, language, duration and segments
+    """
+    selected, reason = select_backend(backend)
+    print(f"🔴 Live transcription: {source}")
+    print(f"   Backend: {selected.name} ({reason}), {window_seconds:.0f}s windows, {overlap_seconds:.0f}s overlap")
+
+    transcript = {
+        "text": "",
+        "language": language or "en",
+        "duration": 0,
+        "segments": [],
+        "live": True
+    }
+    committed_until = 0.0  # Everything before this has been emitted
+    processed_until = 0.0  # Newest audio already transcribed successfully
+    failures = 0  # Consecutive failed attempts at the current window
+    work_dir = tempfile.mkdtemp(prefix="live_")
+    window_path = os.path.join(work_dir, 'window.wav')
+    tail = PcmTail(source)
+
+    try:
+        while True:
+            available = tail.available_seconds()
+            eof = tail.finished
+
+            # Wait for a full window of new audio (or the end of the recording)
+            if not eof and available - processed_until < window_seconds:
+                time.sleep(0.5)
+                continue
+
+            window_start = max(0.0, committed_until - overlap_seconds)
+            pcm = tail.read_range(window_start, available)
+            if len(pcm) < BYTES_PER_SECOND // 2:
+                break  # Nothing meaningful left
+
+            _write_wav(pcm, window_path)
+            # Automatic chunking: a window retried through a long outage can outgrow the upload limit
+            result = selected.transcribe(window_path, max_retries=2, chunked=None, language=language)
+
+            if not result and not is_silent(pcm):
+                # Failed call: keep the window (audio is not discarded) and retry it with backoff
+                failures += 1
+                if eof and failures >= LIVE_MAX_FINAL_FAILURES:
+                    print(f"❌ Could not transcribe {window_start:.1f}s-{available:.1f}s "
+                          f"after {failures} attempts - transcript ends at {committed_until:.1f}s")
+                    break
+                wait = backoff_seconds(failures - 1)
+                print(f"⚠️  Transcription failed for {window_start:.1f}s-{available:.1f}s, "
+                      f"retrying in {wait:.1f}s (newer audio is included)")
+                time.sleep(wait)
+                continue
+
+            failures = 0
+            processed_until = available
+
+            segments = []
+            if result:
+                transcript["language"] = result.get("language", transcript["language"])
+                segments = [
+                    dict(segment, start=segment['start'] + window_start, end=segment['end'] + window_start)
+                    for segment in result['segments']
+                ]
+
+            # Segments in the last overlap may still change once more audio arrives
+            stalled = available - committed_until > window_seconds * LIVE_MAX_WINDOW_FACTOR
+            final_cutoff = float('inf') if eof or stalled else available - overlap_seconds
+            final = select_final_segments(segments, committed_until, final_cutoff)
+
+            if final:
+                committed_until = final[-1]['end']
+                transcript["segments"].extend(final)
+                transcript["text"] = " ".join(s['text'].strip() for s in transcript["segments"]).strip()
+                for segment in final:
+                    print(f"   [{segment['start']:7.1f}s] {segment['text'].strip()}")
+            elif not segments:
+                # Silent window: nothing was said, so it is safe to move past it
+                committed_until = max(committed_until, final_cutoff if final_cutoff != float('inf') else available)
+
+            transcript["duration"] = available
+            save_transcript(transcript, output_file)
+            if final and on_segments:
+                on_segments(final)  # Called after saving so callbacks can read the output file
+            tail.discard_before(committed_until - overlap_seconds)
+
+            if eof:
+                break
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopped by user")
+    finally:
+        tail.stop()
+        if os.path.exists(window_path):
+            os.remove(window_path)
+        os.rmdir(work_dir)
+
+    transcript["live"] = False
+    save_transcript(transcript, output_file)
+    print(f"✅ Live transcription finished: {len(transcript['segments'])} segments, "
+          f"{transcript['duration']/60:.1f} minutes")
+    print(f"💾 Saved transcript to: {output_file}")
+    return transcript
+
+if __name__ == "__main__":
+    # --mom keeps <output>_mom.json up to date, analysing only new transcript each time
+    refresh_mom = '--mom' in sys.argv
+    args = [a for a in sys.argv[1:] if a != '--mom']
+
+    if not args:
+        print("Usage: python live_transcribe.py <growing_audio_file | -> [output.json] [--mom]")
+        sys.exit(1)
+
+    source = args[0]
+    if len(args) > 1:
+        output_file = args[1]
+    elif source == '-':
+        output_file = "live_transcript.json"
+    else:
+        output_file = artifact_path(source, 'transcript')
+
+    refresher = MomRefresher(output_file) if refresh_mom else None
+    live_transcribe(source, output_file, on_segments=refresher.request if refresher else None)
+
+    if refresher:
+        refresher.close()
@@ -0,0 +1,296 @@
+"""
+Persistent cache for chat completion responses
+SQLite-backed, keyed by model + messages + temperature + response_format, with TTL and LRU size limit
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", str(24 * 7)))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "100"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") != "0"
+
+class LLMCache:
+    """
+    Chat completion cache shared by every GPT call site
+
+    One short-lived connection per operation keeps it safe to use from the
+    map/reduce worker threads; WAL mode lets readers and a writer overlap.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl_hours=LLM_CACHE_TTL_HOURS, max_mb=LLM_CACHE_MAX_MB):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:  # Commit on success, roll back on error
+                yield db
+        finally:
+            db.close()
+
+    def make_key(self, model, messages, temperature=None, response_format=None):
+        """
+        Build the cache key for a request
+
+        Args:
+            model: Model name
+            messages: Chat messages list
+            temperature: Sampling temperature
+            response_format: response_format argument (e.g. {"type": "json_object"})
+
+        Returns:
+            str: Hex digest
+        """
+        raw = json.dumps({
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "response_format": response_format
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Look up a response
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            str: Cached response content, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute("SELECT content, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] <= self.ttl_seconds:
+                db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                self._count(db, 'hits')
+                return row[0]
+
+            if row:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._count(db, 'misses')
+        return None
+
+    def put(self, key, model, content):
+        """
+        Store a response and evict least recently used entries over the size limit
+
+        Args:
+            key: Cache key from make_key()
+            model: Model name (kept for stats)
+            content: Response content
+        """
+        now = time.time()
+        size = len(content.encode('utf-8'))
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, content, size, now, now)
+            )
+        self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then the least recently used until under max_bytes"""
+        with self._lock, self._connect() as db:
+            expired = db.execute("DELETE FROM responses WHERE created_at < ?",
+                                 (time.time() - self.ttl_seconds,)).rowcount
+
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            evicted = 0
+            if total > self.max_bytes:
+                for key, size in db.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    evicted += 1
+
+            if expired + evicted:
+                self._count(db, 'evictions', expired + evicted)
+
+    def record_usage(self, prompt_tokens, cached_tokens, completion_tokens):
+        """
+        Add one API call's token usage to the running totals
+
+        Args:
+            prompt_tokens: Prompt tokens billed
+            cached_tokens: Prompt tokens served from the provider's prompt cache
+            completion_tokens: Completion tokens
+        """
+        with self._connect() as db:
+            self._count(db, 'api_calls')
+            self._count(db, 'prompt_tokens', prompt_tokens)
+            self._count(db, 'cached_prompt_tokens', cached_tokens)
+            self._count(db, 'completion_tokens', completion_tokens)
+
+    def _count(self, db, name, amount=1):
+        db.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def clear(self):
+        """Delete every cached response"""
+        with self._connect() as db:
+            db.execute("DELETE FROM responses")
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+            dict: hits, misses, evictions, hit_rate, entries, size_mb, plus API token totals
+                  (api_calls, prompt_tokens, cached_prompt_tokens, completion_tokens, prompt_cache_rate)
+        """
+        with self._connect() as db:
+            stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'api_calls': 0,
+                     'prompt_tokens': 0, 'cached_prompt_tokens': 0, 'completion_tokens': 0}
+            stats.update(dict(db.execute("SELECT name, value FROM counters").fetchall()))
+            entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+        stats['entries'] = entries
+        stats['size_mb'] = size / (1024 * 1024)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['prompt_cache_rate'] = (stats['cached_prompt_tokens'] / stats['prompt_tokens']
+                                      if stats['prompt_tokens'] else 0.0)
+        return stats
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_llm_cache():
+    """Get the shared cache instance"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
+
+def report_usage(usage, label, cache=None):
+    """
+    Print the cached vs uncached prompt tokens of one API call and add them to the totals
+
+    Args:
+        usage: response.usage of a chat completion (None when the API didn't send it)
+        label: Name of the call for the log line
+        cache: LLMCache keeping the running totals
+    """
+    if usage is None:
+        return
+    details = getattr(usage, 'prompt_tokens_details', None)
+    cached = (getattr(details, 'cached_tokens', None) or 0) if details else 0
+    prompt = usage.prompt_tokens or 0
+    completion = usage.completion_tokens or 0
+    share = f" ({cached / prompt:.0%})" if prompt else ""
+    print(f"   🧾 {label}: {prompt:,} prompt tokens, {cached:,} cached{share}, "
+          f"{prompt - cached:,} uncached, {completion:,} completion")
+    if cache:
+        cache.record_usage(prompt, cached, completion)
+
+def cached_chat_completion(client, model, messages, temperature=None, response_format=None, bypass=False,
+                           on_delta=None, label=None):
+    """
+    Run a chat completion through the response cache
+
+    API errors propagate unchanged so callers keep their own error handling.
+
+    Args:
+        client: OpenAI client
+        model: Model name
+        messages: Chat messages list
+        temperature: Sampling temperature
+        response_format: Optional response_format (e.g. {"type": "json_object"})
+        bypass: Skip the lookup and regenerate (the fresh response still replaces the cached one)
+        on_delta: Optional callback; the response is streamed and each text delta passed to it
+                  (a cached response arrives as one delta)
+        label: Name of the call in the token usage log line (defaults to the model)
+
+    Returns:
+        str: Response message content
+    """
+    cache = get_llm_cache() if LLM_CACHE_ENABLED else None
+    key = None
+
+    if cache:
+        key = cache.make_key(model, messages, temperature, response_format)
+        if not bypass:
+            content = cache.get(key)
+            if content is not None:
+                if on_delta:
+                    on_delta(content)
+                return content
+
+    options = {}
+    if temperature is not None:
+        options['temperature'] = temperature
+    if response_format is not None:
+        options['response_format'] = response_format
+
+    if on_delta:
+        parts = []
+        usage = None
+        stream = client.chat.completions.create(model=model, messages=messages, stream=True,
+                                                stream_options={"include_usage": True}, **options)
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                on_delta(delta)
+            usage = getattr(chunk, 'usage', None) or usage  # Sent with the last chunk
+        content = ''.join(parts)
+    else:
+        response = client.chat.completions.create(model=model, messages=messages, **options)
+        content = response.choices[0].message.content
+        usage = getattr(response, 'usage', None)
+
+    report_usage(usage, label or model, cache)
+
+    if cache and content:
+        cache.put(key, model, content)
+    return content
+
+if __name__ == "__main__":
+    import sys
+
+    cache = get_llm_cache()
+    if len(sys.argv) > 1 and sys.argv[1] == "--clear":
+        cache.clear()
+        print("🗑️  LLM response cache cleared")
+
+    stats = cache.stats()
+    print("🧠 LLM response cache")
+    print(f"   Entries: {stats['entries']} ({stats['size_mb']:.1f}MB)")
+    print(f"   Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {stats['hit_rate']:.0%}")
+    print(f"   Evictions: {stats['evictions']}")
+    print(f"   API calls: {stats['api_calls']}  Prompt tokens: {stats['prompt_tokens']:,} "
+          f"({stats['cached_prompt_tokens']:,} cached by the provider, {stats['prompt_cache_rate']:.0%})")
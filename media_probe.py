@@ -0,0 +1,273 @@
+"""
+Media inspection layer
+Sniffs container/codec from file headers, caches ffprobe results per file
+identity (path, size, mtime, inode), and derives artifact paths (transcript, MOM) from media paths
+"""
+
+import os
+import json
+import hashlib
+import subprocess
+import threading
+from pathlib import Path
+
+try:
+    import fcntl  # Cross-process lock for the shared cache file (POSIX only)
+except ImportError:
+    fcntl = None
+
+PROBE_CACHE_FILE = os.getenv("MEDIA_PROBE_CACHE", ".media_probe_cache.json")
+PROBE_CACHE_MAX_ENTRIES = 2000
+
+# Containers the Whisper API accepts, mapped to the extension it expects
+WHISPER_CONTAINERS = {
+    'mp3': '.mp3',
+    'wav': '.wav',
+    'flac': '.flac',
+    'ogg': '.ogg',
+    'm4a': '.m4a',
+    'mp4': '.mp4',
+    'webm': '.webm',
+}
+
+# Suffixes stripped from a stem before deriving another artifact's name
+ARTIFACT_KINDS = ['transcript', 'mom']
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def sniff_media(path):
+    """
+    Identify container (and codec where the header shows it) from magic bytes
+
+    Args:
+        path: Path to media file
+
+    Returns:
+        dict: container ('mp3', 'wav', 'flac', 'ogg', 'webm', 'mkv', 'm4a', 'mp4',
+              'mov', 'avi', 'flv', 'asf', 'mpegts', or None), codec (or None),
+              may_have_video (bool)
+    """
+    with open(path, 'rb') as f:
+        head = f.read(4096)
+
+    info = {'container': None, 'codec': None, 'may_have_video': True}
+
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        info.update(container='wav', codec='pcm', may_have_video=False)
+    elif head[:4] == b'RIFF' and head[8:12] == b'AVI ':
+        info.update(container='avi')
+    elif head[:3] == b'ID3' or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        info.update(container='mp3', codec='mp3', may_have_video=False)
+    elif head[:4] == b'fLaC':
+        info.update(container='flac', codec='flac', may_have_video=False)
+    elif head[:4] == b'OggS':
+        codec = 'opus' if b'OpusHead' in head else 'vorbis' if b'vorbis' in head else \
+            'flac' if b'FLAC' in head else None
+        info.update(container='ogg', codec=codec, may_have_video=b'theora' in head)
+    elif head[:4] == b'\x1aE\xdf\xa3':
+        info.update(container='webm' if b'webm' in head[:64] else 'mkv')
+    elif head[4:8] == b'ftyp':
+        brand = head[8:12]
+        if brand in (b'M4A ', b'M4B '):
+            info.update(container='m4a', codec='aac', may_have_video=False)
+        elif brand == b'qt  ':
+            info.update(container='mov')
+        else:
+            info.update(container='mp4')
+    elif head[:3] == b'FLV':
+        info.update(container='flv')
+    elif head[:4] == b'0&\xb2u':
+        info.update(container='asf')  # WMV/WMA
+    elif head[:1] == b'G' and head[188:189] == b'G':
+        info.update(container='mpegts')
+
+    return info
+
+def file_identity(path):
+    """
+    Cache key for a file: resolved path, size, modification time (ns) and inode
+
+    Any rewrite of the file changes its mtime, so a different or edited
+    recording never reuses another file's cached values.
+
+    Args:
+        path: Path to file
+
+    Returns:
+        str: Hex digest
+    """
+    st = os.stat(path)
+    raw = f"{os.path.realpath(path)}|{st.st_size}|{st.st_mtime_ns}|{st.st_ino}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def _read_cache_file():
+    try:
+        with open(PROBE_CACHE_FILE, 'r') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        _cache = _read_cache_file()
+    return _cache
+
+class _CacheFileLock:
+    """Exclusive lock on <cache>.lock so concurrent processes don't interleave writes"""
+
+    def __enter__(self):
+        self._file = None
+        if fcntl is not None:
+            try:
+                self._file = open(f"{PROBE_CACHE_FILE}.lock", 'a')
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+            except OSError:
+                self._file = None
+        return self
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+
+def _store_value(key, name, value):
+    """Merge one value into the cache file (read-modify-write under the file lock, atomic replace)"""
+    global _cache
+    with _cache_lock, _CacheFileLock():
+        cache = _read_cache_file()  # Pick up entries other processes wrote since we loaded
+        entry = cache.pop(key, {})
+        entry[name] = value
+        cache[key] = entry
+
+        # Keep the most recently written entries (dicts preserve insertion order)
+        while len(cache) > PROBE_CACHE_MAX_ENTRIES:
+            cache.pop(next(iter(cache)))
+        _cache = cache
+
+        tmp_file = f"{PROBE_CACHE_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_file, PROBE_CACHE_FILE)
+        except OSError:
+            pass  # Cache is an optimization only
+
+def cached_media_value(path, name, compute):
+    """
+    Get a per-file value from the file-identity cache, computing it on a miss
+
+    Args:
+        path: Path to media file
+        name: Value name (e.g. 'probe', 'audio_hash')
+        compute: Function of path returning the value (None results aren't cached)
+
+    Returns:
+        Cached or freshly computed value
+    """
+    key = file_identity(path)
+
+    with _cache_lock:
+        entry = _load_cache().get(key, {})
+        if name in entry:
+            return entry[name]
+
+    value = compute(path)
+    if value is None:
+        return None
+
+    _store_value(key, name, value)
+    return value
+
+def _run_ffprobe(media_path):
+    try:
+        result = subprocess.run([
+            'ffprobe',
+            '-v', 'error',
+            '-show_entries', 'format=duration,bit_rate:stream=codec_type,codec_name,channels,sample_rate',
+            '-of', 'json',
+            media_path
+        ], capture_output=True, text=True)
+        data = json.loads(result.stdout or '{}')
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if result.returncode != 0 or 'format' not in data:
+        return None
+
+    streams = data.get('streams', [])
+    audio = next((st for st in streams if st.get('codec_type') == 'audio'), {})
+
+    try:
+        duration = float(data['format'].get('duration'))
+    except (TypeError, ValueError):
+        duration = None
+
+    return {
+        'duration': duration,
+        'bit_rate': int(data['format'].get('bit_rate') or 0),
+        'audio_codec': audio.get('codec_name'),
+        'channels': audio.get('channels'),
+        'sample_rate': int(audio.get('sample_rate') or 0),
+        'has_video': any(st.get('codec_type') == 'video' for st in streams),
+    }
+
+def probe_media(media_path):
+    """
+    Read duration, codec and stream info with ffprobe (cached per file identity)
+
+    Args:
+        media_path: Path to audio or video file
+
+    Returns:
+        dict: duration, bit_rate, audio_codec, channels, sample_rate, has_video,
+              or None if ffprobe is missing or can't read the file
+    """
+    return cached_media_value(media_path, 'probe', _run_ffprobe)
+
+def whisper_upload_ok(media_path, sniffed=None):
+    """
+    True if the file's real container is one Whisper accepts and matches its extension
+    (Whisper picks the decoder from the file name)
+
+    Args:
+        media_path: Path to media file
+        sniffed: Optional sniff_media() result
+    """
+    sniffed = sniffed or sniff_media(media_path)
+    expected_ext = WHISPER_CONTAINERS.get(sniffed['container'])
+    ext = Path(media_path).suffix.lower()
+    if sniffed['container'] == 'ogg':
+        return ext in ('.ogg', '.oga')
+    if sniffed['container'] == 'mp3':
+        return ext in ('.mp3', '.mpga', '.mpeg')
+    if sniffed['container'] in ('mp4', 'm4a'):
+        return ext in ('.mp4', '.m4a')  # Same ISO-BMFF container, brands vary by tool
+    return expected_ext is not None and ext == expected_ext
+
+def artifact_path(source_path, kind, directory=None):
+    """
+    Derive an artifact path like meeting_transcript.json from any media or artifact path
+
+    Works for every extension (.ogg, .flac, .mkv, ...) and for other artifacts,
+    e.g. artifact_path('transcripts/x_transcript.json', 'mom', 'moms') -> 'moms/x_mom.json'
+
+    Args:
+        source_path: Media file or another artifact
+        kind: Artifact kind ('transcript', 'mom')
+        directory: Output directory (defaults to the source's directory)
+
+    Returns:
+        str: Artifact path
+    """
+    source = Path(source_path)
+    stem = source.stem
+    for existing in ARTIFACT_KINDS:
+        if stem.endswith(f"_{existing}"):
+            stem = stem[:-len(existing) - 1]
+            break
+
+    directory = Path(directory) if directory is not None else source.parent
+    return str(directory / f"{stem}_{kind}.json")
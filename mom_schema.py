@@ -0,0 +1,113 @@
+"""
+MOM schema validation and per-section repair helpers
+Checks each top-level section on its own so only broken sections are regenerated
+"""
+
+import os
+import json
+
+from mom_stream import JsonSectionParser
+from prompt_templates import get_prompt
+from token_budget import MOM_MODEL
+
+# Models tried in order: the cheap/fast one first, stronger ones only when validation still fails
+MOM_MODEL_CASCADE = [m.strip() for m in os.getenv("MOM_MODEL_CASCADE", f"{MOM_MODEL},gpt-4o").split(',') if m.strip()]
+
+# Section -> (expected type, description used in repair prompts)
+SECTION_SPECS = {
+    'summary': (str, "A 3-5 sentence overview of what was discussed"),
+    'key_points': (list, "Array of main discussion points (strings)"),
+    'decisions': (list, 'Array of decisions made, each {"decision", "made_by", "timestamp"}'),
+    'action_items': (list, 'Array of tasks, each {"task", "owner", "deadline", "priority": high/medium/low}'),
+    'questions': (list, "Array of unresolved questions or concerns raised (strings)"),
+    'next_steps': (list, "Array of what should happen after this meeting (strings)"),
+    'attendees': (list, "Array of people mentioned in the meeting"),
+    'topics_discussed': (list, "Array of main topics/agenda items covered"),
+}
+
+# Sections each prompt has to produce
+SINGLE_CALL_SECTIONS = ['summary', 'key_points', 'decisions', 'action_items', 'questions', 'next_steps',
+                        'attendees', 'topics_discussed']
+FINAL_SECTIONS = ['summary', 'key_points', 'decisions', 'action_items', 'questions', 'next_steps',
+                  'topics_discussed']
+
+# List items that must be objects, and the field that must hold their text
+ITEM_TEXT_FIELDS = {'decisions': 'decision', 'action_items': 'task'}
+
+def salvage_sections(content):
+    """
+    Parse a MOM response, keeping every complete top-level section even if the JSON is broken
+
+    Args:
+        content: Raw response text (may be truncated or malformed)
+
+    Returns:
+        dict: Parsed sections (empty if nothing usable)
+    """
+    if not content:
+        return {}
+    try:
+        parsed = json.loads(content)
+        return parsed if isinstance(parsed, dict) else {}
+    except ValueError:
+        parser = JsonSectionParser()
+        parser.feed(content)
+        return dict(parser.sections)
+
+def normalize_mom(mom):
+    """
+    Coerce harmless shape differences instead of treating them as failures
+    (a string where a list is expected, plain-string decisions/action items)
+
+    Returns:
+        dict: New MOM dict
+    """
+    normalized = dict(mom)
+    for key, (kind, _) in SECTION_SPECS.items():
+        value = normalized.get(key)
+        if kind is list and isinstance(value, str) and value.strip():
+            normalized[key] = [value.strip()]
+        field = ITEM_TEXT_FIELDS.get(key)
+        if field and isinstance(normalized.get(key), list):
+            normalized[key] = [{field: item} if isinstance(item, str) else item for item in normalized[key]]
+    return normalized
+
+def validate_mom(mom, sections=SINGLE_CALL_SECTIONS):
+    """
+    Check each required section
+
+    Args:
+        mom: MOM dict (after normalize_mom)
+        sections: Required section names
+
+    Returns:
+        dict: section -> reason, for every missing or invalid section (empty when valid)
+    """
+    problems = {}
+    for key in sections:
+        kind, _ = SECTION_SPECS[key]
+        value = mom.get(key)
+        if value is None:
+            problems[key] = "missing"
+        elif not isinstance(value, kind):
+            problems[key] = f"expected {kind.__name__}"
+        elif kind is str and not value.strip():
+            problems[key] = "empty"
+        elif key in ITEM_TEXT_FIELDS:
+            field = ITEM_TEXT_FIELDS[key]
+            if any(not isinstance(item, dict) or not str(item.get(field, '')).strip() for item in value):
+                problems[key] = f"every item needs a \"{field}\""
+    return problems
+
+def repair_prompt(problems):
+    """
+    Follow-up prompt asking only for the broken sections
+
+    Args:
+        problems: Output of validate_mom()
+
+    Returns:
+        str: Prompt text
+    """
+    lines = [f"- {key}: {SECTION_SPECS[key][1]} (previous answer: {reason})" for key, reason in problems.items()]
+    return get_prompt('mom_repair').render(sections="\n".join(lines))
@@ -0,0 +1,109 @@
+"""
+Incremental parsing of a streamed JSON MOM
+Emits each top-level section (summary, key_points, decisions, ...) as soon as its value is complete
+"""
+
+import json
+
+class JsonSectionParser:
+    """
+    Feed chunks of a JSON object as they stream in; get back finished top-level members
+
+    Only the nesting depth and string state are tracked, so each character is
+    looked at once and a section is parsed with json.loads exactly once.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.key = None
+        self.key_start = None
+        self.value_start = None
+        self.sections = {}
+
+    def _emit(self, end, found):
+        try:
+            value = json.loads(self.text[self.value_start:end])
+        except ValueError:
+            value = None
+        else:
+            self.sections[self.key] = value
+            found.append((self.key, value))
+        self.key = None
+        self.value_start = None
+
+    def feed(self, delta):
+        """
+        Add streamed text
+
+        Args:
+            delta: Next piece of the JSON response
+
+        Returns:
+            list: (key, value) pairs for top-level members completed by this piece
+        """
+        self.text += delta
+        found = []
+
+        while self.pos < len(self.text):
+            ch = self.text[self.pos]
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.depth == 1:
+                        if self.key_start is not None:
+                            self.key = json.loads(self.text[self.key_start:self.pos + 1])
+                            self.key_start = None
+                        elif self.value_start is not None:
+                            self._emit(self.pos + 1, found)
+                self.pos += 1
+                continue
+
+            at_value = self.depth == 1 and self.key is not None and self.value_start is None
+
+            if ch == '"':
+                self.in_string = True
+                if at_value:
+                    self.value_start = self.pos
+                elif self.depth == 1 and self.key is None:
+                    self.key_start = self.pos
+            elif ch in '{[':
+                if at_value:
+                    self.value_start = self.pos
+                self.depth += 1
+            elif ch in '}]':
+                self.depth -= 1
+                if self.depth == 1 and self.value_start is not None:
+                    self._emit(self.pos + 1, found)  # Object/array section closed
+                elif self.depth == 0 and self.value_start is not None:
+                    self._emit(self.pos, found)  # Last section was a number/bool/null
+            elif ch == ',' and self.depth == 1 and self.value_start is not None:
+                self._emit(self.pos, found)  # Number/bool/null section
+            elif at_value and not ch.isspace() and ch != ':':
+                self.value_start = self.pos
+
+            self.pos += 1
+
+        return found
+
+def stream_sections(deltas):
+    """
+    Parse an iterable of streamed text pieces
+
+    Args:
+        deltas: Iterable of JSON text pieces
+
+    Yields:
+        tuple: (key, value) for each top-level member as it completes
+    """
+    parser = JsonSectionParser()
+    for delta in deltas:
+        yield from parser.feed(delta)
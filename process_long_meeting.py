@@ -5,247 +5,599 @@ Enhanced processor for long meetings with better error handling
 import os
 import sys
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import openai
 from openai import OpenAI
 from dotenv import load_dotenv
 from transcribe_audio import transcribe_audio
 from email_service import send_mom_email
+from media_probe import artifact_path
+from segment_store import load_transcript, save_transcript, as_segment_store
+from whisper_client import classify_error, backoff_seconds
+from llm_cache import cached_chat_completion
+from dedupe_items import dedupe_partials, dedupe_mom_lists
+from mom_stream import JsonSectionParser
+from prompt_templates import get_prompt
+from timestamp_grounding import SegmentIndex, ground_items, ground_mom
+from mom_schema import (ITEM_TEXT_FIELDS, MOM_MODEL_CASCADE, SINGLE_CALL_SECTIONS, FINAL_SECTIONS,
+                        salvage_sections, normalize_mom, validate_mom, repair_prompt)
+from transcript_compress import compress_transcript, print_compression_report
+from extractive_summary import extract_salient, EXTRACTIVE_ENABLED
+from token_budget import (MOM_MODEL, CHUNK_TOKEN_BUDGET, CHUNK_OVERLAP_TOKENS, MODEL_CONTEXT_TOKENS, PROMPT_TOKEN_RESERVE,
+                          SINGLE_CALL_TOKEN_BUDGET, count_tokens, chunk_transcript_tokens, format_time_range)
 
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# call_json does its own retries; the SDK's would stack on top of them
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
 
-def chunk_transcript(transcript_text, max_words=3000):
+MAX_PARALLEL_CHUNKS = int(os.getenv("MOM_MAX_PARALLEL", "4"))  # Chunks analysed at the same time
+CHUNK_MAX_RETRIES = 3
+
+# Reduce step: each merge call (and the final call) gets at most this many tokens of notes
+REDUCE_TOKEN_BUDGET = min(int(os.getenv("MOM_REDUCE_TOKENS", "12000")), MODEL_CONTEXT_TOKENS - PROMPT_TOKEN_RESERVE)
+REDUCE_MAX_LEVELS = 6
+REDUCE_MAX_KEY_POINTS = 12  # Key points kept per merged group
+PARTIAL_KEYS = ['key_points', 'decisions', 'action_items', 'questions']
+
+def chunk_transcript(transcript_data, max_tokens=CHUNK_TOKEN_BUDGET, overlap_tokens=CHUNK_OVERLAP_TOKENS):
     """
-    Split long transcript into chunks for processing
+    Split long transcript into token-budgeted chunks for processing
+    
+    Whole segments (or sentences, when there are no segments) are packed
+    until the budget is reached, so chunks never cut mid-sentence.
     
     Args:
-        transcript_text: Full transcript text
-        max_words: Maximum words per chunk
+        transcript_data: Transcript dict or SegmentStore
+        max_tokens: Maximum model tokens of transcript per chunk
+        overlap_tokens: Tokens repeated from the end of the previous chunk
     
     Returns:
-        list: List of transcript chunks
+        list: Chunk dicts with text, start, end and tokens
+    """
+    return chunk_transcript_tokens(transcript_data, max_tokens, overlap_tokens, MOM_MODEL)
+
+def fits_single_call(token_count):
     """
-    words = transcript_text.split()
-    chunks = []
+    Decide whether a transcript is analysed in one call or in chunks
     
-    for i in range(0, len(words), max_words):
-        chunk = ' '.join(words[i:i + max_words])
-        chunks.append(chunk)
+    Anything that fits the model context (minus instructions and the answer)
+    is one call. Chunked transcripts always run map-reduce; reduce_partials() then
+    adds hierarchical merge levels only when the actual chunk notes exceed the budget.
     
-    return chunks
+    Args:
+        token_count: Transcript tokens (after compression)
+    
+    Returns:
+        bool: True if the whole transcript fits one MOM call
+    """
+    return token_count <= SINGLE_CALL_TOKEN_BUDGET
+
+MOM_SYSTEM_PROMPT = get_prompt('mom_single').system
+CHUNK_SYSTEM_PROMPT = get_prompt('chunk_extract').system
+MERGE_SYSTEM_PROMPT = get_prompt('notes_merge').system
+FINAL_SYSTEM_PROMPT = get_prompt('mom_final').system
+
+def mom_prompt(transcript_text):
+    """Prompt for a MOM generated from the whole transcript in one call"""
+    return get_prompt('mom_single').render(transcript=transcript_text)
+
+def chunk_prompt(chunk):
+    """Prompt extracting notes from one chunk (chunk dict with text, start, end)"""
+    time_range = format_time_range(chunk['start'], chunk['end'])
+    heading = f"TRANSCRIPT SEGMENT ({time_range}):" if time_range else "TRANSCRIPT SEGMENT:"
+    return get_prompt('chunk_extract').render(heading=heading, text=chunk['text'])
 
-def generate_mom_for_long_meeting(transcript_file):
+def merge_prompt(group):
+    """Prompt merging a group of consecutive partial results into one set of notes"""
+    return get_prompt('notes_merge').render(max_key_points=REDUCE_MAX_KEY_POINTS,
+                                            notes=json.dumps(combine_partials(group)))
+
+def final_prompt(combined):
+    """Prompt building the final MOM from the combined chunk notes"""
+    return get_prompt('mom_final').render(**{key: json.dumps(combined[key]) for key in PARTIAL_KEYS})
+
+def generate_mom_for_long_meeting(transcript_file, force=False, on_section=None):
     """
     Generate MOM for long meetings by processing in chunks if needed
+    
+    Args:
+        transcript_file: Path to transcript JSON file
+        force: Regenerate even if the requests are in the LLM response cache
+        on_section: Optional callback(key, value) receiving each MOM section when it's ready
     """
     
     print(f"📄 Reading transcript: {transcript_file}")
     
-    with open(transcript_file, 'r') as f:
-        transcript_data = json.load(f)
+    return generate_mom_from_transcript(load_transcript(transcript_file), force, on_section)
+
+def generate_mom_from_transcript(transcript_data, force=False, on_section=None):
+    """
+    Generate MOM from transcript data with the fastest strategy that fits
     
-    transcript_text = transcript_data.get('text', '')
-    duration = transcript_data.get('duration', 0)
+    Args:
+        transcript_data: Transcript dict or SegmentStore
+        force: Regenerate even if the requests are in the LLM response cache
+        on_section: Optional callback(key, value); single-call MOMs stream their sections,
+                    chunked MOMs deliver them once the final call returns
+    
+    Returns:
+        dict: MOM, or None on failure
+    """
+    transcript_data = as_segment_store(transcript_data)
+    transcript_text = transcript_data.text
+    duration = transcript_data.duration
     
     if not transcript_text:
         print("❌ Error: Transcript is empty!")
         return None
     
-    word_count = len(transcript_text.split())
+    word_count = transcript_data.word_count
     print(f"📝 Transcript stats:")
     print(f"   Duration: {duration/60:.1f} minutes")
     print(f"   Characters: {len(transcript_text):,}")
     print(f"   Words: {word_count:,}")
     
-    # Check if transcript is too long (>4000 words = potential token limit issue)
-    if word_count > 4000:
-        print(f"⚠️  Long transcript detected ({word_count} words)")
-        print("   Using chunked processing strategy...")
-        return generate_mom_chunked(transcript_text, transcript_data)
+    # Items are matched back to the original segments for exact timestamps
+    original = transcript_data
+    index = SegmentIndex(original) if original.segment_count > 1 else None
+    
+    def on_grounded_section(key, value):
+        if index and key in ITEM_TEXT_FIELDS:
+            ground_items(value, ITEM_TEXT_FIELDS[key], index)
+        on_section(key, value)
+    
+    # Drop fillers and caption repetition before anything is sent to the model
+    compressed, compression = compress_transcript(transcript_data)
+    print_compression_report(compression)
+    transcript_data = as_segment_store(compressed)
+    token_count = compression['tokens_after']
+    
+    # Optional: drop the least salient segments, then route on what is left
+    transcript_data, token_count, extractive = extractive_pass(transcript_data, token_count)
+    transcript_text = transcript_data.text
+    
+    # One call can handle anything that fits the model context
+    single = fits_single_call(token_count)
+    if single:
+        print("   Single call (transcript size is manageable)")
+        mom = generate_mom_normal(transcript_text, transcript_data, force,
+                                  on_grounded_section if on_section else None)
     else:
-        print("   Normal processing (transcript size is manageable)")
-        return generate_mom_normal(transcript_text, transcript_data)
+        print(f"⚠️  Long transcript detected ({token_count:,} tokens > {SINGLE_CALL_TOKEN_BUDGET:,} single-call budget)")
+        print("   Using chunked processing...")
+        mom = generate_mom_chunked(transcript_text, transcript_data, force)
+    
+    if mom:
+        ground_mom(mom, original, index)
+        mom['metadata']['word_count'] = word_count
+        mom['metadata']['compression'] = compression
+        mom['metadata']['extractive'] = extractive
+        if not single and on_section:
+            for key, value in mom.items():
+                if key != 'metadata':
+                    on_section(key, value)
+    return mom
 
-def generate_mom_normal(transcript_text, transcript_data):
-    """Generate MOM for normal-length transcripts"""
+def generate_mom_normal(transcript_text, transcript_data, force=False, on_section=None):
+    """Generate MOM for normal-length transcripts in a single call"""
     
+    transcript_data = as_segment_store(transcript_data)
     print("🤖 Generating MOM with GPT-4...")
     print("⏳ This may take 30-60 seconds...")
     
     from datetime import datetime
     
-    prompt = f"""You are an expert meeting assistant. Analyze the following meeting transcript and generate a structured Minutes of Meeting (MOM).
-
-TRANSCRIPT:
-{transcript_text}
-
-Please extract and format the following information in JSON format:
-
-1. **summary**: A comprehensive 3-5 sentence overview of what was discussed
-2. **key_points**: Array of main discussion points (5-8 bullet points)
-3. **decisions**: Array of decisions made, each with:
-   - decision: The decision text
-   - made_by: Who made the decision (if mentioned, otherwise "Team")
-   - timestamp: Approximate time in transcript (if possible)
-4. **action_items**: Array of tasks, each with:
-   - task: What needs to be done
-   - owner: Who is responsible (if mentioned, otherwise "Unassigned")
-   - deadline: Deadline if mentioned (otherwise "Not specified")
-   - priority: high/medium/low based on context
-5. **questions**: Array of unresolved questions or concerns raised
-6. **next_steps**: What should happen after this meeting
-7. **attendees**: List of people mentioned in the meeting (if identifiable)
-8. **topics_discussed**: Main topics/agenda items covered
+    prompt = mom_prompt(transcript_text)
+    
+    mom, cascade = generate_validated_mom(MOM_SYSTEM_PROMPT, prompt, "MOM", SINGLE_CALL_SECTIONS,
+                                          bypass=force, on_section=on_section)
+    if mom is None:
+        print("❌ Error generating MOM")
+        return None
+    
+    # Add metadata
+    mom['metadata'] = dict(cascade, **{
+        'generated_at': datetime.now().isoformat(),
+        'duration': transcript_data.get('duration', 0),
+        'word_count': transcript_data.word_count,
+        'processing_method': 'single',
+        'prompt_templates': [get_prompt('mom_single').id]
+    })
+    
+    print("✅ MOM generated successfully!")
+    return mom
 
-Return ONLY valid JSON, no additional text.
-"""
+def call_json(system_prompt, prompt, label, max_retries=CHUNK_MAX_RETRIES, bypass=False, model=MOM_MODEL,
+              followup=None, on_delta=None, parse=json.loads, on_attempt=None):
+    """
+    Send one JSON-mode chat request, retrying this request alone on failure
+    
+    Args:
+        system_prompt: System message
+        prompt: User message
+        label: Name used in log lines (e.g. "Chunk 3/8")
+        max_retries: Maximum attempts
+        bypass: Skip the LLM response cache lookup
+        model: Model name
+        followup: Extra messages sent after the prompt (e.g. a repair request)
+        on_delta: Optional callback receiving the streamed response text
+        parse: Turns the response text into the result; a ValueError triggers a retry
+        on_attempt: Optional callback run before each attempt (e.g. to reset on_delta's state)
+    
+    Returns:
+        dict: Parsed JSON response, or None if every attempt failed
+    """
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt}
+    ] + list(followup or [])
+    
+    for attempt in range(max_retries):
+        if on_attempt:
+            on_attempt()
+        try:
+            content = cached_chat_completion(
+                client,
+                model=model,
+                messages=messages,
+                temperature=0.3,
+                response_format={"type": "json_object"},
+                bypass=bypass or attempt > 0,  # Never retry into a cached bad response
+                on_delta=on_delta,
+                label=label
+            )
+            
+            return parse(content)
+            
+        except openai.OpenAIError as e:
+            retryable, wait, description = classify_error(e)
+            print(f"   ⚠️  {label}: {description} (attempt {attempt + 1}/{max_retries})")
+            if not retryable:
+                return None
+        except ValueError as e:
+            wait = None
+            print(f"   ⚠️  {label}: invalid JSON ({e}) (attempt {attempt + 1}/{max_retries})")
+        
+        if attempt < max_retries - 1:
+            time.sleep(wait if wait is not None else backoff_seconds(attempt))
+    
+    return None
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a professional meeting assistant that creates clear, structured minutes of meetings. Always respond with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
-        )
+def generate_validated_mom(system_prompt, prompt, label, sections, bypass=False, on_section=None, mom=None):
+    """
+    Generate a MOM that passes schema validation, spending as little as possible
+    
+    The cheapest model in MOM_MODEL_CASCADE answers first. Sections that are
+    missing or invalid are then asked for in a targeted follow-up (the valid
+    ones are kept). A stronger model is used only when that still fails, and
+    it also repairs just the broken sections unless nothing usable exists yet.
+    
+    Args:
+        system_prompt: System message
+        prompt: Full MOM prompt
+        label: Name used in log lines
+        sections: Sections the MOM must contain
+        bypass: Skip the LLM response cache lookup
+        on_section: Optional callback(key, value); the first answer is streamed
+                    section by section, repaired sections follow when they are ready
+                    (a section is sent again if a retried answer changes it)
+        mom: Answer obtained elsewhere (e.g. from a batch) to validate and repair
+    
+    Returns:
+        tuple: (MOM dict or None if nothing usable was produced,
+                dict with model_used, models_tried, repaired_sections and invalid_sections)
+    """
+    emitted = {}
+    
+    def emit(sections_dict):
+        # A section shown from a failed attempt is shown again if the retry changed it
+        for key, value in sections_dict.items():
+            shown = json.dumps(value, sort_keys=True)  # Snapshot: on_section may annotate the value
+            if on_section and emitted.get(key) != shown:
+                emitted[key] = shown
+                on_section(key, value)
+    
+    on_delta = on_attempt = None
+    if on_section and mom is None:
+        parser = JsonSectionParser()
         
-        mom_json = response.choices[0].message.content
-        mom = json.loads(mom_json)
+        def on_attempt():
+            # A retry streams a new answer; text from a failed attempt must not be parsed with it
+            nonlocal parser
+            parser = JsonSectionParser()
         
-        # Add metadata
-        mom['metadata'] = {
-            'generated_at': datetime.now().isoformat(),
-            'duration': transcript_data.get('duration', 0),
-            'word_count': len(transcript_text.split()),
-            'processing_method': 'normal'
-        }
+        def on_delta(delta):
+            # Hold back sections that will be repaired so each is shown once
+            ready = normalize_mom({key: value for key, value in parser.feed(delta) if key in sections})
+            emit({key: value for key, value in ready.items() if not validate_mom(ready, [key])})
+    
+    mom = normalize_mom(mom or {})
+    cascade = {'model_used': None, 'models_tried': [], 'repaired_sections': [], 'invalid_sections': {}}
+    problems = validate_mom(mom, sections) if mom else {}
+    
+    for level, model in enumerate(MOM_MODEL_CASCADE):
+        if level:
+            print(f"   ⬆️  {label}: escalating to {model} ({', '.join(problems)} still invalid)")
+        cascade['models_tried'].append(model)
         
-        print("✅ MOM generated successfully!")
-        return mom
+        if not mom:
+            # Nothing to build on: ask for the whole MOM (complete sections survive broken JSON)
+            mom = normalize_mom(call_json(system_prompt, prompt, label, bypass=bypass, model=model,
+                                          on_delta=on_delta if level == 0 else None,
+                                          on_attempt=on_attempt if level == 0 else None,
+                                          parse=salvage_sections) or {})
+            problems = validate_mom(mom, sections)
         
-    except Exception as e:
-        print(f"❌ Error generating MOM: {e}")
-        return None
+        if mom and problems:
+            print(f"   🩹 {label}: regenerating {', '.join(problems)} with {model}")
+            kept = {key: value for key, value in mom.items() if key not in problems}
+            fix = call_json(system_prompt, prompt, f"{label} repair", bypass=bypass, model=model,
+                            followup=[
+                                {"role": "assistant", "content": json.dumps(kept)},
+                                {"role": "user", "content": repair_prompt(problems)}
+                            ],
+                            parse=salvage_sections)
+            fixed = {key: value for key, value in normalize_mom(fix or {}).items() if key in problems}
+            mom.update(fixed)
+            problems = validate_mom(mom, sections)
+            cascade['repaired_sections'].extend(key for key in fixed if key not in problems)
+        
+        if mom and not problems:
+            cascade['model_used'] = model
+            break
+    
+    if not mom:
+        return None, cascade
+    
+    if problems:
+        # Keep what is valid rather than failing the whole MOM
+        print(f"   ⚠️  {label}: still invalid after the model cascade: {problems}")
+        cascade['invalid_sections'] = problems
+    emit({key: value for key, value in mom.items() if key in sections})
+    return mom, cascade
 
-def generate_mom_chunked(transcript_text, transcript_data):
-    """Generate MOM for very long transcripts using chunked processing"""
-    
-    from datetime import datetime
+def extract_chunk(i, chunk, total, max_retries=CHUNK_MAX_RETRIES, bypass=False):
+    """
+    Extract key points, decisions, action items and questions from one chunk,
+    retrying this chunk alone on failure
     
-    print("🔀 Processing in chunks...")
+    Args:
+        i: Chunk number (1-based, for logging)
+        chunk: Chunk dict from chunk_transcript (text, start, end)
+        total: Number of chunks
+        max_retries: Maximum attempts
+        bypass: Skip the LLM response cache lookup
     
-    # Split into chunks
-    chunks = chunk_transcript(transcript_text, max_words=3000)
-    print(f"   Split into {len(chunks)} chunks")
+    Returns:
+        dict: Chunk result, or None if every attempt failed
+    """
+    prompt = chunk_prompt(chunk)
+    
+    chunk_result = call_json(
+        CHUNK_SYSTEM_PROMPT,
+        prompt, f"Chunk {i}/{total}", max_retries, bypass
+    )
+    if chunk_result is not None:
+        print(f"   ✅ Chunk {i}/{total} processed")
+    return chunk_result
+
+def combine_partials(partials):
+    """Concatenate partial results (chunk or merged notes) in meeting order"""
+    combined = {key: [] for key in PARTIAL_KEYS}
+    for partial in partials:
+        for key in PARTIAL_KEYS:
+            items = partial.get(key) or []
+            combined[key].extend(items if isinstance(items, list) else [items])
+    return combined
+
+def partial_tokens(partial):
+    """Tokens a partial result takes up when placed in a prompt"""
+    return count_tokens(json.dumps(partial), MOM_MODEL)
+
+def group_partials(partials, max_tokens=REDUCE_TOKEN_BUDGET):
+    """
+    Group consecutive partial results so each group fits in one reduce call
     
-    chunk_summaries = []
-    all_decisions = []
-    all_action_items = []
-    all_questions = []
+    Args:
+        partials: Partial results in meeting order
+        max_tokens: Token budget per group
     
-    # Process each chunk
-    for i, chunk in enumerate(chunks, 1):
-        print(f"\n   Processing chunk {i}/{len(chunks)}...")
-        
-        prompt = f"""Analyze this portion of a meeting transcript and extract key information.
-
-TRANSCRIPT SEGMENT:
-{chunk}
+    Returns:
+        list: Lists of consecutive partials (an oversized partial gets its own group)
+    """
+    groups = []
+    current = []
+    current_tokens = 0
+    
+    for partial in partials:
+        tokens = partial_tokens(partial)
+        if current and current_tokens + tokens > max_tokens:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(partial)
+        current_tokens += tokens
+    
+    if current:
+        groups.append(current)
+    return groups
 
-Extract:
-1. Key points discussed in this segment
-2. Any decisions made
-3. Any action items assigned
-4. Any questions raised
+def merge_partials(i, group, total, level, bypass=False):
+    """
+    Merge a group of consecutive partial results into one, removing duplicates
+    
+    Args:
+        i: Group number (1-based, for logging)
+        group: Partial results in meeting order
+        total: Number of groups on this level
+        level: Reduce level (for logging)
+        bypass: Skip the LLM response cache lookup
+    
+    Returns:
+        dict: Merged partial (the plain concatenation if the call fails)
+    """
+    label = f"Merge {i}/{total} (level {level})"
+    merged = call_json(MERGE_SYSTEM_PROMPT, merge_prompt(group), label, bypass=bypass)
+    if merged is None:
+        print(f"   ⚠️  {label} failed, keeping notes unmerged")
+        return combine_partials(group)
+    
+    print(f"   ✅ {label} done")
+    return merged
 
-Return as JSON with keys: key_points, decisions, action_items, questions
-"""
+def reduce_partials(partials, max_tokens=REDUCE_TOKEN_BUDGET, bypass=False):
+    """
+    Merge partial results level by level until they fit in one final call
+    
+    Each level groups consecutive partials within the token budget and merges
+    the groups concurrently, so the final prompt has a bounded size no matter
+    how long the meeting is.
+    
+    Args:
+        partials: Chunk results in meeting order
+        max_tokens: Token budget for each reduce call (and for the final input)
+        bypass: Skip the LLM response cache lookup
+    
+    Returns:
+        tuple: (partials that fit the budget, number of levels used)
+    """
+    level = 0
+    total_tokens = sum(partial_tokens(p) for p in partials)
+    
+    while total_tokens > max_tokens and level < REDUCE_MAX_LEVELS:
+        level += 1
+        groups = group_partials(partials, max_tokens)
+        print(f"\n🔁 Reduce level {level}: {len(partials)} partial results ({total_tokens:,} tokens) → {len(groups)} groups")
         
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "Extract key information from meeting segments. Return valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                response_format={"type": "json_object"}
-            )
-            
-            chunk_result = json.loads(response.choices[0].message.content)
-            
-            # Collect results
-            if chunk_result.get('key_points'):
-                chunk_summaries.extend(chunk_result['key_points'])
-            if chunk_result.get('decisions'):
-                all_decisions.extend(chunk_result['decisions'])
-            if chunk_result.get('action_items'):
-                all_action_items.extend(chunk_result['action_items'])
-            if chunk_result.get('questions'):
-                all_questions.extend(chunk_result['questions'])
-            
-            print(f"   ✅ Chunk {i} processed")
-            
-        except Exception as e:
-            print(f"   ⚠️  Error in chunk {i}: {e}")
-            continue
+        workers = max(1, min(MAX_PARALLEL_CHUNKS, len(groups)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            merged = list(executor.map(
+                lambda args: merge_partials(*args, total=len(groups), level=level, bypass=bypass),
+                enumerate(groups, 1)
+            ))
+        
+        merged_tokens = sum(partial_tokens(p) for p in merged)
+        if merged_tokens >= total_tokens:
+            print("   ⚠️  Merging no longer shrinks the notes, stopping reduce")
+            partials, total_tokens = merged, merged_tokens
+            break
+        partials, total_tokens = merged, merged_tokens
+    
+    return partials, level
+
+def reduce_chunk_results(chunk_results, force=False):
+    """
+    Turn chunk results into the notes for the final call
     
-    # Now create final comprehensive summary
-    print("\n🔄 Creating final comprehensive MOM...")
+    Near-duplicate items are merged locally first so the model only sees distinct ones.
     
-    combined_info = f"""
-Key Points: {json.dumps(chunk_summaries[:20])}  
-Decisions: {json.dumps(all_decisions)}
-Action Items: {json.dumps(all_action_items)}
-Questions: {json.dumps(all_questions)}
-"""
+    Args:
+        chunk_results: Chunk results in meeting order (None for failed chunks)
+        force: Skip the LLM response cache in merge calls
+    
+    Returns:
+        tuple: (combined notes dict, reduce levels used, duplicates removed)
+    """
+    partials, duplicates_removed = dedupe_partials([result for result in chunk_results if result])
+    print(f"   🧹 Removed {duplicates_removed} duplicate items across chunks")
     
-    final_prompt = f"""Based on the extracted information from a long meeting, create a comprehensive MOM.
+    partials, reduce_levels = reduce_partials(partials, bypass=force)
+    combined, removed = dedupe_mom_lists(combine_partials(partials))
+    return combined, reduce_levels, duplicates_removed + removed
 
-EXTRACTED INFORMATION:
-{combined_info}
+def extractive_pass(transcript_data, token_count):
+    """
+    Drop the least salient segments of a transcript too long for one call (MOM_EXTRACTIVE=1)
+    
+    Runs before routing, so a transcript that now fits is sent in a single call.
+    Off by default: whatever it drops is never seen by the model.
+    
+    Args:
+        transcript_data: SegmentStore (after compression)
+        token_count: Tokens in transcript_data
+    
+    Returns:
+        tuple: (SegmentStore, token count, extractive report or None if nothing was dropped)
+    """
+    if not EXTRACTIVE_ENABLED or fits_single_call(token_count):
+        return transcript_data, token_count, None
+    
+    reduced, extractive = extract_salient(transcript_data)
+    if extractive['units_kept'] == extractive['units_before']:
+        return transcript_data, token_count, None
+    
+    print(f"   ✂️  Extractive pass kept {extractive['units_kept']}/{extractive['units_before']} segments "
+          f"({extractive['cue_units']} with decision cues): {extractive['tokens_before']:,} → "
+          f"{extractive['tokens_after']:,} tokens - the rest is not analysed")
+    return as_segment_store(reduced), extractive['tokens_after'], extractive
 
-Create a final MOM with:
-1. summary: 3-5 sentence overall summary
-2. key_points: Top 8-10 most important points
-3. decisions: All decisions (remove duplicates)
-4. action_items: All action items (remove duplicates)
-5. questions: All unresolved questions
-6. next_steps: Recommended next steps
-7. topics_discussed: Main topics covered
+def prepare_chunks(transcript_data):
+    """
+    Split a transcript that is too long for one call into chunks
+    
+    Args:
+        transcript_data: Transcript dict or SegmentStore
+    
+    Returns:
+        list: Chunk dicts with text, start, end and tokens
+    """
+    chunks = chunk_transcript(transcript_data)
+    print(f"   Split into {len(chunks)} chunks of up to {CHUNK_TOKEN_BUDGET:,} tokens")
+    return chunks
 
-Return valid JSON only.
-"""
+def generate_mom_chunked(transcript_text, transcript_data, force=False):
+    """Generate MOM for very long transcripts using chunked processing"""
     
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "Create comprehensive meeting minutes. Return valid JSON."},
-                {"role": "user", "content": final_prompt}
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
-        )
-        
-        mom = json.loads(response.choices[0].message.content)
-        
-        # Add metadata
-        mom['metadata'] = {
-            'generated_at': datetime.now().isoformat(),
-            'duration': transcript_data.get('duration', 0),
-            'word_count': len(transcript_text.split()),
-            'chunks_processed': len(chunks),
-            'processing_method': 'chunked'
-        }
-        
-        print("✅ Comprehensive MOM generated!")
-        return mom
-        
-    except Exception as e:
-        print(f"❌ Error creating final MOM: {e}")
+    transcript_data = as_segment_store(transcript_data)
+    from datetime import datetime
+    
+    print("🔀 Processing in chunks...")
+    
+    chunks = prepare_chunks(transcript_data)
+    
+    # Map: analyse chunks concurrently; results come back in chunk order
+    workers = max(1, min(MAX_PARALLEL_CHUNKS, len(chunks)))
+    print(f"   Analysing up to {workers} chunks at a time")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunk_results = list(executor.map(
+            lambda args: extract_chunk(*args, total=len(chunks), bypass=force),
+            enumerate(chunks, 1)
+        ))
+    
+    failed_chunks = [i for i, result in enumerate(chunk_results, 1) if result is None]
+    if failed_chunks:
+        print(f"   ⚠️  {len(failed_chunks)} chunk(s) failed after {CHUNK_MAX_RETRIES} attempts: {failed_chunks}")
+    if len(failed_chunks) == len(chunks):
+        print("❌ Error: Every chunk failed, cannot build MOM")
+        return None
+    
+    # Reduce: merge chunk results in a tree until they fit one final call
+    combined, reduce_levels, duplicates_removed = reduce_chunk_results(chunk_results, force)
+    
+    # Now create final comprehensive summary
+    print("\n🔄 Creating final comprehensive MOM...")
+    
+    mom, cascade = generate_validated_mom(FINAL_SYSTEM_PROMPT, final_prompt(combined), "Final MOM",
+                                          FINAL_SECTIONS, bypass=force)
+    if mom is None:
+        print("❌ Error creating final MOM")
         return None
+    
+    # Add metadata
+    mom['metadata'] = dict(cascade, **{
+        'generated_at': datetime.now().isoformat(),
+        'duration': transcript_data.get('duration', 0),
+        'word_count': transcript_data.word_count,
+        'chunks_processed': len(chunks) - len(failed_chunks),
+        'chunks_failed': failed_chunks,
+        'reduce_levels': reduce_levels,
+        'duplicates_removed': duplicates_removed,
+        'processing_method': 'hierarchical' if reduce_levels else 'map_reduce',
+        'prompt_templates': [get_prompt(name).id for name in ('chunk_extract', 'notes_merge', 'mom_final')]
+    })
+    
+    print("✅ Comprehensive MOM generated!")
+    return mom
 
 if __name__ == "__main__":
     print("🎬 Long Meeting Processor")
@@ -274,7 +626,8 @@ if __name__ == "__main__":
         print("❌ Transcription failed.")
         sys.exit(1)
     
-    transcript_file = audio_file.replace('.mp3', '_transcript.json').replace('.webm', '_transcript.json')
+    transcript_file = artifact_path(audio_file, 'transcript')
+    save_transcript(transcript_result, transcript_file)
     
     # Step 2: Generate MOM
     print("\n📍 STEP 2/3: Generating MOM...")
@@ -285,7 +638,7 @@ if __name__ == "__main__":
         sys.exit(1)
     
     # Save MOM
-    mom_file = audio_file.replace('.mp3', '_mom.json').replace('.webm', '_mom.json')
+    mom_file = artifact_path(audio_file, 'mom')
     with open(mom_file, 'w') as f:
         json.dump(mom_data, f, indent=2)
     
@@ -7,6 +7,8 @@ import sys
 from transcribe_audio import transcribe_audio
 from generate_mom import generate_mom
 from email_service import send_mom_email
+from media_probe import artifact_path
+from segment_store import save_transcript
 
 def process_meeting_complete(audio_file, recipient_emails, meeting_title=None):
     """
@@ -40,7 +42,8 @@ def process_meeting_complete(audio_file, recipient_emails, meeting_title=None):
         return result
     
     result["transcription"] = "success"
-    transcript_file = audio_file.replace('.mp3', '_transcript.json').replace('.webm', '_transcript.json')
+    transcript_file = artifact_path(audio_file, 'transcript')
+    save_transcript(transcript_result, transcript_file)
     
     # Step 2: Generate MOM
     print("\n📍 STEP 2/3: Generating MOM...")
@@ -0,0 +1,216 @@
+"""
+Registry of every GPT prompt, with versioned template IDs
+Static system/instruction text comes first and per-request content last, so requests share a cacheable prefix
+"""
+
+class PromptTemplate:
+    """
+    One prompt layout
+
+    The user message is the instructions followed by the content. Only the
+    content should change from one request to the next (transcript, notes);
+    instructions may take settings that are fixed for a deployment.
+    """
+
+    def __init__(self, name, version, system, instructions, content):
+        self.name = name
+        self.version = version
+        self.id = f"{name}@v{version}"
+        self.system = system
+        self.instructions = instructions.strip()
+        self.content = content.strip()
+
+    def render(self, **values):
+        """
+        Build the user message
+
+        Args:
+            **values: Placeholders of the instructions and content
+
+        Returns:
+            str: Instructions, then the variable content
+        """
+        return f"{self.instructions.format(**values)}\n\n{self.content.format(**values)}\n"
+
+    def messages(self, **values):
+        """Chat messages for this template (system first, variable content last)"""
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.render(**values)}
+        ]
+
+PROMPTS = {}  # name -> {version: template}
+
+def register(template):
+    """Add a template version to the registry (older versions stay available)"""
+    PROMPTS.setdefault(template.name, {})[template.version] = template
+    return template
+
+def get_prompt(name, version=None):
+    """
+    Template for a prompt name
+
+    Args:
+        name: Prompt name
+        version: Version number (defaults to the newest)
+
+    Returns:
+        PromptTemplate: The requested version
+    """
+    versions = PROMPTS[name]
+    return versions[max(versions) if version is None else version]
+
+register(PromptTemplate(
+    "mom_single", 2,
+    system="You are a professional meeting assistant that creates clear, structured minutes of meetings. "
+           "Always respond with valid JSON.",
+    instructions="""
+You are an expert meeting assistant. Analyze the meeting transcript at the end of this message and generate a structured Minutes of Meeting (MOM).
+
+Please extract and format the following information in JSON format:
+
+1. **summary**: A comprehensive 3-5 sentence overview of what was discussed
+2. **key_points**: Array of main discussion points (5-8 bullet points)
+3. **decisions**: Array of decisions made, each with:
+   - decision: The decision text
+   - made_by: Who made the decision (if mentioned, otherwise "Team")
+   - timestamp: Approximate time in transcript (if possible)
+4. **action_items**: Array of tasks, each with:
+   - task: What needs to be done
+   - owner: Who is responsible (if mentioned, otherwise "Unassigned")
+   - deadline: Deadline if mentioned (otherwise "Not specified")
+   - priority: high/medium/low based on context
+5. **questions**: Array of unresolved questions or concerns raised
+6. **next_steps**: What should happen after this meeting
+7. **attendees**: List of people mentioned in the meeting (if identifiable)
+8. **topics_discussed**: Main topics/agenda items covered
+
+Return ONLY valid JSON, no additional text.
+""",
+    content="""
+TRANSCRIPT:
+{transcript}
+"""
+))
+
+register(PromptTemplate(
+    "chunk_extract", 2,
+    system="Extract key information from meeting segments. Return valid JSON.",
+    instructions="""
+Analyze the portion of a meeting transcript at the end of this message and extract key information.
+
+Extract:
+1. Key points discussed in this segment
+2. Any decisions made
+3. Any action items assigned
+4. Any questions raised
+
+Return as JSON with keys: key_points, decisions, action_items, questions
+""",
+    content="""
+{heading}
+{text}
+"""
+))
+
+register(PromptTemplate(
+    "notes_merge", 2,
+    system="Merge meeting notes without losing decisions or action items. Return valid JSON.",
+    instructions="""
+The notes at the end of this message were extracted, in order, from consecutive parts of one long meeting.
+Merge them into a single set of notes.
+
+Rules:
+1. key_points: Combine overlapping points; keep the {max_key_points} most important, in meeting order
+2. decisions: Keep every distinct decision (merge duplicates, keep who made it)
+3. action_items: Keep every distinct task (merge duplicates, keep owner, deadline and priority)
+4. questions: Keep every distinct unresolved question
+
+Return as JSON with keys: key_points, decisions, action_items, questions
+""",
+    content="""
+NOTES:
+{notes}
+"""
+))
+
+register(PromptTemplate(
+    "mom_final", 2,
+    system="Create comprehensive meeting minutes. Return valid JSON.",
+    instructions="""
+Based on the information extracted from a long meeting (at the end of this message), create a comprehensive MOM.
+
+Create a final MOM with:
+1. summary: 3-5 sentence overall summary
+2. key_points: Top 8-10 most important points
+3. decisions: All decisions (already deduplicated - keep each one)
+4. action_items: All action items (already deduplicated - keep each one)
+5. questions: All unresolved questions
+6. next_steps: Recommended next steps
+7. topics_discussed: Main topics covered
+
+Return valid JSON only.
+""",
+    content="""
+EXTRACTED INFORMATION:
+Key Points: {key_points}
+Decisions: {decisions}
+Action Items: {action_items}
+Questions: {questions}
+"""
+))
+
+register(PromptTemplate(
+    "mom_repair", 1,
+    system="",  # Sent as a follow-up in the conversation of the original prompt
+    instructions="""
+Some sections of your answer were missing or invalid. Using the same meeting content,
+return JSON containing ONLY the keys listed at the end of this message. Return valid JSON only.
+""",
+    content="""
+{sections}
+"""
+))
+
+register(PromptTemplate(
+    "overview_update", 2,
+    system="Update meeting minutes with new information. Return valid JSON.",
+    instructions="""
+You maintain the minutes of a meeting that is still going on. The current minutes and the new notes
+are at the end of this message.
+
+Update the minutes with the new notes:
+1. summary: 3-5 sentence overall summary covering the whole meeting so far
+2. key_points: The {max_key_points} most important points so far, in meeting order
+3. next_steps: Recommended next steps
+4. topics_discussed: Main topics covered so far
+
+Return as JSON with keys: summary, key_points, next_steps, topics_discussed
+""",
+    content="""
+CURRENT MINUTES:
+{current}
+
+NEW NOTES{time_range}:
+{notes}
+"""
+))
+
+# v1: cleanup of generated YouTube transcripts in the app
+register(PromptTemplate(
+    "caption_cleanup", 1,
+    system="You are a transcript editor. Fix transcription errors, add proper punctuation, and break into "
+           "paragraphs. Preserve all original meaning and content.",
+    instructions="Fix this auto-generated transcript:",
+    content="{transcript}"
+))
+
+# v2: stricter wording used when cleaning fetched captions
+register(PromptTemplate(
+    "caption_cleanup", 2,
+    system="You are a transcript editor. Fix transcription errors, add proper punctuation, and break into "
+           "paragraphs. Preserve all original meaning and content. Do not summarize or change words unless "
+           "they are clearly transcription errors.",
+    instructions="Fix this auto-generated transcript:",
+    content="{transcript}"
+))
@@ -0,0 +1,252 @@
+"""
+Compact columnar transcript storage
+Keeps segment times in typed arrays and all segment text in one string buffer,
+so multi-hour transcripts stay small in memory and time ranges slice in O(log n)
+"""
+
+import os
+import json
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+
+# Keys every transcript has; anything else is carried through as metadata
+CORE_KEYS = ['text', 'language', 'duration', 'segments']
+
+class SegmentStore(Mapping):
+    """
+    Read-only transcript backed by columns instead of a list of dicts
+
+    Behaves like the transcript dict for the keys 'text', 'language',
+    'duration' and 'segments' (plus any extra metadata), so code that calls
+    transcript.get('text') keeps working. 'segments' is rebuilt on demand;
+    prefer iter_segments(), slice() and text_between() for large transcripts.
+
+    Built from a dict with from_transcript(), or lazily from a JSON file with
+    load_transcript() - the file is only parsed on first access.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._loaded = path is None
+        self._load_lock = threading.Lock()
+
+        self.starts = array('d')
+        self.ends = array('d')
+        self.offsets = array('q', [0])  # Segment i is buffer[offsets[i]:offsets[i + 1]]
+        self.buffer = ''
+        self.language = 'en'
+        self.duration = 0
+        self.metadata = {}
+        self._text = None  # Only set when the full text isn't just the joined segments
+        self._extras = {}  # Segment index -> extra per-segment fields (e.g. words)
+        self._word_count = None
+
+    @classmethod
+    def from_transcript(cls, transcript):
+        """
+        Build a store from a transcript dict
+
+        Args:
+            transcript: Dict with text, language, duration and segments
+
+        Returns:
+            SegmentStore
+        """
+        store = cls()
+        store._fill(transcript)
+        return store
+
+    def _fill(self, transcript):
+        pieces = []
+        position = 0
+        for i, segment in enumerate(transcript.get('segments') or []):
+            text = segment.get('text', '')
+            self.starts.append(float(segment.get('start', 0)))
+            self.ends.append(float(segment.get('end', 0)))
+            position += len(text)
+            self.offsets.append(position)
+            pieces.append(text)
+
+            extra = {k: v for k, v in segment.items() if k not in ('start', 'end', 'text')}
+            if extra:
+                self._extras[i] = extra
+
+        self.buffer = ''.join(pieces)
+        text = transcript.get('text', '')
+        if text != self.buffer.strip():
+            self._text = text
+
+        self.language = transcript.get('language', 'en')
+        self.duration = transcript.get('duration', 0)
+        self.metadata = {k: v for k, v in transcript.items() if k not in CORE_KEYS}
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._fill(json.load(f))
+                self._loaded = True
+
+    # Mapping interface (transcript dict compatibility)
+
+    def __getitem__(self, key):
+        self._ensure_loaded()
+        if key == 'text':
+            return self.text
+        if key == 'language':
+            return self.language
+        if key == 'duration':
+            return self.duration
+        if key == 'segments':
+            return list(self.iter_segments())
+        return self.metadata[key]
+
+    def __iter__(self):
+        self._ensure_loaded()
+        return iter(CORE_KEYS + list(self.metadata))
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(CORE_KEYS) + len(self.metadata)
+
+    # Columnar access
+
+    @property
+    def text(self):
+        """Full transcript text"""
+        self._ensure_loaded()
+        return self._text if self._text is not None else self.buffer.strip()
+
+    @property
+    def segment_count(self):
+        self._ensure_loaded()
+        return len(self.starts)
+
+    @property
+    def word_count(self):
+        """Number of words in the transcript (counted once)"""
+        self._ensure_loaded()
+        if self._word_count is None:
+            self._word_count = len(self.text.split())
+        return self._word_count
+
+    def segment(self, i):
+        """Get segment i as a {"start", "end", "text"} dict"""
+        self._ensure_loaded()
+        segment = {
+            "start": self.starts[i],
+            "end": self.ends[i],
+            "text": self.buffer[self.offsets[i]:self.offsets[i + 1]]
+        }
+        if i in self._extras:
+            segment.update(self._extras[i])
+        return segment
+
+    def iter_segments(self, first=0, last=None):
+        """Yield segment dicts from index first up to (not including) last"""
+        self._ensure_loaded()
+        last = len(self.starts) if last is None else last
+        for i in range(first, last):
+            yield self.segment(i)
+
+    def index_range(self, start, end):
+        """
+        Find the segments overlapping a time range
+
+        Args:
+            start: Range start in seconds
+            end: Range end in seconds
+
+        Returns:
+            tuple: (first, last) segment indexes, last exclusive
+        """
+        self._ensure_loaded()
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end, lo=first)
+        return first, max(first, last)
+
+    def segment_at(self, t):
+        """Index of the segment playing at time t (or the one just before it), or None"""
+        self._ensure_loaded()
+        i = bisect_right(self.starts, t) - 1
+        return i if i >= 0 else None
+
+    def text_between(self, start, end):
+        """Text of the segments overlapping a time range"""
+        first, last = self.index_range(start, end)
+        return self.buffer[self.offsets[first]:self.offsets[last]].strip()
+
+    def slice(self, start, end):
+        """
+        New store with only the segments overlapping a time range
+
+        Args:
+            start: Range start in seconds
+            end: Range end in seconds
+
+        Returns:
+            SegmentStore: Segments keep their original timestamps
+        """
+        first, last = self.index_range(start, end)
+        base = self.offsets[first]
+
+        part = SegmentStore()
+        part.starts = self.starts[first:last]
+        part.ends = self.ends[first:last]
+        part.offsets = array('q', (offset - base for offset in self.offsets[first:last + 1]))
+        part.buffer = self.buffer[base:self.offsets[last]]
+        part.language = self.language
+        part.duration = self.duration
+        part.metadata = dict(self.metadata)
+        part._extras = {i - first: extra for i, extra in self._extras.items() if first <= i < last}
+        return part
+
+    def to_transcript(self):
+        """Export as the transcript dict shape used everywhere else"""
+        self._ensure_loaded()
+        transcript = {
+            "text": self.text,
+            "language": self.language,
+            "duration": self.duration,
+            "segments": list(self.iter_segments())
+        }
+        transcript.update(self.metadata)
+        return transcript
+
+def as_segment_store(transcript):
+    """Wrap a transcript dict in a SegmentStore (stores are returned unchanged)"""
+    if isinstance(transcript, SegmentStore):
+        return transcript
+    return SegmentStore.from_transcript(transcript)
+
+def load_transcript(transcript_file):
+    """
+    Open a transcript JSON file as a SegmentStore without parsing it yet
+
+    Args:
+        transcript_file: Path to transcript JSON file
+
+    Returns:
+        SegmentStore: Parsed on first access
+    """
+    return SegmentStore(path=transcript_file)
+
+def save_transcript(transcript, transcript_file):
+    """
+    Write a transcript (dict or SegmentStore) as compact JSON, atomically
+
+    Args:
+        transcript: Transcript dict or SegmentStore
+        transcript_file: Output path
+    """
+    if isinstance(transcript, SegmentStore):
+        transcript = transcript.to_transcript()
+
+    tmp_file = f"{transcript_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(transcript, f, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_file, transcript_file)
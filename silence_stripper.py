@@ -0,0 +1,234 @@
+"""
+Voice-activity pre-pass for transcription
+Strips long silences before upload and maps Whisper timestamps back to the original recording
+"""
+
+import os
+import wave
+import subprocess
+from bisect import bisect_right
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03  # 30ms analysis frames
+BLOCK_FRAMES = 2000  # Frames analysed per block (~1 minute), keeps memory flat
+
+VAD_MARGIN_DB = float(os.getenv("VAD_MARGIN_DB", "12"))  # Speech threshold above noise floor
+VAD_MIN_THRESHOLD_DB = -50
+VAD_MIN_SILENCE_SECONDS = float(os.getenv("VAD_MIN_SILENCE_SECONDS", "2.0"))  # Shorter pauses are kept
+VAD_PAD_SECONDS = 0.3  # Keep a little audio around each speech region
+VAD_MIN_SPEECH_SECONDS = 0.25
+VAD_SPACER_SECONDS = 0.5  # Silence inserted between kept regions so Whisper sees a pause
+VAD_MIN_SAVINGS = 0.1  # Don't bother if less than 10% would be removed
+
+def decode_to_pcm(audio_path, pcm_path):
+    """
+    Decode any audio/video file to raw 16kHz mono 16-bit PCM with ffmpeg
+
+    Args:
+        audio_path: Path to audio or video file
+        pcm_path: Output path for raw PCM
+
+    Returns:
+        numpy.memmap: Memory-mapped int16 samples, or None if decoding fails
+    """
+    try:
+        result = subprocess.run([
+            'ffmpeg',
+            '-v', 'error',
+            '-i', audio_path,
+            '-vn',
+            '-ac', '1',
+            '-ar', str(SAMPLE_RATE),
+            '-f', 's16le',
+            '-y',
+            pcm_path
+        ], capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+
+    if result.returncode != 0 or not os.path.getsize(pcm_path):
+        return None
+
+    return np.memmap(pcm_path, dtype=np.int16, mode='r')
+
+def frame_energy_db(samples):
+    """
+    Compute per-frame RMS level in dBFS, block by block so long files stay memory-mapped
+
+    Args:
+        samples: int16 sample array (may be a memmap)
+
+    Returns:
+        numpy.ndarray: Level in dB for each 30ms frame
+    """
+    frame_len = int(SAMPLE_RATE * FRAME_SECONDS)
+    n_frames = len(samples) // frame_len
+    levels = np.empty(n_frames, dtype=np.float32)
+
+    for first in range(0, n_frames, BLOCK_FRAMES):
+        last = min(first + BLOCK_FRAMES, n_frames)
+        block = np.asarray(samples[first * frame_len:last * frame_len], dtype=np.float32)
+        block = block.reshape(last - first, frame_len) / 32768.0
+        rms = np.sqrt(np.mean(block * block, axis=1))
+        levels[first:last] = 20 * np.log10(rms + 1e-9)
+
+    return levels
+
+def detect_speech_regions(levels):
+    """
+    Find speech regions from frame levels using an adaptive noise-floor threshold
+
+    Args:
+        levels: Per-frame dB levels from frame_energy_db()
+
+    Returns:
+        list: (start, end) tuples in seconds
+    """
+    if len(levels) == 0:
+        return []
+
+    noise_floor = float(np.percentile(levels, 10))
+    threshold = max(noise_floor + VAD_MARGIN_DB, VAD_MIN_THRESHOLD_DB)
+    voiced = levels > threshold
+
+    # Find runs of voiced frames
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    total = len(levels) * FRAME_SECONDS
+    regions = []
+    for s, e in zip((starts * FRAME_SECONDS).tolist(), (ends * FRAME_SECONDS).tolist()):
+        s = max(0.0, s - VAD_PAD_SECONDS)
+        e = min(total, e + VAD_PAD_SECONDS)
+        if regions and s - regions[-1][1] < VAD_MIN_SILENCE_SECONDS:
+            regions[-1] = (regions[-1][0], e)  # Short pause - keep it
+        else:
+            regions.append((s, e))
+
+    return [(s, e) for s, e in regions if e - s >= VAD_MIN_SPEECH_SECONDS]
+
+def build_remap_table(regions):
+    """
+    Build the table mapping stripped-audio time back to original time
+
+    Args:
+        regions: Kept (start, end) regions in original time
+
+    Returns:
+        list: (stripped_start, original_start, length) tuples in order
+    """
+    table = []
+    position = 0.0
+    for start, end in regions:
+        table.append((position, start, end - start))
+        position += (end - start) + VAD_SPACER_SECONDS
+    return table
+
+def map_to_original(t, table, is_end=False):
+    """
+    Convert a timestamp in the stripped audio to the original recording
+
+    Args:
+        t: Time in seconds in the stripped audio
+        table: Remap table from build_remap_table()
+        is_end: Treat a time exactly on a region start as the end of the previous region
+
+    Returns:
+        float: Time in seconds in the original recording
+    """
+    if not table:
+        return t
+
+    starts = [row[0] for row in table]
+    i = max(0, bisect_right(starts, t) - 1)
+    if is_end and i > 0 and t <= starts[i]:
+        i -= 1
+
+    stripped_start, original_start, length = table[i]
+    offset = min(max(0.0, t - stripped_start), length)  # Times inside a spacer clamp to the region edge
+    return original_start + offset
+
+def remap_transcript(transcript, table, original_duration):
+    """
+    Move segment timestamps from the stripped audio back onto the original recording
+
+    Args:
+        transcript: Transcript dict from Whisper on the stripped audio
+        table: Remap table from build_remap_table()
+        original_duration: Duration of the original recording in seconds
+
+    Returns:
+        dict: Transcript with segment times matching the original recording
+    """
+    speech_seconds = transcript.get('duration') or 0
+    remapped = dict(transcript)
+    remapped['segments'] = [
+        dict(segment,
+             start=map_to_original(segment['start'], table),
+             end=map_to_original(segment['end'], table, is_end=True))
+        for segment in transcript.get('segments', [])
+    ]
+    remapped['duration'] = original_duration
+    remapped['silence_stripped'] = {
+        'original_seconds': original_duration,
+        'uploaded_seconds': speech_seconds,
+        'regions': len(table),
+    }
+    return remapped
+
+def write_speech_wav(samples, regions, wav_path):
+    """
+    Write only the speech regions (with short spacers) to a WAV file
+
+    Args:
+        samples: int16 sample array (may be a memmap)
+        regions: (start, end) regions in seconds
+        wav_path: Output WAV path
+    """
+    spacer = np.zeros(int(SAMPLE_RATE * VAD_SPACER_SECONDS), dtype=np.int16).tobytes()
+
+    with wave.open(wav_path, 'wb') as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        for i, (start, end) in enumerate(regions):
+            if i:
+                out.writeframes(spacer)
+            out.writeframes(np.asarray(samples[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]).tobytes())
+
+def strip_silence(audio_path, work_dir):
+    """
+    Produce a speech-only WAV of a recording plus the table to map timestamps back
+
+    Args:
+        audio_path: Path to audio or video file
+        work_dir: Directory for the intermediate PCM and output WAV
+
+    Returns:
+        tuple: (speech_wav_path, remap_table, original_duration), or None if
+               decoding fails or too little silence would be removed
+    """
+    pcm_path = os.path.join(work_dir, 'decoded.pcm')
+    samples = decode_to_pcm(audio_path, pcm_path)
+    if samples is None:
+        return None
+
+    try:
+        original_duration = len(samples) / SAMPLE_RATE
+        regions = detect_speech_regions(frame_energy_db(samples))
+        speech_seconds = sum(e - s for s, e in regions)
+
+        if not regions or speech_seconds > original_duration * (1 - VAD_MIN_SAVINGS):
+            return None
+
+        print(f"🔇 Silence stripping: keeping {speech_seconds/60:.1f} of {original_duration/60:.1f} minutes "
+              f"({len(regions)} speech regions)")
+
+        wav_path = os.path.join(work_dir, 'speech.wav')
+        write_speech_wav(samples, regions, wav_path)
+        return wav_path, build_remap_table(regions), original_duration
+    finally:
+        del samples
+        os.remove(pcm_path)
@@ -0,0 +1,234 @@
+"""Batch MOM flow against a fake Batch API client"""
+
+import os
+import json
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest
+
+import batch_mom
+import process_long_meeting
+from process_long_meeting import MOM_SYSTEM_PROMPT, CHUNK_SYSTEM_PROMPT, MERGE_SYSTEM_PROMPT, FINAL_SYSTEM_PROMPT
+
+class FakeBatchClient:
+    """
+    Stand-in for files.create, batches.create/retrieve and files.content
+
+    Every batch finishes at once; output lines come back in reverse order so
+    results must be mapped by custom_id. Ids in fail_ids get an error line, or
+    no line at all when the batch ends with a status other than 'completed'.
+    """
+
+    def __init__(self, answer, fail_ids=(), status='completed'):
+        self.answer = answer
+        self.fail_ids = set(fail_ids)
+        self.status = status
+        self.uploads = {}
+        self.outputs = {}
+        self.submitted = []  # custom_ids of each batch, in submission order
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve)
+
+    def _create_file(self, file, purpose):
+        file_id = f"file-{len(self.uploads)}"
+        self.uploads[file_id] = file.read().decode('utf-8')
+        return SimpleNamespace(id=file_id)
+
+    def _create_batch(self, input_file_id, endpoint, completion_window, metadata=None):
+        requests = [json.loads(line) for line in self.uploads[input_file_id].splitlines()]
+        batch_id = f"batch-{len(self.submitted)}"
+        self.submitted.append([r['custom_id'] for r in requests])
+
+        lines = []
+        for request in reversed(requests):
+            if request['custom_id'] in self.fail_ids:
+                if self.status != 'completed':
+                    continue  # Never reached before the batch expired
+                lines.append({"custom_id": request['custom_id'], "response": {"status_code": 500, "body": {}}})
+                continue
+            content = json.dumps(self.answer(request['body']['messages']))
+            lines.append({"custom_id": request['custom_id'], "error": None, "response": {
+                "status_code": 200, "body": {"choices": [{"message": {"content": content}}]}}})
+        self.outputs[f"out-{batch_id}"] = "\n".join(json.dumps(line) for line in lines)
+        return SimpleNamespace(id=batch_id)
+
+    def _retrieve(self, batch_id):
+        ids = self.submitted[int(batch_id.split('-')[1])]
+        answered = sum(cid not in self.fail_ids for cid in ids)
+        return SimpleNamespace(id=batch_id, status=self.status, output_file_id=f"out-{batch_id}", errors=None,
+                               request_counts=SimpleNamespace(completed=answered, total=len(ids),
+                                                              failed=len(ids) - answered))
+
+    def _content(self, file_id):
+        return SimpleNamespace(text=self.outputs[file_id])
+
+def _mom(summary, decisions):
+    return {
+        "summary": summary,
+        "key_points": [summary],
+        "decisions": decisions,
+        "action_items": [{"task": "Share the minutes", "owner": "Team", "deadline": "Not specified",
+                          "priority": "low"}],
+        "questions": [],
+        "next_steps": ["Follow up next week"],
+        "attendees": [],
+        "topics_discussed": ["Planning"],
+    }
+
+def answer(messages):
+    """Deterministic model: echoes transcript text back so results show where they came from"""
+    system, prompt = messages[0]['content'], messages[1]['content']
+    if system == MOM_SYSTEM_PROMPT:
+        text = prompt.split("TRANSCRIPT:\n", 1)[1].strip()
+        return _mom(text, [{"decision": text}])
+    if system == CHUNK_SYSTEM_PROMPT:
+        text = prompt.split("TRANSCRIPT SEGMENT", 1)[1].split("\n", 1)[1].strip()
+        return {"key_points": [text], "decisions": [{"decision": text}], "action_items": [], "questions": []}
+    if system == MERGE_SYSTEM_PROMPT:
+        notes = json.loads(prompt.split("NOTES:\n", 1)[1])
+        return dict(notes, key_points=[])  # Merging shrinks the notes
+    if system == FINAL_SYSTEM_PROMPT:
+        line = next(l for l in prompt.splitlines() if l.startswith("Decisions: "))
+        return _mom("Long meeting", json.loads(line[len("Decisions: "):]))
+    raise AssertionError(f"unexpected prompt: {system}")
+
+LONG_DECISIONS = [
+    "Adopt Kafka for event streaming",
+    "Hire two backend engineers",
+    "Move the standup to Tuesday",
+    "Retire the legacy billing service",
+    "Publish the pricing page",
+    "Audit vendor security reviews",
+]
+
+@pytest.fixture
+def write_transcript(make_transcript):
+    """Write a transcript with one minute per text and return its path"""
+    def write(path, texts):
+        with open(path, 'w') as f:
+            json.dump(make_transcript(texts, seconds=60.0), f)
+        return str(path)
+    return write
+
+def _setup(monkeypatch, reduce_budget=100000):
+    def no_interactive_calls(*args, **kwargs):
+        raise AssertionError("batch mode made an interactive call")
+
+    monkeypatch.setattr(batch_mom, 'LLM_CACHE_ENABLED', False)
+    monkeypatch.setattr(batch_mom, 'call_json', no_interactive_calls)
+    monkeypatch.setattr(process_long_meeting, 'call_json', no_interactive_calls)
+    monkeypatch.setattr(batch_mom, 'fits_single_call', lambda tokens: tokens < 30)
+    monkeypatch.setattr(batch_mom, 'prepare_chunks', lambda store: [
+        {"text": s['text'].strip(), "start": s['start'], "end": s['end']} for s in store.iter_segments()
+    ])
+    monkeypatch.setattr(batch_mom, 'REDUCE_TOKEN_BUDGET', reduce_budget)
+
+class _BytesFile:
+    """Batch input file built in memory with write_batch_file's format"""
+
+    def __init__(self, requests):
+        self._data = "".join(batch_mom.batch_line(cid, messages) for cid, messages in requests.items()).encode('utf-8')
+
+    def read(self):
+        return self._data
+
+def test_read_batch_results_maps_by_custom_id_and_skips_errors():
+    client = FakeBatchClient(lambda messages: {"echo": messages[1]['content']}, fail_ids={"b"})
+    requests = {cid: [{"role": "system", "content": "s"}, {"role": "user", "content": cid}] for cid in "abc"}
+    client.files.create(file=_BytesFile(requests), purpose="batch")
+    batch = client.batches.create(input_file_id="file-0", endpoint=batch_mom.BATCH_ENDPOINT, completion_window="24h")
+    results = batch_mom.read_batch_results(client, client.batches.retrieve(batch.id))
+    assert set(results) == {"a", "c"}
+    assert json.loads(results["a"]) == {"echo": "a"}
+    assert json.loads(results["c"]) == {"echo": "c"}
+
+def test_batch_flow_maps_results_back_to_each_transcript(monkeypatch, tmp_path, write_transcript):
+    _setup(monkeypatch)
+    short = write_transcript(tmp_path / "short_transcript.json", ["Ship the alpha release"])
+    long = write_transcript(tmp_path / "long_transcript.json", LONG_DECISIONS)
+    client = FakeBatchClient(answer)
+    monkeypatch.setattr(batch_mom, 'get_batch_client', lambda base_url=None: client)
+
+    moms = batch_mom.generate_moms_batch([short, long], work_dir=str(tmp_path / "batches"), poll_seconds=0)
+
+    assert moms[short]['summary'] == "Ship the alpha release"
+    assert moms[short]['metadata']['processing_method'] == 'single'
+    assert [d['decision'] for d in moms[long]['decisions']] == LONG_DECISIONS
+    assert moms[long]['metadata']['chunks_processed'] == len(LONG_DECISIONS)
+    assert os.path.exists(tmp_path / "long_mom.json")
+
+    # Round 1 holds the single MOM and every chunk; the final call is its own batch
+    assert sorted(client.submitted[0]) == sorted(["t0-mom"] + [f"t1-chunk{i}" for i in range(1, 7)])
+    assert client.submitted[-1] == ["t1-final"]
+
+def test_hierarchical_reduce_is_batched(monkeypatch, tmp_path, write_transcript):
+    _setup(monkeypatch, reduce_budget=120)
+    long = write_transcript(tmp_path / "long_transcript.json", LONG_DECISIONS)
+    client = FakeBatchClient(answer)
+    monkeypatch.setattr(batch_mom, 'get_batch_client', lambda base_url=None: client)
+
+    moms = batch_mom.generate_moms_batch([long], work_dir=str(tmp_path / "batches"), poll_seconds=0)
+
+    mom = moms[long]
+    assert mom['metadata']['reduce_levels'] >= 1
+    assert mom['metadata']['processing_method'] == 'hierarchical'
+    assert [d['decision'] for d in mom['decisions']] == LONG_DECISIONS
+    merge_batches = [ids for ids in client.submitted if all('-merge' in cid for cid in ids)]
+    assert len(merge_batches) == mom['metadata']['reduce_levels']
+    assert len(mom['metadata']['batch_ids']) == len(client.submitted)
+
+def test_requests_are_split_within_batch_limits():
+    requests = {f"r{i}": [{"role": "user", "content": "x" * 100}] for i in range(7)}
+    parts = batch_mom.split_batches(requests, max_requests=3)
+    assert [len(part) for part in parts] == [3, 3, 1]
+
+    line_size = len(batch_mom.batch_line("r0", requests["r0"]).encode('utf-8'))
+    parts = batch_mom.split_batches(requests, max_bytes=line_size * 2)
+    assert [len(part) for part in parts] == [2, 2, 2, 1]
+
+def test_round_too_big_for_one_batch_is_split(monkeypatch, tmp_path, write_transcript):
+    _setup(monkeypatch)
+    monkeypatch.setattr(batch_mom, 'BATCH_MAX_REQUESTS', 4)
+    long = write_transcript(tmp_path / "long_transcript.json", LONG_DECISIONS)
+    client = FakeBatchClient(answer)
+    monkeypatch.setattr(batch_mom, 'get_batch_client', lambda base_url=None: client)
+
+    moms = batch_mom.generate_moms_batch([long], work_dir=str(tmp_path / "batches"), poll_seconds=0)
+
+    assert [len(ids) for ids in client.submitted[:2]] == [4, 2]
+    assert [d['decision'] for d in moms[long]['decisions']] == LONG_DECISIONS
+    assert len(moms[long]['metadata']['batch_ids']) == len(client.submitted)
+
+def test_expired_batch_is_reported_not_rerun(monkeypatch, tmp_path, write_transcript, capsys):
+    _setup(monkeypatch)
+    short = write_transcript(tmp_path / "short_transcript.json", ["Ship the alpha release"])
+    long = write_transcript(tmp_path / "long_transcript.json", LONG_DECISIONS)
+    client = FakeBatchClient(answer, fail_ids={"t0-mom", "t1-chunk2"}, status='expired')
+    monkeypatch.setattr(batch_mom, 'get_batch_client', lambda base_url=None: client)
+
+    # _setup makes any interactive call fail the test
+    moms = batch_mom.generate_moms_batch([short, long], work_dir=str(tmp_path / "batches"), poll_seconds=0)
+
+    out = capsys.readouterr().out
+    assert "batch-0 expired: 5/7 requests answered" in out
+    assert moms[short] is None
+    assert moms[long]['metadata']['chunks_failed'] == [2]
+
+def test_retry_failed_sends_missing_requests_as_regular_calls(monkeypatch, tmp_path, write_transcript):
+    _setup(monkeypatch)
+    long = write_transcript(tmp_path / "long_transcript.json", LONG_DECISIONS)
+    client = FakeBatchClient(answer, fail_ids={"t0-chunk2"}, status='expired')
+    monkeypatch.setattr(batch_mom, 'get_batch_client', lambda base_url=None: client)
+    retried = []
+    def call_json(system_prompt, prompt, label, **kwargs):
+        retried.append(label)
+        return answer([{"content": system_prompt}, {"content": prompt}])
+    monkeypatch.setattr(batch_mom, 'call_json', call_json)
+
+    moms = batch_mom.generate_moms_batch([long], work_dir=str(tmp_path / "batches"), poll_seconds=0,
+                                         retry_failed=True)
+
+    assert retried == [f"{long} chunk 2"]
+    assert [d['decision'] for d in moms[long]['decisions']] == LONG_DECISIONS
@@ -0,0 +1,73 @@
+"""Local deduplication of near-identical MOM items"""
+
+from dedupe_items import dedupe_items, dedupe_partials, words_compatible
+
+def test_opposite_decisions_are_kept_apart():
+    items = [
+        {"decision": "Approve the vendor contract for hosting"},
+        {"decision": "Reject the vendor contract for hosting"},
+    ]
+    assert len(dedupe_items(items, 'decision')) == 2
+
+def test_negated_decision_is_kept_apart():
+    items = [
+        {"decision": "Approve the vendor contract"},
+        {"decision": "Do not approve the vendor contract"},
+    ]
+    assert len(dedupe_items(items, 'decision')) == 2
+
+def test_different_recipient_with_same_owner_is_kept_apart():
+    items = [
+        {"task": "Send the quarterly report to finance", "owner": "Ana"},
+        {"task": "Send the quarterly report to legal", "owner": "Ana"},
+    ]
+    assert len(dedupe_items(items, 'task')) == 2
+
+def test_different_object_is_kept_apart():
+    items = [{"decision": "Migrate to Postgres"}, {"decision": "Migrate to MySQL"}]
+    assert len(dedupe_items(items, 'decision')) == 2
+
+def test_antonym_on_string_items_is_kept_apart():
+    assert len(dedupe_items(["Increase the ad budget", "Decrease the ad budget"], 'point')) == 2
+
+def test_different_numbers_are_kept_apart():
+    items = [{"decision": "Raise the budget by 10%"}, {"decision": "Raise the budget by 20%"}]
+    assert len(dedupe_items(items, 'decision')) == 2
+
+def test_true_duplicates_merge_and_keep_details():
+    items = [
+        {"task": "Send the quarterly report to finance", "owner": "Ana", "priority": "low"},
+        {"task": "Send the quarterly report to finance.", "owner": "Unassigned",
+         "deadline": "Friday", "priority": "high"},
+    ]
+    merged = dedupe_items(items, 'task')
+    assert len(merged) == 1
+    assert merged[0]["owner"] == "Ana"
+    assert merged[0]["deadline"] == "Friday"
+    assert merged[0]["priority"] == "high"
+
+def test_inflection_only_difference_merges():
+    items = [{"decision": "Approve the vendor contract"}, {"decision": "Approved the vendor contract"}]
+    assert len(dedupe_items(items, 'decision')) == 1
+
+def test_conflicting_owners_are_kept_apart():
+    items = [
+        {"task": "Send the quarterly report to finance", "owner": "Ana"},
+        {"task": "Send the quarterly report to finance", "owner": "Ben"},
+    ]
+    assert len(dedupe_items(items, 'task')) == 2
+
+def test_words_compatible_allows_one_sided_detail():
+    assert words_compatible("Update the onboarding docs", "Update the onboarding docs by Friday")
+    assert not words_compatible("Send the report to finance", "Send the report to legal")
+
+def test_dedupe_partials_keeps_item_in_first_chunk():
+    partials = [
+        {"decisions": [{"decision": "Launch the campaign in March"}]},
+        {"decisions": [{"decision": "Launch the campaign in March."},
+                       {"decision": "Cancel the campaign in March"}]},
+    ]
+    deduped, removed = dedupe_partials(partials, keys=('decisions',))
+    assert removed == 1
+    assert [d["decision"].rstrip('.') for d in deduped[0]["decisions"]] == ["Launch the campaign in March"]
+    assert [d["decision"] for d in deduped[1]["decisions"]] == ["Cancel the campaign in March"]
@@ -0,0 +1,21 @@
+"""MOM emails render list and legacy string next steps"""
+
+import json
+
+from email_service import create_mom_html
+
+def _sample():
+    with open('test_meeting_mom.json') as f:
+        return json.load(f)
+
+def test_legacy_string_next_steps_rendered_as_text():
+    mom = _sample()
+    html = create_mom_html(mom)
+    assert mom['next_steps'] in html
+
+def test_list_next_steps_rendered_as_items():
+    mom = dict(_sample(), next_steps=["Review the brief", "Book the venue"])
+    html = create_mom_html(mom)
+    assert "<li>Review the brief</li>" in html
+    assert "<li>Book the venue</li>" in html
+    assert "['" not in html
@@ -0,0 +1,87 @@
+"""Extractive pre-summarization and how it feeds MOM routing"""
+
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import process_long_meeting
+from extractive_summary import extract_salient, tfidf_matrix, textrank_scores, CUE_PATTERN
+
+FILLER = [f"Someone mentioned the weather and lunch plans again, item {i}." for i in range(30)]
+CUES = {
+    5: "We decided to launch the campaign on March third.",
+    17: "Mike will send the budget to finance by Friday.",
+    26: "Action item: Ana owns the vendor contract review.",
+}
+TEXTS = [CUES.get(i, text) for i, text in enumerate(FILLER)]
+
+def test_decision_and_commitment_segments_are_always_kept(make_transcript):
+    reduced, report = extract_salient(make_transcript(TEXTS), keep_ratio=0.3)
+    kept = [segment['text'].strip() for segment in reduced['segments']]
+    for text in CUES.values():
+        assert text in kept
+    assert report['cue_units'] == len(CUES)
+    assert report['tokens_after'] <= report['tokens_before'] * 0.3
+
+def test_kept_segments_stay_in_order_with_original_times(make_transcript):
+    transcript = make_transcript(TEXTS)
+    reduced, _ = extract_salient(transcript, keep_ratio=0.5)
+    starts = [segment['start'] for segment in reduced['segments']]
+    assert starts == sorted(starts)
+    original = {segment['text']: segment['start'] for segment in transcript['segments']}
+    assert all(original[segment['text']] == segment['start'] for segment in reduced['segments'])
+
+def test_transcript_within_budget_is_unchanged(make_transcript):
+    transcript = make_transcript(TEXTS)
+    reduced, report = extract_salient(transcript, keep_ratio=1.0)
+    assert reduced['text'] == transcript['text']
+    assert report['units_kept'] == report['units_before']
+
+def test_ordinary_talk_is_not_a_cue():
+    for text in ["Let's get started.", "I'll share my screen.", "We should grab lunch.",
+                 "I'm going to check the weather.", "It was due to traffic.", "We need to talk about it."]:
+        assert not CUE_PATTERN.search(text), text
+    for text in ["We agreed to move the launch.", "The budget was approved.", "Next steps: hire two engineers.",
+                 "Ana is responsible for the contract.", "Send it by end of the week."]:
+        assert CUE_PATTERN.search(text), text
+
+def test_central_segments_score_higher():
+    texts = ["kafka migration plan", "kafka migration timeline", "kafka rollout plan", "lunch menu"]
+    scores = textrank_scores(tfidf_matrix(texts), len(texts))
+    assert scores.argmin() == 3
+    assert abs(scores.sum() - 1.0) < 1e-9
+
+def test_long_meeting_is_scored_without_a_dense_matrix():
+    # 20k segments: a dense n x n similarity matrix would need ~3 GB
+    texts = [f"topic {i % 50} update from team {i % 7} about item {i}" for i in range(20000)]
+    rows, cols, weights = tfidf_matrix(texts)
+    assert len(weights) < 20000 * 10
+    assert len(textrank_scores((rows, cols, weights), len(texts))) == len(texts)
+
+def test_extractive_pass_runs_before_routing(monkeypatch, make_transcript):
+    monkeypatch.setattr(process_long_meeting, 'EXTRACTIVE_ENABLED', True)
+    store = process_long_meeting.as_segment_store(make_transcript(TEXTS))
+    tokens = sum(process_long_meeting.count_tokens(text) for text in TEXTS)
+    monkeypatch.setattr(process_long_meeting, 'fits_single_call', lambda count: count <= tokens * 0.6)
+
+    single_calls = []
+    def generate_mom_normal(transcript_text, transcript_data, force=False, on_section=None):
+        single_calls.append(transcript_data.segment_count)
+        return {"summary": "s", "metadata": {}}
+    monkeypatch.setattr(process_long_meeting, 'generate_mom_normal', generate_mom_normal)
+    monkeypatch.setattr(process_long_meeting, 'compress_transcript',
+                        lambda data: (data.to_transcript(), {'tokens_after': tokens}))
+    monkeypatch.setattr(process_long_meeting, 'print_compression_report', lambda report: None)
+    monkeypatch.setattr(process_long_meeting, 'ground_mom', lambda *args: None)
+
+    mom = process_long_meeting.generate_mom_from_transcript(store)
+
+    # The reduced transcript fits, so it goes to one call instead of map-reduce
+    extractive = mom['metadata']['extractive']
+    assert single_calls == [extractive['units_kept']]
+    assert extractive['units_kept'] < extractive['units_before'] == len(TEXTS)
+
+def test_transcript_that_fits_is_never_reduced(monkeypatch, make_transcript):
+    monkeypatch.setattr(process_long_meeting, 'EXTRACTIVE_ENABLED', True)
+    store = process_long_meeting.as_segment_store(make_transcript(TEXTS))
+    assert process_long_meeting.extractive_pass(store, 100) == (store, 100, None)
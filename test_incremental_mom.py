@@ -0,0 +1,79 @@
+"""Incremental MOM updates for growing transcripts"""
+
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest
+
+import incremental_mom
+from incremental_mom import update_mom
+
+FIRST = ["We decided to adopt Kafka for events.", "Ana will write the migration plan."]
+LATER = ["We decided to hire two backend engineers.", "Ben will post the job ads by Friday."]
+
+class FakeModel:
+    """Records what each stage was asked to analyze"""
+
+    def __init__(self, fail_chunks=False):
+        self.fail_chunks = fail_chunks
+        self.full_runs = 0
+        self.chunk_texts = []
+        self.overview_calls = 0
+
+    def generate(self, store, force=False):
+        self.full_runs += 1
+        decisions = [{"decision": s['text'].strip()} for s in store.iter_segments() if "decided" in s['text']]
+        return {"summary": "Initial", "key_points": [], "decisions": decisions, "action_items": [],
+                "questions": [], "next_steps": [], "attendees": [], "topics_discussed": [], "metadata": {}}
+
+    def extract_chunk(self, i, chunk, total, bypass=False):
+        if self.fail_chunks:
+            return None
+        self.chunk_texts.append(chunk['text'])
+        return {"key_points": [], "decisions": [{"decision": chunk['text']}], "action_items": [], "questions": []}
+
+    def call_json(self, system_prompt, prompt, label, **kwargs):
+        self.overview_calls += 1
+        return {"summary": "Updated", "key_points": ["Hiring"], "next_steps": [], "topics_discussed": ["Hiring"]}
+
+@pytest.fixture
+def model(monkeypatch):
+    fake = FakeModel()
+    monkeypatch.setattr(incremental_mom, 'generate_mom_from_transcript', fake.generate)
+    monkeypatch.setattr(incremental_mom, 'extract_chunk', fake.extract_chunk)
+    monkeypatch.setattr(incremental_mom, 'call_json', fake.call_json)
+    return fake
+
+def test_first_call_generates_full_mom_with_state(model, make_transcript):
+    mom = update_mom(make_transcript(FIRST))
+    assert model.full_runs == 1
+    assert mom['metadata']['incremental'] == {'unit_kind': 'segments', 'units_analyzed': 2,
+                                              'analyzed_until': 20.0, 'updates': 0}
+
+def test_small_growth_leaves_mom_unchanged(model, make_transcript):
+    mom = update_mom(make_transcript(FIRST))
+    assert update_mom(make_transcript(FIRST + LATER), mom, min_new_tokens=10000) is mom
+    assert model.chunk_texts == []
+
+def test_only_new_segments_are_analyzed(model, make_transcript):
+    mom = update_mom(make_transcript(FIRST))
+    updated = update_mom(make_transcript(FIRST + LATER), mom, min_new_tokens=0)
+
+    assert model.full_runs == 1
+    assert all(text not in chunk for chunk in model.chunk_texts for text in FIRST)
+    assert [d['decision'] for d in updated['decisions']][0] == FIRST[0]
+    assert updated['summary'] == "Updated"
+    assert updated['metadata']['incremental']['units_analyzed'] == 4
+    assert updated['metadata']['incremental']['updates'] == 1
+
+def test_failed_chunk_keeps_old_state_for_retry(model, make_transcript):
+    mom = update_mom(make_transcript(FIRST))
+    model.fail_chunks = True
+    assert update_mom(make_transcript(FIRST + LATER), mom, min_new_tokens=0) is mom
+    assert model.overview_calls == 0
+
+def test_shrunk_transcript_triggers_full_generation(model, make_transcript):
+    mom = update_mom(make_transcript(FIRST + LATER))
+    update_mom(make_transcript(FIRST), mom, min_new_tokens=0)
+    assert model.full_runs == 2
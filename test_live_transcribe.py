@@ -0,0 +1,33 @@
+"""Choosing which live-window segments are final"""
+
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from live_transcribe import select_final_segments
+
+def _segments(*spans):
+    return [{"start": start, "end": end, "text": f" {start:g}-{end:g}"} for start, end in spans]
+
+def test_segments_ending_before_the_cutoff_are_final():
+    segments = _segments((30, 36), (36, 44), (44, 52), (52, 60))
+    assert select_final_segments(segments, 30, 50) == segments[:2]
+
+def test_overlap_already_committed_is_skipped():
+    # The window re-sends audio from 25s; the segment centred before 30s was emitted last time
+    segments = _segments((25, 31), (31, 38), (38, 45))
+    assert select_final_segments(segments, 30, 50) == segments[1:]
+
+def test_segment_straddling_the_commit_point_goes_by_its_midpoint():
+    segments = _segments((28, 36))
+    assert select_final_segments(segments, 30, 50) == segments  # Midpoint 32 is new
+    assert select_final_segments(_segments((22, 34)), 30, 50) == []  # Midpoint 28 was emitted
+
+def test_nothing_after_the_first_unfinished_segment():
+    # A short segment after a long tail segment still waits for the next window
+    segments = _segments((30, 58), (58, 59))
+    assert select_final_segments(segments, 30, 50) == []
+
+def test_end_of_stream_flushes_everything_new():
+    segments = _segments((30, 40), (40, 61.5))
+    assert select_final_segments(segments, 30, float('inf')) == segments
@@ -0,0 +1,73 @@
+"""LLM response cache expiry, eviction and counters"""
+
+import pytest
+
+import llm_cache
+from llm_cache import LLMCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(llm_cache.time, 'time', fake)
+    return fake
+
+def _cache(tmp_path, **options):
+    return LLMCache(path=str(tmp_path / "llm_cache.sqlite3"), **options)
+
+def test_key_depends_on_every_request_field(tmp_path):
+    cache = _cache(tmp_path)
+    messages = [{"role": "user", "content": "hi"}]
+    key = cache.make_key("gpt-4o", messages, 0.3, {"type": "json_object"})
+    assert key == cache.make_key("gpt-4o", list(messages), 0.3, {"type": "json_object"})
+    assert key != cache.make_key("gpt-4o-mini", messages, 0.3, {"type": "json_object"})
+    assert key != cache.make_key("gpt-4o", messages, 0.7, {"type": "json_object"})
+    assert key != cache.make_key("gpt-4o", messages, 0.3)
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = _cache(tmp_path, ttl_hours=1)
+    cache.put("k", "gpt-4o", "answer")
+    clock.now += 3599
+    assert cache.get("k") == "answer"
+    clock.now += 2
+    assert cache.get("k") is None
+    assert cache.stats()['entries'] == 0  # Expired row is removed on lookup
+
+def test_least_recently_used_entry_is_evicted(tmp_path, clock):
+    cache = _cache(tmp_path, max_mb=250 / (1024 * 1024))
+    cache.put("a", "gpt-4o", "a" * 100)
+    clock.now += 1
+    cache.put("b", "gpt-4o", "b" * 100)
+    clock.now += 1
+    assert cache.get("a")  # "a" is now more recent than "b"
+    clock.now += 1
+    cache.put("c", "gpt-4o", "c" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.stats()['evictions'] == 1
+
+def test_put_drops_expired_entries(tmp_path, clock):
+    cache = _cache(tmp_path, ttl_hours=1)
+    cache.put("old", "gpt-4o", "stale")
+    clock.now += 7200
+    cache.put("new", "gpt-4o", "fresh")
+    stats = cache.stats()
+    assert (stats['entries'], stats['evictions']) == (1, 1)
+
+def test_stats_count_hits_misses_and_usage(tmp_path, clock):
+    cache = _cache(tmp_path)
+    cache.put("k", "gpt-4o", "answer")
+    cache.get("k")
+    cache.get("missing")
+    cache.record_usage(prompt_tokens=1000, cached_tokens=250, completion_tokens=50)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+    assert stats['api_calls'] == 1
+    assert stats['prompt_cache_rate'] == 0.25
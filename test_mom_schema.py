@@ -0,0 +1,62 @@
+"""MOM schema validation, normalization and section repair"""
+
+import json
+
+from mom_schema import (normalize_mom, validate_mom, salvage_sections, repair_prompt,
+                        SINGLE_CALL_SECTIONS, FINAL_SECTIONS)
+
+def _valid_mom():
+    return {
+        "summary": "The team planned the Q1 campaign.",
+        "key_points": ["Budget approved"],
+        "decisions": [{"decision": "Launch in March", "made_by": "Sarah", "timestamp": "05:00"}],
+        "action_items": [{"task": "Draft the brief", "owner": "Mike", "deadline": "Friday", "priority": "high"}],
+        "questions": [],
+        "next_steps": ["Review the brief on Monday"],
+        "attendees": ["Sarah", "Mike"],
+        "topics_discussed": ["Campaign"],
+    }
+
+def test_valid_mom_has_no_problems():
+    assert validate_mom(normalize_mom(_valid_mom())) == {}
+
+def test_legacy_string_next_steps_is_accepted():
+    # Baseline MOMs (and the sample files) store next_steps as one string
+    with open('sample_9min_mom.json') as f:
+        sample = json.load(f)
+    assert isinstance(sample['next_steps'], str)
+
+    normalized = normalize_mom(sample)
+    assert normalized['next_steps'] == [sample['next_steps'].strip()]
+    assert 'next_steps' not in validate_mom(normalized, FINAL_SECTIONS)
+
+def test_plain_string_items_become_dicts():
+    mom = dict(_valid_mom(), decisions=["Launch in March"], action_items=["Draft the brief"])
+    normalized = normalize_mom(mom)
+    assert normalized['decisions'] == [{"decision": "Launch in March"}]
+    assert normalized['action_items'] == [{"task": "Draft the brief"}]
+    assert validate_mom(normalized) == {}
+
+def test_each_broken_section_is_reported():
+    mom = dict(_valid_mom(), summary="  ", key_points="", action_items=[{"owner": "Mike"}])
+    del mom['questions']
+    problems = validate_mom(normalize_mom(mom), SINGLE_CALL_SECTIONS)
+    assert set(problems) == {'summary', 'key_points', 'action_items', 'questions'}
+    assert problems['questions'] == "missing"
+    assert problems['summary'] == "empty"
+
+def test_salvage_keeps_complete_sections_of_truncated_json():
+    content = json.dumps(_valid_mom())[:-40]
+    salvaged = salvage_sections(content)
+    assert salvaged['summary'] == _valid_mom()['summary']
+    assert salvaged['decisions'] == _valid_mom()['decisions']
+    assert 'topics_discussed' not in salvaged
+
+def test_salvage_of_garbage_is_empty():
+    assert salvage_sections("") == {}
+    assert salvage_sections("[1, 2, 3]") == {}
+
+def test_repair_prompt_lists_only_broken_sections():
+    prompt = repair_prompt({'decisions': 'missing'})
+    assert '- decisions:' in prompt
+    assert 'action_items' not in prompt
@@ -0,0 +1,83 @@
+"""Streamed MOM parsing, including retries of a stream that broke off"""
+
+import os
+import json
+
+import httpx
+import openai
+
+from mom_stream import JsonSectionParser, stream_sections
+from mom_schema import SINGLE_CALL_SECTIONS
+
+MOM = {
+    "summary": "Quote \" and brace } inside a string, plus a comma, here.",
+    "key_points": ["One", "Two [nested]"],
+    "decisions": [{"decision": "Ship", "made_by": "Team", "timestamp": "01:00"}],
+    "score": 3,
+    "final": True,
+}
+
+def _pieces(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def test_sections_emitted_in_order_for_any_split():
+    text = json.dumps(MOM)
+    for size in (1, 2, 7, 50, len(text)):
+        found = list(stream_sections(_pieces(text, size)))
+        assert found == list(MOM.items())
+
+def test_section_emitted_as_soon_as_it_closes():
+    parser = JsonSectionParser()
+    assert parser.feed('{"summary": "Done", "key_points": ["a",') == [("summary", "Done")]
+    assert parser.feed(' "b"], "decisions": [') == [("key_points", ["a", "b"])]
+
+def test_truncated_stream_keeps_complete_sections():
+    text = json.dumps(MOM)
+    parser = JsonSectionParser()
+    parser.feed(text[:text.index('"decisions"') + 20])
+    assert set(parser.sections) == {"summary", "key_points"}
+
+def _answer(summary, decision):
+    return {
+        "summary": summary,
+        "key_points": ["Budget approved"],
+        "decisions": [{"decision": decision, "made_by": "Team", "timestamp": "05:00"}],
+        "action_items": [{"task": "Draft the brief", "owner": "Mike", "deadline": "Friday", "priority": "high"}],
+        "questions": [],
+        "next_steps": ["Review the brief"],
+        "attendees": ["Mike"],
+        "topics_discussed": ["Campaign"],
+    }
+
+def test_retry_after_failed_stream_starts_a_fresh_parse(monkeypatch):
+    os.environ.setdefault("OPENAI_API_KEY", "test")
+    import process_long_meeting
+
+    first = json.dumps(_answer("Old summary", "Launch in April"))
+    second = json.dumps(_answer("New summary", "Launch in March"))
+    attempts = []
+
+    def cached_chat_completion(client, model, messages, on_delta=None, **kwargs):
+        attempts.append(model)
+        if len(attempts) == 1:
+            # Connection drops after the decisions section was already shown
+            on_delta(first[:first.index('"action_items"') + 20])
+            raise openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com"))
+        for piece in _pieces(second, 9):
+            on_delta(piece)
+        return second
+
+    monkeypatch.setattr(process_long_meeting, 'cached_chat_completion', cached_chat_completion)
+    monkeypatch.setattr(process_long_meeting.time, 'sleep', lambda seconds: None)
+
+    shown = []
+    mom, cascade = process_long_meeting.generate_validated_mom(
+        "system", "prompt", "MOM", SINGLE_CALL_SECTIONS, on_section=lambda key, value: shown.append((key, value)))
+
+    assert len(attempts) == 2
+    assert mom['summary'] == "New summary"
+    assert mom['decisions'][0]['decision'] == "Launch in March"
+    # Whatever was shown last for each section is the retry's answer
+    assert dict(shown) == {key: mom[key] for key in SINGLE_CALL_SECTIONS}
+    # Sections the retry didn't change are not sent twice
+    assert [key for key, _ in shown].count('key_points') == 1
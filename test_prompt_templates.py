@@ -0,0 +1,29 @@
+"""Versioned prompt registry"""
+
+import pytest
+
+from prompt_templates import PromptTemplate, PROMPTS, register, get_prompt
+
+def test_older_versions_stay_available():
+    assert get_prompt('caption_cleanup').id == "caption_cleanup@v2"
+    assert get_prompt('caption_cleanup', 1).id == "caption_cleanup@v1"
+    assert get_prompt('caption_cleanup', 2) is get_prompt('caption_cleanup')
+
+def test_caption_cleanup_v1_keeps_the_original_app_wording():
+    system, user = get_prompt('caption_cleanup', 1).messages(transcript="hello world")
+    assert system['content'] == ("You are a transcript editor. Fix transcription errors, add proper punctuation, "
+                                 "and break into paragraphs. Preserve all original meaning and content.")
+    assert user['content'] == "Fix this auto-generated transcript:\n\nhello world\n"
+
+def test_registering_a_version_does_not_replace_others(monkeypatch):
+    monkeypatch.setitem(PROMPTS, 'demo', {})
+    register(PromptTemplate('demo', 2, "s2", "i2", "{x}"))
+    register(PromptTemplate('demo', 1, "s1", "i1", "{x}"))
+    assert get_prompt('demo').system == "s2"
+    assert get_prompt('demo', 1).system == "s1"
+    with pytest.raises(KeyError):
+        get_prompt('demo', 3)
+
+def test_content_comes_after_instructions():
+    rendered = get_prompt('mom_single').render(transcript="TEXT")
+    assert rendered.endswith("TRANSCRIPT:\nTEXT\n")
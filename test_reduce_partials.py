@@ -0,0 +1,62 @@
+"""Hierarchical reduce of chunk notes"""
+
+import os
+import json
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import process_long_meeting
+from process_long_meeting import reduce_partials, group_partials, partial_tokens, REDUCE_MAX_LEVELS
+
+def _partial(i):
+    return {"key_points": [f"Point {i} about the roadmap and the budget in some detail"],
+            "decisions": [{"decision": f"Decision {i}"}], "action_items": [], "questions": []}
+
+PARTIALS = [_partial(i) for i in range(8)]
+
+def _notes(prompt):
+    return json.loads(prompt.split("NOTES:\n", 1)[1])
+
+def _fake_model(monkeypatch, merge):
+    calls = []
+    def call_json(system_prompt, prompt, label, **kwargs):
+        calls.append(label)
+        return merge(_notes(prompt))
+    monkeypatch.setattr(process_long_meeting, 'call_json', call_json)
+    return calls
+
+def test_notes_within_budget_are_not_merged(monkeypatch):
+    calls = _fake_model(monkeypatch, lambda notes: notes)
+    partials, levels = reduce_partials(PARTIALS, max_tokens=100000)
+    assert (partials, levels, calls) == (PARTIALS, 0, [])
+
+def test_groups_are_consecutive_and_within_budget():
+    budget = partial_tokens(PARTIALS[0]) * 3
+    groups = group_partials(PARTIALS, budget)
+    assert [p for group in groups for p in group] == PARTIALS
+    assert all(sum(partial_tokens(p) for p in group) <= budget for group in groups)
+    assert group_partials([_partial(0)], max_tokens=1) == [[_partial(0)]]  # Oversized partial stands alone
+
+def test_levels_repeat_until_the_notes_fit(monkeypatch):
+    # Each merge drops the key points, roughly halving the notes
+    calls = _fake_model(monkeypatch, lambda notes: dict(notes, key_points=[]))
+    budget = partial_tokens(PARTIALS[0]) * 3
+    partials, levels = reduce_partials(PARTIALS, max_tokens=budget)
+    assert levels >= 1
+    assert sum(partial_tokens(p) for p in partials) <= budget
+    decisions = [d["decision"] for p in partials for d in p["decisions"]]
+    assert decisions == [f"Decision {i}" for i in range(8)]  # Meeting order survives
+    assert len(calls) == len(group_partials(PARTIALS, budget)) + (levels - 1) * len(partials)
+
+def test_reduce_stops_when_merging_does_not_shrink(monkeypatch):
+    _fake_model(monkeypatch, lambda notes: notes)
+    budget = partial_tokens(PARTIALS[0]) * 3
+    partials, levels = reduce_partials(PARTIALS, max_tokens=budget)
+    assert levels < REDUCE_MAX_LEVELS
+    assert sum(partial_tokens(p) for p in partials) > budget  # Gave up instead of looping
+
+def test_failed_merge_keeps_the_notes(monkeypatch):
+    _fake_model(monkeypatch, lambda notes: None)
+    budget = partial_tokens(PARTIALS[0]) * 3
+    partials, _ = reduce_partials(PARTIALS, max_tokens=budget)
+    assert [d for p in partials for d in p["decisions"]] == [d for p in PARTIALS for d in p["decisions"]]
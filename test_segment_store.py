@@ -0,0 +1,56 @@
+"""Columnar transcript storage"""
+
+import json
+
+from segment_store import SegmentStore, as_segment_store, load_transcript, save_transcript
+
+TEXTS = ["Welcome everyone.", "First the budget.", "Then the hiring plan.", "Any questions?"]
+
+def test_round_trip_keeps_segments_and_metadata(make_transcript):
+    transcript = make_transcript(TEXTS, source="youtube_captions")
+    transcript["segments"][1]["words"] = [{"word": "First", "start": 10.0, "end": 10.4}]
+
+    store = SegmentStore.from_transcript(transcript)
+
+    assert store.to_transcript() == transcript
+    assert store["source"] == "youtube_captions"
+    assert store.segment(1)["words"][0]["word"] == "First"
+    assert dict(store) == transcript
+
+def test_index_range_finds_overlapping_segments(make_transcript):
+    store = SegmentStore.from_transcript(make_transcript(TEXTS))
+    assert store.index_range(12.0, 25.0) == (1, 3)
+    assert store.index_range(10.0, 20.0) == (1, 2)  # Touching edges don't count
+    assert store.index_range(100.0, 200.0) == (4, 4)
+    assert store.text_between(12.0, 25.0) == "First the budget. Then the hiring plan."
+
+def test_slice_keeps_original_times(make_transcript):
+    transcript = make_transcript(TEXTS, source="upload")
+    transcript["segments"][2]["speaker"] = "B"
+    part = SegmentStore.from_transcript(transcript).slice(15.0, 35.0)
+    assert [s["start"] for s in part.iter_segments()] == [10.0, 20.0, 30.0]
+    assert part.text == "First the budget. Then the hiring plan. Any questions?"
+    assert part.segment(1)["speaker"] == "B"
+    assert part["source"] == "upload"
+
+def test_segment_at_and_iter_segments(make_transcript):
+    store = SegmentStore.from_transcript(make_transcript(TEXTS))
+    assert store.segment_at(25.0) == 2
+    assert store.segment_at(-1.0) is None
+    assert [s["text"] for s in store.iter_segments(1, 3)] == [" First the budget.", " Then the hiring plan."]
+    assert store.word_count == 11
+
+def test_custom_full_text_is_preserved(make_transcript):
+    transcript = dict(make_transcript(TEXTS), text="Edited transcript text")
+    assert SegmentStore.from_transcript(transcript).text == "Edited transcript text"
+
+def test_load_is_lazy_and_save_is_compact(make_transcript, tmp_path):
+    path = tmp_path / "meeting_transcript.json"
+    save_transcript(as_segment_store(make_transcript(TEXTS)), str(path))
+    assert ", " not in path.read_text()  # Compact separators
+
+    store = load_transcript(str(path))
+    assert not store._loaded
+    assert store.segment_count == len(TEXTS)
+    assert store.to_transcript() == json.loads(path.read_text())
+    assert as_segment_store(store) is store
@@ -0,0 +1,38 @@
+"""Mapping stripped-audio timestamps back onto the original recording"""
+
+import pytest
+
+from silence_stripper import build_remap_table, map_to_original, remap_transcript, VAD_SPACER_SECONDS
+
+REGIONS = [(10.0, 20.0), (50.0, 60.0)]
+
+def test_table_places_regions_back_to_back_with_spacers():
+    assert build_remap_table(REGIONS) == [(0.0, 10.0, 10.0), (10.0 + VAD_SPACER_SECONDS, 50.0, 10.0)]
+
+def test_times_inside_regions_keep_their_offset():
+    table = build_remap_table(REGIONS)
+    assert map_to_original(5.0, table) == 15.0
+    assert map_to_original(10.0 + VAD_SPACER_SECONDS + 2.0, table) == pytest.approx(52.0)
+
+def test_spacer_times_clamp_to_the_region_edge():
+    table = build_remap_table(REGIONS)
+    assert map_to_original(10.0 + VAD_SPACER_SECONDS / 2, table) == 20.0
+    assert map_to_original(100.0, table) == 60.0
+
+def test_region_start_counts_as_previous_end_for_segment_ends():
+    table = build_remap_table(REGIONS)
+    second_start = 10.0 + VAD_SPACER_SECONDS
+    assert map_to_original(second_start, table) == 50.0
+    assert map_to_original(second_start, table, is_end=True) == 20.0
+
+def test_empty_table_is_identity():
+    assert map_to_original(42.0, []) == 42.0
+
+def test_remapped_segments_never_run_backwards():
+    table = build_remap_table(REGIONS)
+    transcript = {"text": "a b", "duration": 20.5, "segments": [
+        {"start": 0.0, "end": 10.5, "text": " a"},
+        {"start": 10.5, "end": 20.5, "text": " b"},
+    ]}
+    remapped = remap_transcript(transcript, table, original_duration=70.0)
+    assert [(s['start'], s['end']) for s in remapped['segments']] == [(10.0, 20.0), (50.0, 60.0)]
@@ -0,0 +1,58 @@
+"""Grounding MOM items in the transcript segments that support them"""
+
+from timestamp_grounding import SegmentIndex, ground_mom, parse_time_hint, timestamp_url
+
+SEGMENTS = [
+    (0, 30, "Good morning everyone, let's get started with the weekly sync."),
+    (30, 60, "First item: the database migration is blocked on the schema review."),
+    (60, 90, "We decided to move the weekly standup to Tuesday mornings."),
+    (90, 120, "Mike will draft the hiring plan for two backend engineers."),
+    (120, 150, "The plan is due by Friday so finance can review it."),
+    (150, 180, "Lunch options were discussed at length without a conclusion."),
+    (600, 630, "Quick recap: standup moves to Tuesday mornings as decided."),
+]
+
+def test_item_matched_to_supporting_segment(make_transcript):
+    match = SegmentIndex(make_transcript(SEGMENTS)).match("Move the weekly standup to Tuesday")
+    assert (match['start'], match['end']) == (60, 90)
+
+def test_time_hint_picks_the_nearby_mention(make_transcript):
+    index = SegmentIndex(make_transcript(SEGMENTS))
+    match = index.match("Standup moves to Tuesday mornings", hint=parse_time_hint("10:05"))
+    assert match['start'] == 600
+
+def test_match_spans_neighbouring_segments(make_transcript):
+    match = SegmentIndex(make_transcript(SEGMENTS)).match("Mike drafts the hiring plan for finance review by Friday")
+    assert (match['start'], match['end']) == (90, 150)
+
+def test_unrelated_item_is_not_grounded(make_transcript):
+    assert SegmentIndex(make_transcript(SEGMENTS)).match("Renew the office lease in Berlin") is None
+
+def test_ground_mom_sets_timestamps_and_metadata(make_transcript):
+    mom = {
+        "decisions": [{"decision": "Move the weekly standup to Tuesday", "timestamp": "01:10"}],
+        "action_items": [
+            {"task": "Draft the hiring plan for backend engineers", "owner": "Mike"},
+            {"task": "Renew the office lease in Berlin", "owner": "Ana", "timestamp": "Not specified"},
+        ],
+    }
+    ground_mom(mom, make_transcript(SEGMENTS, media_url="https://www.youtube.com/watch?v=abc123"))
+
+    assert mom["decisions"][0]["timestamp"] == "01:00-01:30"
+    assert (mom["action_items"][0]["start"], mom["action_items"][0]["end"]) == (90, 120)
+    assert "start" not in mom["action_items"][1]  # Unmatched items keep what the model said
+    assert mom["action_items"][1]["timestamp"] == "Not specified"
+    assert mom["metadata"]["timestamps_grounded"] == 2
+    assert mom["metadata"]["media_url"] == "https://www.youtube.com/watch?v=abc123"
+
+def test_parse_time_hint():
+    assert parse_time_hint("around 12:34") == 754
+    assert parse_time_hint("1:02:03") == 3723
+    assert parse_time_hint("Not specified") is None
+    assert parse_time_hint(None) is None
+
+def test_timestamp_url_only_for_youtube():
+    assert timestamp_url("https://www.youtube.com/watch?v=abc123", 95.7) == \
+        "https://www.youtube.com/watch?v=abc123&t=95s"
+    assert timestamp_url("https://example.com/recording.mp4", 95) is None
+    assert timestamp_url(None, 95) is None
@@ -0,0 +1,57 @@
+"""Token-aware transcript chunking and single-call routing"""
+
+import os
+
+from token_budget import (chunk_transcript_tokens, count_tokens, format_time_range, SINGLE_CALL_TOKEN_BUDGET,
+                          CHUNK_TOKEN_BUDGET, MODEL_CONTEXT_TOKENS, PROMPT_TOKEN_RESERVE, COMPLETION_TOKEN_RESERVE)
+
+TEXTS = [f"Segment {i} talks about topic number {i} in some detail." for i in range(40)]
+
+def test_chunks_stay_within_budget_and_keep_whole_segments(make_transcript):
+    chunks = chunk_transcript_tokens(make_transcript(TEXTS), max_tokens=60, overlap_tokens=0)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert count_tokens(chunk['text']) <= 60
+        assert chunk['text'].endswith('detail.')  # Never cut mid-segment
+    assert " ".join(chunk['text'] for chunk in chunks) == " ".join(TEXTS)
+
+def test_chunk_times_come_from_segments(make_transcript):
+    chunks = chunk_transcript_tokens(make_transcript(TEXTS), max_tokens=60, overlap_tokens=0)
+    assert chunks[0]['start'] == 0.0
+    assert chunks[-1]['end'] == 400.0
+    assert all(a['end'] == b['start'] for a, b in zip(chunks, chunks[1:]))
+
+def test_overlap_repeats_the_tail_of_the_previous_chunk(make_transcript):
+    chunks = chunk_transcript_tokens(make_transcript(TEXTS), max_tokens=60, overlap_tokens=15)
+    for previous, current in zip(chunks, chunks[1:]):
+        first_segment = current['text'].split('detail.')[0] + 'detail.'
+        assert first_segment in previous['text']
+
+def test_oversized_segment_is_split_on_sentences(make_transcript):
+    long_segment = " ".join(f"Sentence {i} is here." for i in range(60))
+    chunks = chunk_transcript_tokens(make_transcript([long_segment, "Short one."]), max_tokens=50, overlap_tokens=0)
+    assert all(count_tokens(chunk['text']) <= 50 for chunk in chunks)
+    assert all(chunk['text'].endswith('.') for chunk in chunks)
+
+def test_text_without_segments_is_chunked_by_sentence():
+    text = " ".join(TEXTS)
+    chunks = chunk_transcript_tokens({"text": text, "segments": []}, max_tokens=60, overlap_tokens=0)
+    assert len(chunks) > 1
+    assert all(chunk['start'] is None for chunk in chunks)
+
+def test_format_time_range():
+    assert format_time_range(65, 130) == "01:05-02:10"
+    assert format_time_range(3600, 3725) == "1:00:00-1:02:05"
+    assert format_time_range(None, 5) == ""
+
+def test_single_call_budget_leaves_room_for_prompt_and_answer():
+    assert SINGLE_CALL_TOKEN_BUDGET <= MODEL_CONTEXT_TOKENS - PROMPT_TOKEN_RESERVE - COMPLETION_TOKEN_RESERVE
+    assert SINGLE_CALL_TOKEN_BUDGET > CHUNK_TOKEN_BUDGET  # Chunk size doesn't cap single calls
+
+def test_single_call_routing_boundary():
+    os.environ.setdefault("OPENAI_API_KEY", "test")
+    from process_long_meeting import fits_single_call
+
+    assert fits_single_call(83000)  # Fits the context: one call, not a 9-call map-reduce
+    assert fits_single_call(SINGLE_CALL_TOKEN_BUDGET)
+    assert not fits_single_call(SINGLE_CALL_TOKEN_BUDGET + 1)
@@ -0,0 +1,35 @@
+"""Transcript cache lookups respect the requested backend"""
+
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest
+
+import transcribe_audio
+from transcribe_audio import BACKENDS
+from transcript_cache import TranscriptCache
+
+LOCAL_RESULT = {"text": "local", "language": "en", "duration": 1.0, "segments": []}
+API_RESULT = {"text": "api", "language": "en", "duration": 1.0, "segments": []}
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = TranscriptCache(cache_dir=str(tmp_path / "cache"))
+    monkeypatch.setattr(transcribe_audio, 'get_transcript_cache', lambda: cache)
+    monkeypatch.setattr(transcribe_audio, 'hash_audio', lambda path: "pcm-abc")
+    monkeypatch.setattr(transcribe_audio, 'get_audio_duration', lambda path: 60.0)
+    monkeypatch.setattr(BACKENDS["openai"], 'transcribe', lambda *args: dict(API_RESULT))
+    monkeypatch.setattr(BACKENDS["local"], 'is_available', lambda: False)
+    cache.put(cache.make_key("pcm-abc", BACKENDS["local"].model_name), LOCAL_RESULT)
+    return cache
+
+def test_explicit_backend_ignores_other_backends_cache(cache):
+    result = transcribe_audio.transcribe_audio("meeting.wav", strip_silence=False, backend="openai")
+    assert result["text"] == "api"
+    # The fresh API transcript is cached under its own key for next time
+    assert cache.get(cache.make_key("pcm-abc", BACKENDS["openai"].model_name))["text"] == "api"
+
+def test_auto_accepts_any_backends_cache(cache):
+    result = transcribe_audio.transcribe_audio("meeting.wav", strip_silence=False, backend="auto")
+    assert result["text"] == "local"
@@ -0,0 +1,45 @@
+"""Chunk planning and stitching for long recordings"""
+
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from transcribe_audio import plan_chunk_boundaries, merge_chunk_transcripts
+
+def test_short_recording_is_one_chunk():
+    assert plan_chunk_boundaries(300.0, [(100.0, 101.0)], 600) == [(0.0, 300.0)]
+
+def test_cuts_land_in_silences_near_the_limit():
+    silences = [(100.0, 102.0), (540.0, 544.0), (1100.0, 1110.0)]
+    boundaries = plan_chunk_boundaries(1500.0, silences, 600)
+    assert boundaries == [(0.0, 542.0), (542.0, 1105.0), (1105.0, 1500.0)]
+
+def test_hard_cut_when_no_silence_in_search_window():
+    # The silence at 100s is too early to be used for a 600s chunk
+    boundaries = plan_chunk_boundaries(1300.0, [(100.0, 102.0)], 600)
+    assert boundaries == [(0.0, 600.0), (600.0, 1200.0), (1200.0, 1300.0)]
+
+def test_boundaries_cover_the_recording_without_gaps():
+    silences = [(t, t + 1.0) for t in range(50, 3600, 170)]
+    boundaries = plan_chunk_boundaries(3600.0, silences, 600)
+    assert boundaries[0][0] == 0.0 and boundaries[-1][1] == 3600.0
+    for (_, end), (start, _) in zip(boundaries, boundaries[1:]):
+        assert end == start
+    assert all(end - start <= 600 for start, end in boundaries)
+
+def test_merge_offsets_segments_and_joins_text():
+    first = {"text": " Hello there. ", "language": "de", "duration": 540.0,
+             "segments": [{"start": 0.0, "end": 4.0, "text": " Hello there."}]}
+    second = {"text": "", "language": "en", "duration": 60.0, "segments": []}
+    third = {"text": "Goodbye.", "duration": 30.0,
+             "segments": [{"start": 10.0, "end": 12.5, "text": " Goodbye."}]}
+
+    merged = merge_chunk_transcripts([(first, 0.0), (second, 540.0), (third, 600.0)])
+
+    assert merged["text"] == "Hello there. Goodbye."
+    assert merged["language"] == "de"
+    assert merged["duration"] == 630.0
+    assert [(s["start"], s["end"]) for s in merged["segments"]] == [(0.0, 4.0), (610.0, 612.5)]
+
+def test_merge_of_nothing_is_empty_transcript():
+    assert merge_chunk_transcripts([]) == {"text": "", "language": "en", "duration": 0, "segments": []}
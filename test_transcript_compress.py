@@ -0,0 +1,44 @@
+"""Local transcript compression before the MOM prompt"""
+
+from transcript_compress import compress_transcript, normalize_text, strip_caption_overlap
+
+def _texts(transcript):
+    return [segment["text"].strip() for segment in transcript["segments"]]
+
+def test_short_answer_repeating_last_word_is_kept(make_transcript):
+    for texts in (["Should we say no?", "No."], ["Do we ship it or not?", "Not."]):
+        for source in (None, "youtube_captions"):
+            compressed, _ = compress_transcript(make_transcript(texts, source=source), level='light')
+            assert _texts(compressed) == texts
+
+def test_caption_overlap_stripped_for_captions_only(make_transcript):
+    texts = ["we should move the launch", "move the launch to next week"]
+    captions, _ = compress_transcript(make_transcript(texts, source="youtube_captions"), level='light')
+    assert _texts(captions) == ["We should move the launch", "To next week"]
+
+    whisper, _ = compress_transcript(make_transcript(texts), level='light')
+    assert _texts(whisper) == ["We should move the launch", "Move the launch to next week"]
+
+def test_overlap_shorter_than_minimum_is_not_stripped():
+    assert strip_caption_overlap("let's get the budget", "budget approved today") == "budget approved today"
+
+def test_light_level_keeps_real_doubled_words():
+    assert normalize_text("I had had enough of that", 'light') == "I had had enough of that"
+
+def test_light_level_removes_fillers_and_stutters():
+    assert normalize_text("Um, I- I think we should, uh, ship it.", 'light') == "I think we should ship it."
+
+def test_aggressive_level_removes_repeated_words():
+    assert normalize_text("we we need to ship", 'aggressive') == "We need to ship"
+
+def test_filler_only_segment_is_dropped_and_timeline_kept(make_transcript):
+    compressed, report = compress_transcript(make_transcript(["We agreed on March.", "Uh.", "Next topic."]), level='light')
+    assert _texts(compressed) == ["We agreed on March.", "Next topic."]
+    assert compressed["segments"][0]["end"] == 20.0
+    assert report["segments_before"] == 3 and report["segments_after"] == 2
+
+def test_off_level_returns_transcript_unchanged(make_transcript):
+    transcript = make_transcript(["Um, hello", "hello there"])
+    compressed, report = compress_transcript(transcript, level='off')
+    assert compressed["text"] == transcript["text"]
+    assert report["saved_tokens"] == 0
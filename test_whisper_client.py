@@ -0,0 +1,65 @@
+"""Whisper rate limiting and rate-limit header parsing"""
+
+import pytest
+
+import whisper_client
+from whisper_client import RateLimiter, parse_reset_duration, retry_after_seconds
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(whisper_client.time, 'monotonic', fake)
+    return fake
+
+def test_burst_up_to_capacity_then_wait_for_refill(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+    assert [limiter.reserve() for _ in range(60)] == [0.0] * 60
+    assert limiter.reserve() == pytest.approx(1.0)
+    assert limiter.reserve() == pytest.approx(2.0)  # Debt keeps queueing callers
+
+def test_tokens_refill_over_time(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+    for _ in range(60):
+        limiter.reserve()
+    clock.now += 5
+    assert [limiter.reserve() for _ in range(5)] == [0.0] * 5
+    assert limiter.reserve() > 0
+
+def test_headers_set_the_rate_and_remaining_budget(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter.update_from_headers({'x-ratelimit-limit-requests': '600', 'x-ratelimit-remaining-requests': '1'})
+    assert limiter.rate == 10.0
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == pytest.approx(0.1)
+
+def test_exhausted_budget_pauses_until_reset(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter.update_from_headers({'x-ratelimit-remaining-requests': '0', 'x-ratelimit-reset-requests': '6m0s'})
+    assert limiter.reserve() == pytest.approx(360.0)
+
+def test_pause_holds_back_every_caller(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter.pause(20)
+    assert limiter.reserve() == pytest.approx(20.0)
+    clock.now += 20
+    assert limiter.reserve() == 0.0
+
+def test_unparseable_headers_are_ignored(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter.update_from_headers({'x-ratelimit-limit-requests': 'lots'})
+    assert limiter.rate == 1.0
+
+def test_reset_durations_and_retry_after():
+    assert parse_reset_duration("1h2m3.5s") == pytest.approx(3723.5)
+    assert parse_reset_duration("20ms") == pytest.approx(0.02)
+    assert parse_reset_duration("soon") is None
+    assert retry_after_seconds({'retry-after-ms': '1500', 'retry-after': '9'}) == 1.5
+    assert retry_after_seconds({'x-ratelimit-reset-requests': '2s'}) == 2.0
+    assert retry_after_seconds({}) is None
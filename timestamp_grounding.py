@@ -0,0 +1,197 @@
+"""
+Exact timestamps for MOM items from a local index over transcript segments
+Matches each decision/action item back to the segments that support it (no extra tokens)
+"""
+
+import os
+import re
+import math
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+from segment_store import as_segment_store
+from extractive_summary import STOPWORDS
+from mom_schema import ITEM_TEXT_FIELDS
+from token_budget import format_time_range
+
+GROUNDING_MIN_COVERAGE = float(os.getenv("MOM_GROUNDING_MIN_COVERAGE", "0.35"))  # Share of the item's term weight found
+GROUNDING_HINT_WINDOW = 180  # Seconds searched around a time the model gave before searching everywhere
+GROUNDING_MAX_SPAN = 3  # Neighbouring segments on each side that may join the match
+
+WORD = re.compile(r"[a-z0-9']+")
+TIME_HINT = re.compile(r"\b(?:(\d+):)?(\d{1,2}):(\d{2})\b")
+
+def terms(text):
+    """Content words of a text, lightly stemmed so "ship"/"shipping"/"ships" match"""
+    found = []
+    for word in WORD.findall(text.lower()):
+        word = word.strip("'")
+        if len(word) < 3 or word in STOPWORDS:
+            continue
+        for suffix in ('ing', 'ed', 'es', 's'):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[:-len(suffix)]
+                break
+        found.append(word)
+    return found
+
+def parse_time_hint(value):
+    """Seconds from a model-written time like "12:34" or "1:02:03" (None if there is none)"""
+    match = TIME_HINT.search(value) if isinstance(value, str) else None
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+
+class SegmentIndex:
+    """
+    Inverted index over the segments of one transcript
+
+    Postings map a term to the segment indexes containing it; time windows
+    are resolved with bisect over the segment start times of the SegmentStore.
+    """
+
+    def __init__(self, transcript):
+        self.store = as_segment_store(transcript)
+        self.postings = {}
+        self.segment_terms = []
+
+        for i, segment in enumerate(self.store.iter_segments()):
+            segment_terms = set(terms(segment['text']))
+            self.segment_terms.append(segment_terms)
+            for term in segment_terms:
+                self.postings.setdefault(term, []).append(i)
+
+        count = max(1, len(self.segment_terms))
+        self.idf = {term: math.log(1 + count / len(postings)) for term, postings in self.postings.items()}
+
+    def _score(self, weights, first, last):
+        scores = {}
+        for term, weight in weights.items():
+            for i in self.postings.get(term, ()):
+                if first <= i < last:
+                    scores[i] = scores.get(i, 0.0) + weight
+        return scores
+
+    def match(self, text, hint=None):
+        """
+        Find the segments that support a piece of text
+
+        Args:
+            text: Item text (decision, task, ...)
+            hint: Optional time in seconds to search around first
+
+        Returns:
+            dict: start, end, segments (first, last exclusive) and coverage, or None if nothing matches well enough
+        """
+        weights = {term: self.idf[term] for term in set(terms(text)) if term in self.idf}
+        total = sum(self.idf.get(term, 0.0) for term in set(terms(text))) or 0.0
+        if not weights or not total:
+            return None
+
+        scores = {}
+        if hint is not None:
+            scores = self._score(weights, *self.store.index_range(hint - GROUNDING_HINT_WINDOW,
+                                                                  hint + GROUNDING_HINT_WINDOW))
+        if not scores:
+            scores = self._score(weights, 0, self.store.segment_count)
+        if not scores:
+            return None
+
+        best = max(scores, key=lambda i: (scores[i], -i))
+        covered = weights.keys() & self.segment_terms[best]
+        first, last = best, best + 1
+
+        # Grow the span while a neighbour adds words of the item not seen yet
+        for _ in range(GROUNDING_MAX_SPAN):
+            grown = False
+            for i in (first - 1, last):
+                if 0 <= i < self.store.segment_count:
+                    new_terms = (weights.keys() & self.segment_terms[i]) - covered
+                    if new_terms:
+                        covered |= new_terms
+                        first, last = min(first, i), max(last, i + 1)
+                        grown = True
+            if not grown:
+                break
+
+        coverage = sum(weights[term] for term in covered) / total
+        if coverage < GROUNDING_MIN_COVERAGE:
+            return None
+
+        return {
+            'start': self.store.segment(first)['start'],
+            'end': self.store.segment(last - 1)['end'],
+            'segments': [first, last],
+            'coverage': round(coverage, 2),
+        }
+
+def ground_items(items, field, index):
+    """
+    Attach exact start/end times to MOM items in place
+
+    Args:
+        items: List of item dicts
+        field: Field holding the item text
+        index: SegmentIndex of the transcript
+
+    Returns:
+        int: Number of items grounded
+    """
+    grounded = 0
+    for item in items or []:
+        if not isinstance(item, dict) or not isinstance(item.get(field), str):
+            continue
+        match = index.match(item[field], parse_time_hint(item.get('timestamp')))
+        if match:
+            item.update({
+                'timestamp': format_time_range(match['start'], match['end']),
+                'start': match['start'],
+                'end': match['end'],
+            })
+            grounded += 1
+    return grounded
+
+def ground_mom(mom, transcript, index=None):
+    """
+    Give every decision and action item the exact time it was discussed
+
+    Args:
+        mom: MOM dict (updated in place)
+        transcript: Transcript dict or SegmentStore the MOM was generated from
+        index: Prebuilt SegmentIndex for this transcript
+
+    Returns:
+        dict: The MOM
+    """
+    store = as_segment_store(transcript)
+    if store.segment_count < 2:
+        return mom  # One segment (or none) has no useful timestamps
+
+    index = index or SegmentIndex(store)
+    grounded = sum(ground_items(mom.get(key), field, index)
+                   for key, field in ITEM_TEXT_FIELDS.items())
+    total = sum(len(mom.get(key) or []) for key in ITEM_TEXT_FIELDS)
+    print(f"🕐 Timestamps grounded for {grounded}/{total} decisions and action items")
+
+    metadata = mom.setdefault('metadata', {})
+    metadata['timestamps_grounded'] = grounded
+    if store.get('media_url'):
+        metadata['media_url'] = store.get('media_url')
+    return mom
+
+def timestamp_url(media_url, seconds):
+    """
+    Link that opens the recording at a given time (YouTube only), or None
+
+    Args:
+        media_url: Source URL of the recording
+        seconds: Position in seconds
+    """
+    if not media_url or seconds is None:
+        return None
+    parts = urlparse(media_url)
+    if not any(host in parts.netloc for host in ('youtube.com', 'youtu.be')):
+        return None
+    query = parse_qs(parts.query)
+    query['t'] = [f"{int(seconds)}s"]
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
@@ -0,0 +1,215 @@
+"""
+Token counting and token-budgeted transcript chunking for the MOM prompts
+Counts real model tokens with tiktoken (falls back to an estimate when it's unavailable)
+"""
+
+import os
+import re
+from functools import lru_cache
+
+MOM_MODEL = "gpt-4o-mini"
+
+# Context window of MOM_MODEL, room kept for the instructions, and for the JSON response of a full MOM
+MODEL_CONTEXT_TOKENS = int(os.getenv("MOM_CONTEXT_TOKENS", "128000"))
+PROMPT_TOKEN_RESERVE = 6000
+COMPLETION_TOKEN_RESERVE = int(os.getenv("MOM_COMPLETION_TOKENS", "4000"))
+
+# Largest transcript sent in one MOM call; anything longer goes through map-reduce
+SINGLE_CALL_TOKEN_BUDGET = min(
+    int(os.getenv("MOM_SINGLE_CALL_TOKENS", str(MODEL_CONTEXT_TOKENS))),
+    MODEL_CONTEXT_TOKENS - PROMPT_TOKEN_RESERVE - COMPLETION_TOKEN_RESERVE
+)
+
+# Tokens of transcript per call (never more than fits the context), and tokens repeated from the previous chunk
+CHUNK_TOKEN_BUDGET = min(int(os.getenv("MOM_CHUNK_TOKENS", "12000")), MODEL_CONTEXT_TOKENS - PROMPT_TOKEN_RESERVE)
+CHUNK_OVERLAP_TOKENS = int(os.getenv("MOM_CHUNK_OVERLAP_TOKENS", "200"))
+
+CHARS_PER_TOKEN = 4  # Estimate used when tiktoken can't be loaded
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+@lru_cache(maxsize=None)
+def _encoding(model):
+    """tiktoken encoding for a model, or None if tiktoken (or its BPE file) isn't available"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception:
+        return None  # BPE download failed (offline)
+
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+def count_tokens(text, model=MOM_MODEL):
+    """
+    Count model tokens in a piece of text
+
+    Args:
+        text: Text to count
+        model: Model name used to pick the tokenizer
+
+    Returns:
+        int: Token count (estimated from characters if tiktoken is unavailable)
+    """
+    if not text:
+        return 0
+
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+def split_sentences(text):
+    """Split text into sentences, keeping the punctuation"""
+    return [s for s in SENTENCE_END.split(text.strip()) if s]
+
+def _split_oversized(text, max_tokens, model):
+    """Break a single unit that is over budget into sentence groups, then word groups"""
+    pieces = []
+    current = []
+    current_tokens = 0
+
+    for sentence in split_sentences(text):
+        tokens = count_tokens(sentence, model)
+        if tokens > max_tokens:
+            words = sentence.split()
+            step = max(1, len(words) * max_tokens // tokens)
+            pieces.extend(' '.join(words[i:i + step]) for i in range(0, len(words), step))
+            continue
+
+        if current and current_tokens + tokens > max_tokens:
+            pieces.append(' '.join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += tokens
+
+    if current:
+        pieces.append(' '.join(current))
+    return pieces
+
+def transcript_units(transcript):
+    """
+    Break a transcript into the smallest pieces a chunk may not cut through
+
+    Uses the transcript segments when they carry timestamps, otherwise sentences
+    of the full text (e.g. caption transcripts without segments).
+
+    Args:
+        transcript: Transcript dict or SegmentStore
+
+    Returns:
+        list: Dicts with text, start and end (times are None without segments)
+    """
+    if hasattr(transcript, 'iter_segments'):
+        segments = transcript.iter_segments()
+    else:
+        segments = transcript.get('segments') or []
+
+    units = [
+        {"text": segment['text'].strip(), "start": segment.get('start'), "end": segment.get('end')}
+        for segment in segments
+        if segment.get('text', '').strip()
+    ]
+
+    # A single segment spanning the whole text carries no useful boundaries
+    if len(units) <= 1:
+        return [
+            {"text": sentence, "start": None, "end": None}
+            for sentence in split_sentences(transcript.get('text', ''))
+        ]
+    return units
+
+def chunk_units(units, max_tokens=CHUNK_TOKEN_BUDGET, overlap_tokens=CHUNK_OVERLAP_TOKENS, model=MOM_MODEL):
+    """
+    Pack whole units into chunks of at most max_tokens tokens
+
+    Args:
+        units: Dicts with text, start, end (from transcript_units)
+        max_tokens: Token budget per chunk
+        overlap_tokens: Tokens of trailing units repeated at the start of the next chunk
+        model: Model name used to pick the tokenizer
+
+    Returns:
+        list: Chunk dicts with text, start, end and tokens
+    """
+    # Count each unit once; split any unit that can't fit in a chunk on its own
+    counted = []
+    for unit in units:
+        tokens = count_tokens(unit['text'], model)
+        if tokens <= max_tokens:
+            counted.append((unit, tokens))
+            continue
+        for piece in _split_oversized(unit['text'], max_tokens, model):
+            counted.append((dict(unit, text=piece), count_tokens(piece, model)))
+
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    def close():
+        chunks.append({
+            "text": ' '.join(unit['text'] for unit, _ in current),
+            "start": current[0][0]['start'],
+            "end": current[-1][0]['end'],
+            "tokens": current_tokens
+        })
+
+    for unit, tokens in counted:
+        if current and current_tokens + tokens + 1 > max_tokens:
+            close()
+
+            # Carry the tail of this chunk into the next one for context
+            carried = []
+            carried_tokens = 0
+            for previous, previous_tokens in reversed(current):
+                if carried_tokens + previous_tokens > overlap_tokens:
+                    break
+                carried.insert(0, (previous, previous_tokens))
+                carried_tokens += previous_tokens + 1
+            if carried_tokens + tokens + 1 > max_tokens:
+                carried, carried_tokens = [], 0
+
+            current, current_tokens = carried, carried_tokens
+
+        current.append((unit, tokens))
+        current_tokens += tokens + (1 if len(current) > 1 else 0)
+
+    if current:
+        close()
+    return chunks
+
+def chunk_transcript_tokens(transcript, max_tokens=CHUNK_TOKEN_BUDGET, overlap_tokens=CHUNK_OVERLAP_TOKENS,
+                            model=MOM_MODEL):
+    """
+    Split a transcript into token-budgeted chunks on segment or sentence boundaries
+
+    Args:
+        transcript: Transcript dict or SegmentStore
+        max_tokens: Token budget per chunk
+        overlap_tokens: Tokens repeated from the end of the previous chunk
+        model: Model name used to pick the tokenizer
+
+    Returns:
+        list: Chunk dicts with text, start, end (seconds or None) and tokens
+    """
+    return chunk_units(transcript_units(transcript), max_tokens, overlap_tokens, model)
+
+def format_time_range(start, end):
+    """Format a chunk's time range as MM:SS-MM:SS (empty if unknown)"""
+    if start is None or end is None:
+        return ""
+
+    def mmss(seconds):
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+    return f"{mmss(start)}-{mmss(end)}"
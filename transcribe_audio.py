@@ -1,37 +1,198 @@
 """
 Transcribe audio/video file using OpenAI Whisper API with retry logic
-Converts video to audio first to reduce file size
+Re-encodes recordings to compact speech audio when they don't fit the upload limit
 """
 
 import os
 from openai import OpenAI
 from dotenv import load_dotenv
-import json
 import time
 from pathlib import Path
 import subprocess
 import tempfile
+import shutil
+import re
+import asyncio
+import threading
+import importlib.util
+from functools import lru_cache
+import openai
+from transcript_cache import get_transcript_cache, hash_audio
+from media_probe import probe_media, sniff_media, whisper_upload_ok, artifact_path
+from segment_store import save_transcript
+from whisper_client import (
+    WHISPER_MODEL, get_rate_limiter, classify_error, backoff_seconds,
+    parse_whisper_response, transcribe_as_ready_async
+)
+import silence_stripper
 
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Retries are handled by _call_whisper; the SDK's own retries would multiply them
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
 
-def convert_video_to_audio(video_path):
+# Whisper API upload limit
+WHISPER_MAX_MB = 25
+
+# Encodings in order of preference. Each starts at the smallest bitrate that
+# still transcribes well and may step down to min_kbps to fit one upload.
+ENCODINGS = [
+    {'name': 'opus', 'codec': 'libopus', 'ext': '.ogg', 'target_kbps': 16, 'min_kbps': 12},
+    {'name': 'mp3', 'codec': 'libmp3lame', 'ext': '.mp3', 'target_kbps': 32, 'min_kbps': 24},
+]
+UPLOAD_HEADROOM = 0.95  # Container overhead / bitrate variance
+
+# Chunked mode settings (used for recordings over the upload limit or long meetings)
+CHUNK_TARGET_MB = 20  # Stay well under the 25MB limit
+CHUNK_SECONDS = int(os.getenv("WHISPER_CHUNK_SECONDS", "600"))  # 10 min pieces
+MAX_PARALLEL_CHUNKS = int(os.getenv("WHISPER_MAX_PARALLEL", "4"))
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_SECONDS = 0.5
+
+# Strip long silences before upload (see silence_stripper.py)
+VAD_ENABLED = os.getenv("WHISPER_STRIP_SILENCE", "1") == "1"
+
+# Transcription backend: "openai", "local" or "auto"
+TRANSCRIBE_BACKEND = os.getenv("TRANSCRIBE_BACKEND", "auto")
+LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "small")
+LOCAL_COMPUTE_TYPE = os.getenv("LOCAL_COMPUTE_TYPE", "int8")  # Quantized weights for CPU
+LOCAL_CPU_THREADS = int(os.getenv("LOCAL_CPU_THREADS", "0"))  # 0 = all cores
+LOCAL_WORKERS = int(os.getenv("LOCAL_WORKERS", "1"))  # Concurrent local jobs
+
+# "auto" routing: long recordings and overflow go to the local engine
+LOCAL_ROUTE_MIN_MINUTES = float(os.getenv("LOCAL_ROUTE_MIN_MINUTES", "90"))
+LOCAL_ROUTE_BACKLOG = int(os.getenv("LOCAL_ROUTE_BACKLOG", "3"))  # Hosted jobs already in flight
+API_FAILURES_BEFORE_FALLBACK = 2
+API_COOLDOWN_SECONDS = 300
+
+@lru_cache(maxsize=1)
+def _available_encoders():
+    """
+    List ffmpeg audio encoders (runs ffmpeg once per process)
+    
+    Returns:
+        frozenset: Encoder names, or None if ffmpeg is not installed
+    """
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'], capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+    
+    encoders = set()
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].startswith('A'):
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+def _encoding_args(encoding):
+    """Build ffmpeg output arguments for an encoding chosen by plan_audio_encoding"""
+    args = [
+        '-vn',  # No video
+        '-ac', '1',  # Mono is enough for speech
+        '-ar', '16000',  # 16kHz sample rate (Whisper optimal)
+        '-acodec', encoding['codec'],
+        '-ab', f"{encoding['bitrate_kbps']}k",
+    ]
+    if encoding['codec'] == 'libopus':
+        args += ['-application', 'voip']  # Tune Opus for speech
+    return args
+
+def get_audio_duration(audio_path):
+    """
+    Read media duration with ffprobe
+    
+    Args:
+        audio_path: Path to audio or video file
+    
+    Returns:
+        float: Duration in seconds, or None if it can't be determined
+    """
+    info = probe_media(audio_path)
+    return info['duration'] if info else None
+
+def default_encoding():
+    """Preferred available encoding at its target bitrate"""
+    encoders = _available_encoders() or frozenset()
+    usable = [e for e in ENCODINGS if e['codec'] in encoders] or ENCODINGS[-1:]
+    return dict(usable[0], bitrate_kbps=usable[0]['target_kbps'])
+
+def estimate_encoded_mb(duration, bitrate_kbps):
+    """Estimate output size in MB for a duration at a constant bitrate"""
+    return duration * bitrate_kbps * 1000 / 8 / (1024 * 1024)
+
+def plan_audio_encoding(media_path, info=None):
+    """
+    Decide how to prepare a recording for upload
+    
+    Skips re-encoding when the file's real container (sniffed from its header)
+    is a Whisper format matching its extension and it fits the upload limit. Otherwise picks the most compact available codec and the
+    highest bitrate on its ladder that fits in one upload. If nothing fits,
+    the recording is encoded in chunks instead.
+    
+    Args:
+        media_path: Path to audio or video file
+        info: Optional probe_media() result
+    
+    Returns:
+        dict: action ('copy', 'encode' or 'chunk'), encoding, duration, estimated_mb, reason
     """
-    Convert video file to MP3 audio using ffmpeg
+    info = info if info is not None else probe_media(media_path)
+    sniffed = sniff_media(media_path)
+    duration = info['duration'] if info else None
+    size_mb = os.path.getsize(media_path) / (1024 * 1024)
+    has_video = info['has_video'] if info else sniffed['may_have_video']
+    
+    plan = {
+        'action': 'copy',
+        'encoding': None,
+        'duration': duration,
+        'estimated_mb': size_mb,
+        'reason': 'already fits upload limit',
+        'has_video': has_video,
+    }
+    
+    if whisper_upload_ok(media_path, sniffed) and not has_video and size_mb <= WHISPER_MAX_MB:
+        return plan
+    
+    encoders = _available_encoders() or frozenset()
+    usable = [e for e in ENCODINGS if e['codec'] in encoders] or ENCODINGS[-1:]
+    
+    if not duration:
+        # Can't estimate size - use the preferred encoding and check afterwards
+        plan.update(action='encode', reason='duration unknown', encoding=default_encoding())
+        return plan
+    
+    limit_mb = WHISPER_MAX_MB * UPLOAD_HEADROOM
+    for encoding in usable:
+        for kbps in range(encoding['target_kbps'], encoding['min_kbps'] - 1, -4):
+            estimated = estimate_encoded_mb(duration, kbps)
+            if estimated <= limit_mb:
+                plan.update(action='encode', estimated_mb=estimated,
+                            reason='video stream' if has_video else f'{size_mb:.1f}MB source')
+                plan['encoding'] = dict(encoding, bitrate_kbps=kbps)
+                return plan
+    
+    # Too long for a single upload at any acceptable bitrate
+    plan.update(action='chunk', reason='too long for one upload', encoding=default_encoding())
+    plan['estimated_mb'] = estimate_encoded_mb(duration, plan['encoding']['bitrate_kbps'])
+    return plan
+
+def convert_video_to_audio(video_path, plan=None):
+    """
+    Convert a video or audio file to compact speech audio using ffmpeg
     
     Args:
-        video_path: Path to video file
+        video_path: Path to video or audio file
+        plan: Optional plan_audio_encoding() result
     
     Returns:
         str: Path to converted audio file, or None if conversion fails
     """
-    print("🎬 Video file detected - extracting audio...")
+    print("🎬 Extracting and compressing audio...")
     
     # Check if ffmpeg is available
-    try:
-        subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    if _available_encoders() is None:
         print("❌ Error: ffmpeg not found!")
         print("   Please install ffmpeg:")
         print("   - Mac: brew install ffmpeg")
@@ -39,209 +200,671 @@ def convert_video_to_audio(video_path):
         print("   - Windows: Download from https://ffmpeg.org/download.html")
         return None
     
-    # Create temporary audio file
+    plan = plan or plan_audio_encoding(video_path)
+    encoding = plan['encoding'] or default_encoding()
+    
+    # Write into a per-job temp directory, not the working directory
     video_name = Path(video_path).stem
-    temp_audio = f"{video_name}_audio.mp3"
+    temp_audio = os.path.join(tempfile.mkdtemp(prefix="audio_"), f"{video_name}_audio{encoding['ext']}")
     
     try:
-        print(f"   Converting {Path(video_path).name} to MP3...")
+        print(f"   Converting {Path(video_path).name} to {encoding['name']} "
+              f"{encoding['bitrate_kbps']}kbps mono ({plan['reason']})...")
         
-        # Extract audio with compression
-        # -vn: no video, -acodec: audio codec, -ar: audio sample rate, -ab: audio bitrate
-        result = subprocess.run([
-            'ffmpeg',
-            '-i', video_path,
-            '-vn',  # No video
-            '-acodec', 'libmp3lame',  # MP3 codec
-            '-ar', '16000',  # 16kHz sample rate (Whisper optimal)
-            '-ab', '32k',  # 32kbps bitrate (good quality, small size)
-            '-y',  # Overwrite output file
-            temp_audio
-        ], capture_output=True, text=True)
+        result = subprocess.run(
+            ['ffmpeg', '-i', video_path] + _encoding_args(encoding) + ['-y', temp_audio],
+            capture_output=True, text=True
+        )
         
         if result.returncode != 0:
             print(f"❌ ffmpeg error: {result.stderr}")
+            _remove_temp_audio(temp_audio)
             return None
         
         # Check output file size
         audio_size_mb = os.path.getsize(temp_audio) / (1024 * 1024)
         print(f"✅ Audio extracted: {audio_size_mb:.1f}MB")
         
-        if audio_size_mb > 25:
-            print(f"⚠️  Warning: Extracted audio is still {audio_size_mb:.1f}MB")
-            print("   This exceeds Whisper's 25MB limit.")
-            print("   Try recording shorter meetings or use lower quality settings.")
-            return None
+        if audio_size_mb > WHISPER_MAX_MB:
+            print(f"⚠️  Extracted audio is still {audio_size_mb:.1f}MB (limit {WHISPER_MAX_MB}MB)")
+            print("   Will split into chunks and transcribe in parallel.")
         
         return temp_audio
         
     except Exception as e:
         print(f"❌ Conversion error: {e}")
+        _remove_temp_audio(temp_audio)
         return None
 
-def transcribe_audio(audio_file_path, max_retries=3):
+def _remove_temp_audio(temp_audio):
+    """Delete a converted file and its per-job temp directory"""
+    shutil.rmtree(os.path.dirname(temp_audio), ignore_errors=True)
+
+def detect_silences(audio_path, noise_db=SILENCE_NOISE_DB, min_silence=SILENCE_MIN_SECONDS):
     """
-    Transcribe audio/video using OpenAI Whisper API with retry logic
+    Find silent stretches using ffmpeg's silencedetect filter
     
     Args:
-        audio_file_path: Path to audio or video file
-        max_retries: Maximum number of retry attempts
+        audio_path: Path to audio file
+        noise_db: Volume threshold (dB) below which audio counts as silence
+        min_silence: Minimum silence length in seconds
     
     Returns:
-        dict: Transcript with text and segments
+        list: (start, end) tuples in seconds, empty if detection fails
     """
+    try:
+        result = subprocess.run([
+            'ffmpeg',
+            '-i', audio_path,
+            '-af', f'silencedetect=noise={noise_db}dB:d={min_silence}',
+            '-f', 'null',
+            '-'
+        ], capture_output=True, text=True)
+    except FileNotFoundError:
+        return []
     
-    print(f"🎙️  Transcribing: {audio_file_path}")
+    silences = []
+    start = None
+    for line in result.stderr.splitlines():
+        start_match = re.search(r'silence_start: (-?[\d.]+)', line)
+        end_match = re.search(r'silence_end: ([\d.]+)', line)
+        if start_match:
+            start = max(0.0, float(start_match.group(1)))
+        elif end_match and start is not None:
+            silences.append((start, float(end_match.group(1))))
+            start = None
     
-    # Get file extension
-    ext = Path(audio_file_path).suffix.lower()
-    video_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.flv', '.wmv']
+    return silences
+
+def plan_chunk_boundaries(duration, silences, max_chunk_seconds):
+    """
+    Choose chunk boundaries, cutting in the middle of a silence where possible
     
-    # Convert video to audio if needed
-    temp_audio_file = None
-    if ext in video_extensions:
-        temp_audio_file = convert_video_to_audio(audio_file_path)
-        if not temp_audio_file:
-            print("❌ Failed to convert video to audio")
-            return None
-        audio_file_path = temp_audio_file
-        print(f"✅ Using converted audio: {audio_file_path}")
+    Args:
+        duration: Total audio duration in seconds
+        silences: List of (start, end) silence tuples
+        max_chunk_seconds: Maximum length of a chunk
     
-    print("⏳ This may take a minute...")
+    Returns:
+        list: (start, end) tuples covering the whole recording
+    """
+    if duration <= max_chunk_seconds:
+        return [(0.0, duration)]
     
-    # Check file size (Whisper has 25MB limit)
-    file_size_mb = os.path.getsize(audio_file_path) / (1024 * 1024)
-    print(f"📦 File size: {file_size_mb:.1f}MB")
+    # Only look for a silence in the last quarter of each chunk
+    search_window = max_chunk_seconds * 0.25
+    cut_points = [(s + e) / 2 for s, e in silences]
+    
+    boundaries = []
+    start = 0.0
+    while duration - start > max_chunk_seconds:
+        limit = start + max_chunk_seconds
+        candidates = [c for c in cut_points if limit - search_window <= c <= limit]
+        cut = max(candidates) if candidates else limit  # Hard cut if no silence nearby
+        boundaries.append((start, cut))
+        start = cut
+    boundaries.append((start, duration))
     
-    if file_size_mb > 25:
-        print(f"❌ Error: File is {file_size_mb:.1f}MB. Whisper API limit is 25MB.")
-        print("   Try compressing the file or recording shorter segments.")
-        if temp_audio_file and os.path.exists(temp_audio_file):
-            os.remove(temp_audio_file)
+    return boundaries
+
+def start_segmenter(audio_path, boundaries, output_dir, encoding=None):
+    """
+    Demux, encode and split in a single ffmpeg pass using the segment muxer
+    
+    Each chunk is listed in segments.csv as soon as ffmpeg closes it, so
+    uploads can start while later chunks are still being written.
+    
+    Args:
+        audio_path: Path to audio or video file
+        boundaries: List of (start, end) tuples in seconds
+        output_dir: Per-job directory for chunk files
+        encoding: Encoding for the chunks (defaults to default_encoding())
+    
+    Returns:
+        tuple: (ffmpeg process, segment list path)
+    """
+    encoding = encoding or default_encoding()
+    list_file = os.path.join(output_dir, "segments.csv")
+    
+    args = ['ffmpeg', '-v', 'error', '-i', audio_path] + _encoding_args(encoding) + [
+        '-f', 'segment',
+        '-segment_list', list_file,
+        '-segment_list_type', 'csv',
+        '-reset_timestamps', '1',
+    ]
+    cut_times = [end for _, end in boundaries[:-1]]
+    if cut_times:
+        args += ['-segment_times', ",".join(f"{t:.3f}" for t in cut_times)]
+    else:
+        args += ['-segment_time', f"{boundaries[-1][1] + 60:.0f}"]  # One segment
+    args += ['-y', os.path.join(output_dir, f"chunk_%03d{encoding['ext']}")]
+    
+    with open(os.path.join(output_dir, "ffmpeg.log"), 'w') as log:
+        process = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=log)
+    return process, list_file
+
+def read_segment_list(list_file):
+    """
+    Read completed chunks from an ffmpeg CSV segment list
+    
+    Returns:
+        list: (file_name, start_seconds, end_seconds) for each fully written chunk
+    """
+    try:
+        with open(list_file, 'r') as f:
+            content = f.read()
+    except OSError:
+        return []
+    
+    entries = []
+    for line in content.splitlines(keepends=True):
+        if not line.endswith('\n'):
+            break  # ffmpeg is still writing this line
+        name, start, end = line.strip().rsplit(',', 2)
+        entries.append((name, float(start), float(end)))
+    return entries
+
+async def _completed_segments(process, list_file, output_dir, total):
+    """Yield (offset, chunk_path) for each chunk as ffmpeg finishes writing it"""
+    seen = 0
+    while True:
+        finished = process.poll() is not None
+        entries = read_segment_list(list_file)
+        for name, start, end in entries[seen:]:
+            print(f"   📦 Chunk {seen + 1}/{total} ready ({start/60:.1f}-{end/60:.1f} min) - uploading")
+            seen += 1
+            yield start, os.path.join(output_dir, name)
+        if finished:
+            return
+        await asyncio.sleep(0.5)
+
+def merge_chunk_transcripts(chunk_results):
+    """
+    Stitch per-chunk transcripts back into one transcript
+    
+    Args:
+        chunk_results: List of (transcript_dict, offset_seconds) in chunk order
+    
+    Returns:
+        dict: Transcript with text, language, duration and offset segments
+    """
+    merged = {
+        "text": "",
+        "language": chunk_results[0][0].get('language', 'en') if chunk_results else 'en',
+        "duration": 0,
+        "segments": []
+    }
+    
+    texts = []
+    for transcript, offset in chunk_results:
+        texts.append(transcript['text'].strip())
+        for segment in transcript['segments']:
+            merged["segments"].append({
+                "start": segment['start'] + offset,
+                "end": segment['end'] + offset,
+                "text": segment['text']
+            })
+        merged["duration"] = max(merged["duration"], offset + (transcript.get('duration') or 0))
+    
+    merged["text"] = " ".join(t for t in texts if t)
+    return merged
+
+def transcribe_audio_chunked(audio_file_path, max_retries=3, duration=None, language=None, encoding=None,
+                             cut_at_silence=True):
+    """
+    Transcribe a long recording by splitting it into chunks and sending them to Whisper in parallel
+    
+    Chunks are written by a single ffmpeg pass and uploaded as soon as each
+    one is complete, so encoding and uploading overlap.
+    
+    Args:
+        audio_file_path: Path to audio or video file
+        max_retries: Maximum retry attempts per chunk
+        duration: Audio duration in seconds (probed if not given)
+        language: Optional ISO-639-1 language hint for Whisper
+        encoding: Encoding for the chunks (defaults to default_encoding())
+        cut_at_silence: Run a silence detection pass first to pick cut points
+                        (skipped for video, where it would mean decoding twice)
+    
+    Returns:
+        dict: Merged transcript with text and segments, or None on failure
+    """
+    duration = duration or get_audio_duration(audio_file_path)
+    if not duration:
+        print("❌ Error: Could not read audio duration (is ffprobe installed?)")
         return None
     
+    # Chunks are re-encoded at a fixed bitrate, so size per second is predictable
+    encoding = encoding or default_encoding()
+    max_seconds_by_size = CHUNK_TARGET_MB * 1024 * 1024 / (encoding['bitrate_kbps'] * 1000 / 8)
+    max_chunk_seconds = min(CHUNK_SECONDS, max_seconds_by_size)
+    
+    print(f"✂️  Chunked mode: {duration/60:.1f} minutes of audio")
+    silences = []
+    if cut_at_silence:
+        print("   Detecting silences for clean cut points...")
+        silences = detect_silences(audio_file_path)
+    boundaries = plan_chunk_boundaries(duration, silences, max_chunk_seconds)
+    print(f"   Splitting into {len(boundaries)} chunks (found {len(silences)} silences)")
+    
+    chunk_dir = tempfile.mkdtemp(prefix="whisper_chunks_")
+    try:
+        process, list_file = start_segmenter(audio_file_path, boundaries, chunk_dir, encoding)
+        
+        workers = max(1, min(MAX_PARALLEL_CHUNKS, len(boundaries)))
+        print(f"🚀 Transcribing chunks as they are written ({workers} concurrent uploads)...")
+        
+        # Async uploads share the process-wide rate limiter with every other job
+        pairs = asyncio.run(transcribe_as_ready_async(
+            _completed_segments(process, list_file, chunk_dir, len(boundaries)),
+            max_retries, language, workers
+        ))
+        
+        if process.wait() != 0 or not pairs:
+            with open(os.path.join(chunk_dir, "ffmpeg.log"), 'r') as log:
+                print(f"❌ ffmpeg error while splitting: {log.read()}")
+            return None
+        
+        failed = [i + 1 for i, (_, r) in enumerate(pairs) if not r]
+        if failed:
+            print(f"❌ Error: Chunks {failed} failed after {max_retries} attempts")
+            return None
+        
+        merged = merge_chunk_transcripts([(r, offset) for offset, r in pairs])
+        merged["duration"] = max(merged["duration"], duration)
+        merged["chunks"] = len(pairs)
+        return merged
+    finally:
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+
+def _call_whisper(audio_file_path, max_retries=3, language=None):
+    """
+    Send a single file (under the upload limit) to Whisper with retry logic
+    
+    Args:
+        audio_file_path: Path to audio file
+        max_retries: Maximum number of retry attempts
+        language: Optional ISO-639-1 language hint for Whisper
+    
+    Returns:
+        dict: Transcript with text and segments, or None on failure
+    """
+    options = {"language": language} if language else {}
+    limiter = get_rate_limiter()
+    
     result = None
     for attempt in range(max_retries):
+        limiter.acquire_sync()
         try:
             # Open file
             with open(audio_file_path, "rb") as audio_file:
                 print(f"   Attempt {attempt + 1}/{max_retries}...")
                 
-                # Call Whisper API
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
+                # Call Whisper API (raw response so we can read rate-limit headers)
+                raw = client.audio.transcriptions.with_raw_response.create(
+                    model=WHISPER_MODEL,
                     file=audio_file,
-                    response_format="verbose_json"  # Get more details
+                    response_format="verbose_json",  # Get more details
+                    **options
                 )
+            limiter.update_from_headers(raw.headers)
             
-            print("✅ Transcription complete!")
-            
-            # Handle response
-            if hasattr(transcript, 'text'):
-                transcript_text = transcript.text
-                duration = getattr(transcript, 'duration', 0)
-            elif isinstance(transcript, dict):
-                transcript_text = transcript.get('text', '')
-                duration = transcript.get('duration', 0)
-            else:
-                transcript_text = str(transcript)
-                duration = 0
+            result = parse_whisper_response(raw.parse(), language)
             
-            if not transcript_text:
+            if not result:
                 print("⚠️  Warning: Empty transcript received")
                 if attempt < max_retries - 1:
                     print(f"   Retrying in {2 ** attempt} seconds...")
                     time.sleep(2 ** attempt)
                     continue
-                break
-            
-            # Extract data
-            result = {
-                "text": transcript_text,
-                "language": getattr(transcript, 'language', 'en'),
-                "duration": duration,
-                "segments": []
-            }
-            
-            # Try to add segments if available
-            if hasattr(transcript, 'segments'):
-                for segment in transcript.segments:
-                    if isinstance(segment, dict):
-                        result["segments"].append({
-                            "start": segment.get('start', 0),
-                            "end": segment.get('end', 0),
-                            "text": segment.get('text', '')
-                        })
-                    elif hasattr(segment, 'start'):
-                        result["segments"].append({
-                            "start": segment.start,
-                            "end": segment.end,
-                            "text": segment.text
-                        })
-            
-            # If no segments, create one for the whole text
-            if not result["segments"]:
-                result["segments"].append({
-                    "start": 0,
-                    "end": duration,
-                    "text": transcript_text
-                })
-            
-            # Print summary
-            print(f"\n📊 Summary:")
-            if duration > 0:
-                print(f"   Duration: {duration:.1f} seconds ({duration/60:.1f} minutes)")
-            print(f"   Word count: ~{len(result['text'].split())} words")
-            print(f"\n📝 First 200 characters:")
-            print(f"   {result['text'][:200]}...")
             
             break  # Success, exit retry loop
             
-        except Exception as e:
-            error_msg = str(e)
-            print(f"❌ Error during transcription (attempt {attempt + 1}/{max_retries}): {error_msg}")
+        except openai.OpenAIError as e:
+            retryable, wait_time, description = classify_error(e)
+            print(f"❌ Error during transcription (attempt {attempt + 1}/{max_retries}): {e}")
             
-            # Check error type
-            if "500" in error_msg or "503" in error_msg:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    print(f"   OpenAI server error. Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-            elif "429" in error_msg:
-                if attempt < max_retries - 1:
-                    wait_time = 5 * (attempt + 1)
-                    print(f"   Rate limit hit. Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-            elif "413" in error_msg or "file too large" in error_msg.lower():
-                print("   File is too large for Whisper API (max 25MB).")
-                break
+            if retryable and attempt < max_retries - 1:
+                if wait_time is not None and isinstance(e, openai.RateLimitError):
+                    limiter.pause(wait_time)  # Other uploads wait too
+                wait_time = wait_time if wait_time is not None else backoff_seconds(attempt)
+                print(f"   {description}. Retrying in {wait_time:.1f} seconds...")
+                time.sleep(wait_time)
+                continue
             
-            if attempt == max_retries - 1:
+            print(f"   {description}.")
+            if retryable:
                 print("\n💥 All retry attempts failed!")
-                import traceback
-                traceback.print_exc()
+            break
+        
+        except Exception as e:
+            # File or ffmpeg problems: retrying won't help, give up on this file
+            print(f"❌ Error during transcription: {e}")
+            break
+    
+    return result
+
+def _transcribe_file(audio_file_path, max_retries=3, chunked=None, language=None):
+    """
+    Plan encoding, convert or split as needed, and run Whisper on one file
+    
+    Args:
+        audio_file_path: Path to audio or video file
+        max_retries: Maximum number of retry attempts
+        chunked: True/False to force or disable chunked mode, None for automatic
+        language: Optional ISO-639-1 language hint for Whisper
+    
+    Returns:
+        dict: Transcript with text and segments, or None on failure
+    """
+    # Decide up front whether to upload as-is, re-encode or split
+    plan = plan_audio_encoding(audio_file_path)
+    duration = plan['duration']
+    if duration:
+        print(f"⏱️  Duration: {duration/60:.1f} minutes")
+    
+    auto_chunk = chunked is None
+    if auto_chunk:
+        # Long meetings under the limit still finish faster in parallel pieces
+        chunked = plan['action'] == 'chunk' or bool(duration and duration > CHUNK_SECONDS * 1.5)
+    
+    print("⏳ This may take a minute...")
+    
+    if chunked:
+        # Chunks are encoded straight from the source, no intermediate file
+        return transcribe_audio_chunked(audio_file_path, max_retries, duration, language, plan['encoding'],
+                                        cut_at_silence=not plan['has_video'])
+    
+    temp_audio_file = None
+    if plan['action'] == 'encode':
+        temp_audio_file = convert_video_to_audio(audio_file_path, plan)
+        if not temp_audio_file:
+            print("❌ Failed to convert to audio")
+            return None
+        audio_file_path = temp_audio_file
+        print(f"✅ Using converted audio: {audio_file_path}")
+    else:
+        print(f"✅ Uploading as-is ({plan['reason']})")
+    
+    # Check file size (Whisper has 25MB limit)
+    file_size_mb = os.path.getsize(audio_file_path) / (1024 * 1024)
+    print(f"📦 File size: {file_size_mb:.1f}MB")
+    
+    if file_size_mb <= WHISPER_MAX_MB:
+        result = _call_whisper(audio_file_path, max_retries, language)
+    elif auto_chunk:
+        # Size estimate was off (or duration unknown) - fall back to chunks
+        result = transcribe_audio_chunked(audio_file_path, max_retries, None, language)
+    else:
+        print(f"❌ Error: File is {file_size_mb:.1f}MB. Whisper API limit is {WHISPER_MAX_MB}MB.")
+        print("   Enable chunked mode or record shorter segments.")
+        result = None
     
     # Clean up temporary audio file
-    if temp_audio_file and os.path.exists(temp_audio_file):
+    if temp_audio_file:
+        _remove_temp_audio(temp_audio_file)
+        print(f"🧹 Cleaned up temporary file: {temp_audio_file}")
+    
+    return result
+
+class TranscriptionBackend:
+    """
+    Interface for transcription engines
+    
+    transcribe() must return {"text", "language", "duration", "segments"} or None.
+    """
+    name = "base"
+    model_name = None
+    
+    def is_available(self):
+        return True
+    
+    def transcribe(self, audio_file_path, max_retries=3, chunked=None, language=None):
+        raise NotImplementedError
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """Hosted Whisper API (encoding, chunking and rate limiting handled here)"""
+    name = "openai"
+    model_name = WHISPER_MODEL
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+    
+    def is_available(self):
+        return bool(os.getenv("OPENAI_API_KEY")) and time.monotonic() >= self.unhealthy_until
+    
+    def backlog(self):
+        """Number of hosted jobs currently running"""
+        return self.in_flight
+    
+    def transcribe(self, audio_file_path, max_retries=3, chunked=None, language=None):
+        with self._lock:
+            self.in_flight += 1
+        try:
+            result = _transcribe_file(audio_file_path, max_retries, chunked, language)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        
+        # Track API health so "auto" routing can avoid it while it's failing
+        with self._lock:
+            if result:
+                self.consecutive_failures = 0
+            else:
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= API_FAILURES_BEFORE_FALLBACK:
+                    self.unhealthy_until = time.monotonic() + API_COOLDOWN_SECONDS
+        
+        return result
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """Local CPU transcription with faster-whisper (quantized CTranslate2 Whisper)"""
+    name = "local"
+    
+    def __init__(self, model_size=LOCAL_WHISPER_MODEL, compute_type=LOCAL_COMPUTE_TYPE):
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.model_name = f"faster-whisper-{model_size}-{compute_type}"
+        self._model = None
+        self._lock = threading.Lock()
+    
+    def is_available(self):
+        return importlib.util.find_spec("faster_whisper") is not None
+    
+    def _load_model(self):
+        with self._lock:
+            if self._model is None:
+                from faster_whisper import WhisperModel
+                print(f"📥 Loading local model {self.model_size} ({self.compute_type})...")
+                self._model = WhisperModel(
+                    self.model_size,
+                    device="cpu",
+                    compute_type=self.compute_type,
+                    cpu_threads=LOCAL_CPU_THREADS,
+                    num_workers=LOCAL_WORKERS
+                )
+            return self._model
+    
+    def transcribe(self, audio_file_path, max_retries=3, chunked=None, language=None):
+        # No upload limit locally, so the file is decoded as-is and never chunked
         try:
-            os.remove(temp_audio_file)
-            print(f"🧹 Cleaned up temporary file: {temp_audio_file}")
-        except:
-            pass
+            model = self._load_model()
+            print("🖥️  Transcribing on local CPU...")
+            segments, info = model.transcribe(audio_file_path, language=language, beam_size=1)
+            result_segments = [
+                {"start": segment.start, "end": segment.end, "text": segment.text}
+                for segment in segments
+            ]
+        except Exception as e:
+            print(f"❌ Local transcription error: {e}")
+            return None
+        
+        transcript_text = "".join(segment["text"] for segment in result_segments).strip()
+        if not transcript_text:
+            print("⚠️  Warning: Empty transcript received")
+            return None
+        
+        return {
+            "text": transcript_text,
+            "language": info.language,
+            "duration": info.duration,
+            "segments": result_segments
+        }
+
+BACKENDS = {
+    "openai": OpenAIWhisperBackend(),
+    "local": LocalWhisperBackend(),
+}
+
+def select_backend(requested=None, duration=None):
+    """
+    Pick a transcription backend
+    
+    Args:
+        requested: "openai", "local" or "auto" (defaults to TRANSCRIBE_BACKEND)
+        duration: Recording length in seconds, if known
+    
+    Returns:
+        tuple: (backend, reason)
+    """
+    requested = requested or TRANSCRIBE_BACKEND
+    hosted, local = BACKENDS["openai"], BACKENDS["local"]
+    
+    if requested == "openai":
+        return hosted, "requested"
+    if requested == "local":
+        if local.is_available():
+            return local, "requested"
+        print("⚠️  Local backend requested but faster-whisper is not installed - using API")
+        return hosted, "local unavailable"
+    
+    if not local.is_available():
+        return hosted, "default"
+    if not hosted.is_available():
+        return local, "API unavailable or failing"
+    if duration and duration / 60 >= LOCAL_ROUTE_MIN_MINUTES:
+        return local, f"long recording ({duration/60:.0f} min)"
+    if hosted.backlog() >= LOCAL_ROUTE_BACKLOG:
+        return local, f"API backlog ({hosted.backlog()} jobs)"
+    return hosted, "default"
+
+def transcribe_audio(audio_file_path, max_retries=3, chunked=None, language=None, use_cache=True,
+                     strip_silence=None, backend=None):
+    """
+    Transcribe audio/video with the hosted Whisper API or the local CPU backend
+    
+    Args:
+        audio_file_path: Path to audio or video file
+        max_retries: Maximum number of retry attempts
+        chunked: True to always split into parallel chunks, False to never split,
+                 None to split automatically for files over the limit or long meetings
+        language: Optional ISO-639-1 language hint for Whisper
+        use_cache: Reuse a cached transcript of the same audio if available
+        strip_silence: Drop long silences before upload (defaults to VAD_ENABLED)
+        backend: "openai", "local" or "auto" (defaults to TRANSCRIBE_BACKEND)
+    
+    Returns:
+        dict: Transcript with text and segments
+    """
+    
+    print(f"🎙️  Transcribing: {audio_file_path}")
+    
+    requested = backend or TRANSCRIBE_BACKEND
+    
+    # Check transcript cache before doing any conversion or API work
+    audio_hash = None
+    if use_cache:
+        cache = get_transcript_cache()
+        try:
+            audio_hash = hash_audio(audio_file_path)
+        except OSError as e:
+            print(f"⚠️  Could not hash audio for cache lookup: {e}")
+        
+        if audio_hash:
+            # Only "auto" accepts a transcript from another backend
+            candidates = BACKENDS.values() if requested == "auto" else [BACKENDS.get(requested)]
+            cached = cache.get_any([
+                cache.make_key(audio_hash, b.model_name, language) for b in candidates if b
+            ])
+            if cached:
+                print("⚡ Transcript cache hit - skipping transcription")
+                return cached
+    
+    duration = get_audio_duration(audio_file_path) if requested == "auto" else None
+    selected, reason = select_backend(requested, duration)
+    print(f"🧠 Backend: {selected.name} ({reason})")
+    
+    if strip_silence is None:
+        strip_silence = VAD_ENABLED
+    
+    def run(path):
+        nonlocal selected
+        result = selected.transcribe(path, max_retries, chunked, language)
+        if not result and requested == "auto" and selected is BACKENDS["openai"] and BACKENDS["local"].is_available():
+            # Keep working when the API is slow or unreachable
+            print("↪️  API transcription failed - retrying on the local CPU backend")
+            selected = BACKENDS["local"]
+            result = selected.transcribe(path, max_retries, chunked, language)
+        return result
+    
+    vad_dir = tempfile.mkdtemp(prefix="vad_") if strip_silence else None
+    try:
+        # Upload only the speech; timestamps are mapped back afterwards
+        stripped = silence_stripper.strip_silence(audio_file_path, vad_dir) if vad_dir else None
+        
+        if stripped:
+            speech_path, remap_table, original_duration = stripped
+            result = run(speech_path)
+            if result:
+                result = silence_stripper.remap_transcript(result, remap_table, original_duration)
+        else:
+            result = run(audio_file_path)
+    finally:
+        if vad_dir:
+            shutil.rmtree(vad_dir, ignore_errors=True)
+    
+    if result:
+        print("✅ Transcription complete!")
+        
+        if audio_hash:
+            try:
+                cache.put(cache.make_key(audio_hash, selected.model_name, language), result)
+            except OSError as e:
+                print(f"⚠️  Could not write transcript cache: {e}")
+        
+        # Print summary
+        duration = result.get('duration') or 0
+        print(f"\n📊 Summary:")
+        if duration > 0:
+            print(f"   Duration: {duration:.1f} seconds ({duration/60:.1f} minutes)")
+        if result.get('silence_stripped'):
+            print(f"   Uploaded speech only: {result['silence_stripped']['uploaded_seconds']/60:.1f} minutes")
+        print(f"   Word count: ~{len(result['text'].split())} words")
+        print(f"\n📝 First 200 characters:")
+        print(f"   {result['text'][:200]}...")
     
     return result
 
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) > 1:
-        audio_file = sys.argv[1]
+    # --live: transcribe a recording that is still being written (or '-' for stdin)
+    live = '--live' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--live']
+    
+    if args:
+        audio_file = args[0]
     else:
         audio_file = "test_meeting.mp3"
     
-    if not os.path.exists(audio_file):
+    if live:
+        from live_transcribe import live_transcribe
+        output_file = "live_transcript.json" if audio_file == '-' else artifact_path(audio_file, 'transcript')
+        live_transcribe(audio_file, output_file)
+    elif not os.path.exists(audio_file):
         print(f"❌ Error: {audio_file} not found!")
         print("Available files:")
         for f in os.listdir('.'):
@@ -254,11 +877,9 @@ if __name__ == "__main__":
             print("\n✅ Transcription successful!")
             
             # Save to file
-            base_name = str(Path(audio_file).stem)
-            output_file = base_name + '_transcript.json'
+            output_file = artifact_path(audio_file, 'transcript')
             
-            with open(output_file, 'w') as f:
-                json.dump(result, f, indent=2)
+            save_transcript(result, output_file)
             
             print(f"💾 Saved transcript to: {output_file}")
         else:
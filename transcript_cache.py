@@ -0,0 +1,218 @@
+"""
+Content-addressed cache for Whisper transcripts
+Keyed by a hash of the normalized audio so re-uploads skip the API call
+"""
+
+import os
+import json
+import hashlib
+import subprocess
+import threading
+from pathlib import Path
+from media_probe import cached_media_value
+
+CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", "transcript_cache")
+CACHE_MAX_MB = float(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "200"))
+STATS_FILE = "_stats.json"
+
+def hash_audio(audio_path):
+    """
+    Hash the decoded audio so the same recording matches regardless of
+    file name, container or metadata (cached per path, size, mtime and inode, so a
+    file is decoded at most once)
+
+    Args:
+        audio_path: Path to audio or video file
+
+    Returns:
+        str: Hex digest of the normalized audio (raw file bytes if ffmpeg is missing)
+    """
+    return cached_media_value(audio_path, 'audio_hash', _decode_and_hash)
+
+def _decode_and_hash(audio_path):
+    digest = hashlib.sha256()
+
+    try:
+        # Decode to 16kHz mono PCM and hash the stream without touching disk
+        process = subprocess.Popen([
+            'ffmpeg',
+            '-v', 'error',
+            '-i', audio_path,
+            '-vn',
+            '-ac', '1',
+            '-ar', '16000',
+            '-f', 's16le',
+            '-'
+        ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+        got_audio = False
+        for block in iter(lambda: process.stdout.read(1024 * 1024), b''):
+            digest.update(block)
+            got_audio = True
+        process.wait()
+
+        if process.returncode == 0 and got_audio:
+            return "pcm-" + digest.hexdigest()
+    except FileNotFoundError:
+        pass
+
+    # Fallback: hash file bytes
+    digest = hashlib.sha256()
+    with open(audio_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return "raw-" + digest.hexdigest()
+
+class TranscriptCache:
+    """On-disk transcript cache with size-bounded LRU eviction and hit/miss counters"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_mb=CACHE_MAX_MB):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def make_key(self, audio_hash, model, language=None):
+        """Combine audio hash, model and language into a cache key"""
+        raw = f"{audio_hash}|{model}|{language or 'auto'}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        """
+        Look up a transcript
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            dict: Cached transcript, or None on a miss
+        """
+        return self.get_any([key])
+
+    def get_any(self, keys):
+        """
+        Look up several candidate keys, counting a single hit or miss
+
+        Args:
+            keys: Cache keys in order of preference
+
+        Returns:
+            dict: First cached transcript found, or None
+        """
+        for key in keys:
+            path = self._entry_path(key)
+            try:
+                with open(path, 'r') as f:
+                    transcript = json.load(f)
+                os.utime(path, None)  # Mark as recently used
+            except (OSError, ValueError):
+                continue
+
+            self._record('hits', saved_seconds=transcript.get('duration') or 0)
+            return transcript
+
+        self._record('misses')
+        return None
+
+    def put(self, key, transcript):
+        """
+        Store a transcript and evict least recently used entries over the size limit
+
+        Args:
+            key: Cache key from make_key()
+            transcript: Transcript dict to store
+        """
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix('.tmp')
+
+        with open(tmp_path, 'w') as f:
+            json.dump(transcript, f)
+        os.replace(tmp_path, path)
+
+        self._evict()
+
+    def _evict(self):
+        """Delete oldest entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob('*.json'):
+                if path.name == STATS_FILE:
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+
+        if evicted:
+            self._record('evictions', count=evicted)
+
+    def _record(self, counter, count=1, saved_seconds=0):
+        """Update persistent hit/miss counters"""
+        with self._lock:
+            stats = self._load_stats()
+            stats[counter] = stats.get(counter, 0) + count
+            stats['saved_audio_seconds'] = stats.get('saved_audio_seconds', 0) + saved_seconds
+
+            stats_path = self.cache_dir / STATS_FILE
+            tmp_path = stats_path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(stats, f)
+            os.replace(tmp_path, stats_path)
+
+    def _load_stats(self):
+        try:
+            with open(self.cache_dir / STATS_FILE, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+            dict: hits, misses, evictions, saved_audio_seconds, entries and size_mb
+        """
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'saved_audio_seconds': 0}
+        stats.update(self._load_stats())
+
+        entries = [p for p in self.cache_dir.glob('*.json') if p.name != STATS_FILE]
+        stats['entries'] = len(entries)
+        stats['size_mb'] = sum(p.stat().st_size for p in entries) / (1024 * 1024)
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+_default_cache = None
+
+def get_transcript_cache():
+    """Get the shared cache instance"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TranscriptCache()
+    return _default_cache
+
+if __name__ == "__main__":
+    stats = get_transcript_cache().stats()
+    print("📦 Transcript cache")
+    print(f"   Entries: {stats['entries']} ({stats['size_mb']:.1f}MB)")
+    print(f"   Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {stats['hit_rate']:.0%}")
+    print(f"   Evictions: {stats['evictions']}")
+    print(f"   Audio not re-transcribed: {stats['saved_audio_seconds']/60:.1f} minutes")
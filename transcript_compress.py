@@ -0,0 +1,164 @@
+"""
+Local transcript normalization before prompting
+Removes fillers, stutters, false starts and rolling-caption repetition while keeping segment timestamps
+"""
+
+import os
+import re
+
+from segment_store import as_segment_store
+from token_budget import MOM_MODEL, count_tokens
+
+# "off", "light" (fillers, stutters, caption overlap) or "aggressive" (also verbal tics and doubled words)
+COMPRESS_LEVEL = os.getenv("MOM_COMPRESS", "light")
+CAPTION_OVERLAP_MIN_WORDS = 3  # Shorter overlaps between segments are likely real repetition
+CAPTION_SOURCES = {'youtube_captions'}  # Transcript sources with rolling captions (lines shown twice)
+
+LIGHT_FILLERS = re.compile(
+    r"(?:,\s*)?\b(?:mm-hmm|uh-huh|u+m+|u+h+|e+r+m+|a+h+|hm+|mm+)\b(?:,(?=\s))?",
+    re.IGNORECASE
+)
+AGGRESSIVE_FILLERS = re.compile(
+    r"(?:,\s*)?\b(?:you know|i mean|kind of|sort of|basically|actually|literally)\b(?:,(?=\s))?",
+    re.IGNORECASE
+)
+FILLER_LIKE = re.compile(r",\s*like,", re.IGNORECASE)
+REPEATED_WORD = re.compile(r"\b(\w+)(?:[\s,]+\1\b)+", re.IGNORECASE)
+REPEATED_PHRASE = re.compile(r"\b((?:\w+\s+){1,3}\w+)(?:[\s,]+\1\b)+", re.IGNORECASE)
+STUTTER = re.compile(r"\b(\w+)(?:-|--|—)\s+(?=\1\b)", re.IGNORECASE)  # "I- I think"
+FALSE_START = re.compile(r"\b\w+(?:-|--|—)\s+(?=\w)")  # "we sh-- we should"
+SPACE_BEFORE_PUNCT = re.compile(r"\s+([,.!?;:])")
+EXTRA_COMMAS = re.compile(r"(?:,\s*){2,}")
+REPEATED_STOPS = re.compile(r"([.!?])(?:\s*[.!?,])+")  # Left behind by a removed "Uh."
+LEADING_PUNCT = re.compile(r"^[\s,;:.!?]+")
+
+def normalize_text(text, level=COMPRESS_LEVEL):
+    """
+    Strip verbal noise from one piece of transcript text
+
+    Args:
+        text: Segment or sentence text
+        level: "light" or "aggressive"
+
+    Returns:
+        str: Cleaned text (may be empty)
+    """
+    text = LIGHT_FILLERS.sub('', text)
+    text = STUTTER.sub('', text)
+    if level == 'aggressive':
+        text = AGGRESSIVE_FILLERS.sub('', text)
+        text = FILLER_LIKE.sub(',', text)
+        text = FALSE_START.sub('', text)
+
+    text = REPEATED_PHRASE.sub(r'\1', text)
+    if level == 'aggressive':
+        text = REPEATED_WORD.sub(r'\1', text)  # Also hits real doubles ("I had had enough")
+    text = EXTRA_COMMAS.sub(', ', text)
+    text = SPACE_BEFORE_PUNCT.sub(r'\1', text)
+    text = REPEATED_STOPS.sub(r'\1', text)
+    text = LEADING_PUNCT.sub('', text)
+    text = ' '.join(text.split())
+    if not re.search(r'\w', text):
+        return ''
+    return text[:1].upper() + text[1:] if text else text
+
+def _words(text):
+    return [re.sub(r'[^\w]', '', w).lower() for w in text.split()]
+
+def strip_caption_overlap(previous, current):
+    """
+    Remove the part of a segment that repeats the end of the previous one
+    (rolling auto-captions show each line twice)
+
+    Only overlaps of at least CAPTION_OVERLAP_MIN_WORDS words are removed, so a
+    short answer that repeats the last word ("...say no?" / "No.") is kept.
+
+    Args:
+        previous: Previous segment text
+        current: Current segment text
+
+    Returns:
+        str: Current text without the repeated prefix
+    """
+    prev_words = _words(previous)
+    cur_words = current.split()
+    cur_norm = _words(current)
+
+    for k in range(min(len(prev_words), len(cur_norm)), CAPTION_OVERLAP_MIN_WORDS - 1, -1):
+        if prev_words[-k:] == cur_norm[:k]:
+            return ' '.join(cur_words[k:])
+    return current
+
+def compress_transcript(transcript, level=COMPRESS_LEVEL, model=MOM_MODEL):
+    """
+    Normalize a transcript before it goes into a prompt
+
+    Caption overlap is only stripped for caption-sourced transcripts (CAPTION_SOURCES).
+
+    Args:
+        transcript: Transcript dict or SegmentStore
+        level: "off", "light" or "aggressive"
+        model: Model used for token counts
+
+    Returns:
+        tuple: (compressed transcript dict with the same shape and original
+                timestamps, report dict with tokens_before, tokens_after,
+                saved_tokens, saved_percent, segments_before, segments_after, level)
+    """
+    store = as_segment_store(transcript)
+    tokens_before = count_tokens(store.text, model)
+    report = {
+        'level': level,
+        'tokens_before': tokens_before,
+        'tokens_after': tokens_before,
+        'saved_tokens': 0,
+        'saved_percent': 0.0,
+        'segments_before': store.segment_count,
+        'segments_after': store.segment_count,
+    }
+    if level == 'off':
+        return store.to_transcript(), report
+
+    captions = store.get('source') in CAPTION_SOURCES  # Only rolling captions repeat the previous line
+
+    segments = []
+    previous_raw = ''
+    for segment in store.iter_segments():
+        raw = segment['text']
+        text = normalize_text(strip_caption_overlap(previous_raw, raw) if captions and previous_raw else raw, level)
+        previous_raw = raw
+
+        if not text:
+            if segments:
+                segments[-1]['end'] = segment['end']  # Keep the timeline continuous
+            continue
+        segments.append(dict(segment, text=' ' + text))
+
+    if len(segments) > 1 or store.segment_count > 1:
+        text = ''.join(s['text'] for s in segments).strip()
+    else:
+        # One segment for the whole text (or none): normalize the text itself
+        text = normalize_text(store.text, level)
+        segments = [dict(s, text=' ' + text) for s in segments[:1]]
+
+    compressed = store.to_transcript()
+    compressed['text'] = text
+    compressed['segments'] = segments
+
+    tokens_after = count_tokens(text, model)
+    report.update({
+        'tokens_after': tokens_after,
+        'saved_tokens': tokens_before - tokens_after,
+        'saved_percent': round(100.0 * (tokens_before - tokens_after) / tokens_before, 1) if tokens_before else 0.0,
+        'segments_after': len(segments),
+    })
+    return compressed, report
+
+def print_compression_report(report):
+    """Print tokens before/after for one transcript"""
+    if report['level'] == 'off':
+        print(f"🗜️  Pre-compression off ({report['tokens_before']:,} tokens)")
+        return
+    print(f"🗜️  Pre-compression ({report['level']}): {report['tokens_before']:,} → "
+          f"{report['tokens_after']:,} tokens (-{report['saved_percent']:.1f}%, "
+          f"{report['segments_before']} → {report['segments_after']} segments)")
@@ -0,0 +1,335 @@
+"""
+Whisper API client layer shared by every transcription path
+Async transcription with a process-wide token bucket driven by rate-limit response headers
+"""
+
+import os
+import re
+import time
+import random
+import asyncio
+import threading
+import openai
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+
+load_dotenv()
+
+WHISPER_MODEL = "whisper-1"
+
+# Starting point until the API tells us the real limits
+DEFAULT_REQUESTS_PER_MINUTE = int(os.getenv("WHISPER_RPM", "50"))
+MAX_IN_FLIGHT = int(os.getenv("WHISPER_MAX_IN_FLIGHT", "8"))
+
+def parse_reset_duration(value):
+    """
+    Parse OpenAI reset durations like "1s", "6m0s", "20ms" or "1h2m3.5s"
+
+    Args:
+        value: Header value
+
+    Returns:
+        float: Seconds, or None if the value can't be parsed
+    """
+    if not value:
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = re.findall(r'([\d.]+)(ms|h|m|s)', value)
+    if not parts:
+        return None
+
+    scale = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+def retry_after_seconds(headers):
+    """
+    Read how long the server asked us to wait
+
+    Args:
+        headers: Response headers (httpx.Headers or dict)
+
+    Returns:
+        float: Seconds to wait, or None if the server didn't say
+    """
+    if not headers:
+        return None
+
+    retry_ms = headers.get('retry-after-ms')
+    if retry_ms:
+        try:
+            return float(retry_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get('retry-after')
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+
+    return parse_reset_duration(headers.get('x-ratelimit-reset-requests'))
+
+class RateLimiter:
+    """
+    Token bucket shared by all threads and event loops in the process
+
+    Refill rate and remaining budget are corrected from x-ratelimit-* response
+    headers, and a Retry-After pauses every caller, not just the one that got the 429.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE):
+        self.capacity = float(requests_per_minute)
+        self.rate = requests_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """
+        Take a token, going into debt if necessary
+
+        Returns:
+            float: Seconds the caller must wait before sending its request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self.paused_until - now)
+
+    async def acquire(self):
+        """Wait (asynchronously) until a request may be sent"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self):
+        """Wait (blocking) until a request may be sent"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def update_from_headers(self, headers):
+        """
+        Adjust the bucket from x-ratelimit-* response headers
+
+        Args:
+            headers: Response headers (httpx.Headers or dict)
+        """
+        if not headers:
+            return
+
+        try:
+            limit = int(headers.get('x-ratelimit-limit-requests') or 0)
+            remaining = headers.get('x-ratelimit-remaining-requests')
+            remaining = int(remaining) if remaining is not None else None
+        except ValueError:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if limit > 0:
+                self.capacity = float(limit)
+                self.rate = limit / 60.0  # Request limits are per minute
+
+            if remaining is not None:
+                self.tokens = min(self.tokens, float(remaining))
+                if remaining == 0:
+                    reset = parse_reset_duration(headers.get('x-ratelimit-reset-requests'))
+                    if reset:
+                        self.paused_until = max(self.paused_until, now + reset)
+
+    def pause(self, seconds):
+        """Stop all callers from sending for the given number of seconds"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Get the process-wide Whisper rate limiter"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
+
+def backoff_seconds(attempt):
+    """Exponential backoff with jitter for errors that don't say how long to wait"""
+    return min(60, 2 ** attempt) * (0.5 + random.random() / 2)
+
+def classify_error(error):
+    """
+    Decide how to handle an OpenAI error
+
+    Args:
+        error: Exception raised by the OpenAI client
+
+    Returns:
+        tuple: (retryable, wait_seconds or None, description)
+    """
+    if isinstance(error, openai.RateLimitError):
+        return True, retry_after_seconds(error.response.headers), "Rate limit hit"
+    if isinstance(error, openai.APIStatusError):
+        status = error.status_code
+        if status == 413:
+            return False, None, "File is too large for Whisper API (max 25MB)"
+        if status >= 500:
+            return True, retry_after_seconds(error.response.headers), f"OpenAI server error ({status})"
+        return False, None, f"Request rejected ({status})"
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True, None, "Connection problem"
+    return False, None, "Unexpected error"
+
+def parse_whisper_response(transcript, language=None):
+    """
+    Convert a Whisper API response into our transcript dict
+
+    Args:
+        transcript: Response object (or dict/str) from transcriptions.create
+        language: Language hint used for the request
+
+    Returns:
+        dict: text, language, duration and segments, or None if the text is empty
+    """
+    if hasattr(transcript, 'text'):
+        transcript_text = transcript.text
+        duration = getattr(transcript, 'duration', 0)
+    elif isinstance(transcript, dict):
+        transcript_text = transcript.get('text', '')
+        duration = transcript.get('duration', 0)
+    else:
+        transcript_text = str(transcript)
+        duration = 0
+
+    if not transcript_text:
+        return None
+
+    result = {
+        "text": transcript_text,
+        "language": getattr(transcript, 'language', language or 'en'),
+        "duration": duration,
+        "segments": []
+    }
+
+    # Try to add segments if available
+    for segment in getattr(transcript, 'segments', None) or []:
+        if isinstance(segment, dict):
+            result["segments"].append({
+                "start": segment.get('start', 0),
+                "end": segment.get('end', 0),
+                "text": segment.get('text', '')
+            })
+        elif hasattr(segment, 'start'):
+            result["segments"].append({
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text
+            })
+
+    # If no segments, create one for the whole text
+    if not result["segments"]:
+        result["segments"].append({
+            "start": 0,
+            "end": duration,
+            "text": transcript_text
+        })
+
+    return result
+
+async def transcribe_file_async(client, audio_file_path, max_retries=5, language=None, limiter=None):
+    """
+    Transcribe one file (under the upload limit) with the async client
+
+    Args:
+        client: AsyncOpenAI client
+        audio_file_path: Path to audio file
+        max_retries: Maximum number of attempts
+        language: Optional ISO-639-1 language hint
+        limiter: RateLimiter (defaults to the shared one)
+
+    Returns:
+        dict: Transcript with text and segments, or None on failure
+    """
+    limiter = limiter or get_rate_limiter()
+    options = {"language": language} if language else {}
+    name = os.path.basename(audio_file_path)
+
+    for attempt in range(max_retries):
+        await limiter.acquire()
+        try:
+            with open(audio_file_path, "rb") as audio_file:
+                raw = await client.audio.transcriptions.with_raw_response.create(
+                    model=WHISPER_MODEL,
+                    file=audio_file,
+                    response_format="verbose_json",
+                    **options
+                )
+            limiter.update_from_headers(raw.headers)
+
+            result = parse_whisper_response(raw.parse(), language)
+            if result:
+                return result
+
+            print(f"⚠️  {name}: empty transcript received (attempt {attempt + 1}/{max_retries})")
+            await asyncio.sleep(backoff_seconds(attempt))
+
+        except openai.OpenAIError as e:
+            retryable, wait, description = classify_error(e)
+            print(f"❌ {name}: {description} (attempt {attempt + 1}/{max_retries})")
+            if not retryable or attempt == max_retries - 1:
+                return None
+
+            if wait is not None and isinstance(e, openai.RateLimitError):
+                limiter.pause(wait)  # Hold back every in-flight request, not just this one
+            await asyncio.sleep(wait if wait is not None else backoff_seconds(attempt))
+
+        except Exception as e:
+            # File problems are not worth retrying; fail this file without cancelling the others
+            print(f"❌ {name}: {e}")
+            return None
+
+    return None
+
+async def transcribe_as_ready_async(ready_items, max_retries=5, language=None, max_in_flight=MAX_IN_FLIGHT):
+    """
+    Start transcribing files as soon as they become available
+
+    Args:
+        ready_items: Async iterable yielding (key, path) as each file is fully written
+        max_retries: Maximum attempts per file
+        language: Optional ISO-639-1 language hint
+        max_in_flight: Maximum concurrent uploads
+
+    Returns:
+        list: (key, transcript dict or None) pairs in the order files were yielded
+    """
+    semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+    # One client per event loop; the SDK does its own retries otherwise
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0) as client:
+        async def run(path):
+            async with semaphore:
+                return await transcribe_file_async(client, path, max_retries, language)
+
+        tasks = []
+        async for key, path in ready_items:
+            tasks.append((key, asyncio.create_task(run(path))))
+
+        results = await asyncio.gather(*(task for _, task in tasks))
+        return [(key, result) for (key, _), result in zip(tasks, results)]
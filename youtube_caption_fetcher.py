@@ -8,6 +8,8 @@ import re
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 from dotenv import load_dotenv
 import json
+from llm_cache import cached_chat_completion
+from prompt_templates import get_prompt
 
 load_dotenv()
 
@@ -261,22 +263,13 @@ def clean_caption_text_gpt4(raw_text, client):
     print("🧹 Cleaning caption text with GPT-4...")
     
     try:
-        response = client.chat.completions.create(
+        cleaned_text = cached_chat_completion(
+            client,
             model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a transcript editor. Fix transcription errors, add proper punctuation, and break into paragraphs. Preserve all original meaning and content. Do not summarize or change words unless they are clearly transcription errors."
-                },
-                {
-                    "role": "user",
-                    "content": f"Fix this auto-generated transcript:\n\n{raw_text[:8000]}"  # Limit to avoid token limits
-                }
-            ],
-            temperature=0.3
+            messages=get_prompt('caption_cleanup', 2).messages(transcript=raw_text[:8000]),  # Limit to avoid token limits
+            temperature=0.3,
+            label="Caption cleanup"
         )
-        
-        cleaned_text = response.choices[0].message.content
         print("✅ Caption cleaning complete")
         
         return cleaned_text